@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Archivage des événements passés de src/services/evenements/upcoming
+Les événements dont la date est dépassée sont déplacés dans des partitions datées
+(archive/AAAA/MM/) et recensés dans archive/index.json, pour que la collection
+upcoming_events ne parcoure que les événements à venir
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from datetime import datetime, timedelta, timezone
+
+from content_model import PROJECT_ROOT, parse_datetime
+
+
+EVENTS_DIR = PROJECT_ROOT / "src" / "services" / "evenements"
+UPCOMING_DIR = EVENTS_DIR / "upcoming"
+ARCHIVE_DIR = EVENTS_DIR / "archive"
+INDEX_PATH = ARCHIVE_DIR / "index.json"
+
+# Slug Decap : "{{title | slugify}}-{{date | slugify}}", ex: ...-2025-11-11t14-00-00-000-01-00
+# Le slugify supprime le signe du décalage horaire : il est interprété comme positif (heure de Paris)
+SLUG_DATE_PATTERN = re.compile(
+    r"-(\d{4})-(\d{2})-(\d{2})t(\d{2})-(\d{2})-(\d{2})-(\d{3})-(\d{2})-(\d{2})$"
+)
+
+
+def display_path(path):
+    """Chemin relatif au projet pour l'affichage, tel quel s'il est hors du projet"""
+    try:
+        return path.relative_to(PROJECT_ROOT)
+    except ValueError:
+        return path
+
+
+def date_from_slug(slug):
+    """Extrait la date d'un slug d'événement (None si le slug ne contient pas de date)"""
+    match = SLUG_DATE_PATTERN.search(slug)
+    if not match:
+        return None
+    year, month, day, hour, minute, second, millis, off_h, off_m = map(int, match.groups())
+    try:
+        return datetime(
+            year, month, day, hour, minute, second, millis * 1000,
+            tzinfo=timezone(timedelta(hours=off_h, minutes=off_m))
+        )
+    except ValueError:
+        return None
+
+
+def event_date(path):
+    """
+    Date d'un événement : le champ date du JSON, sinon celle du slug.
+
+    Le slug perd le signe du décalage horaire : il ne sert que si le champ date manque ou est illisible.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            date = parse_datetime(json.load(f).get("date"))
+    except (OSError, ValueError):
+        date = None
+    return date if date is not None else date_from_slug(path.stem)
+
+
+def find_stale_events(now=None, upcoming_dir=UPCOMING_DIR):
+    """
+    Liste les événements passés encore présents dans le dossier des événements à venir.
+
+    Returns:
+        list: tuples (chemin, date) triés chronologiquement
+    """
+    now = now or datetime.now(timezone.utc)
+    stale = []
+    for path in sorted(upcoming_dir.glob("*.json")):
+        date = event_date(path)
+        if date is None:
+            print(f"⚠️ Date illisible, événement ignoré: {path.name}")
+            continue
+        if date < now:
+            stale.append((path, date))
+    return sorted(stale, key=lambda item: item[1])
+
+
+def load_index(index_path=INDEX_PATH):
+    """Index des événements archivés"""
+    try:
+        return json.loads(index_path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {"events": []}
+
+
+def archive_events(now=None, dry_run=False, upcoming_dir=UPCOMING_DIR, archive_dir=ARCHIVE_DIR):
+    """
+    Déplace les événements passés dans archive/AAAA/MM/ et met à jour l'index.
+
+    Returns:
+        list: entrées d'index ajoutées
+    """
+    stale = find_stale_events(now, upcoming_dir)
+    if not stale:
+        print("✅ Aucun événement passé dans le dossier des événements à venir")
+        return []
+
+    index_path = archive_dir / "index.json"
+    index = load_index(index_path)
+    archived_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    added = []
+
+    for path, date in stale:
+        partition = archive_dir / f"{date.year:04d}" / f"{date.month:02d}"
+        target = partition / path.name
+        print(f"{'🔎' if dry_run else '📦'} {path.name} → {target.relative_to(archive_dir.parent)}")
+        if dry_run:
+            continue
+
+        with open(path, encoding="utf-8") as f:
+            title = json.load(f).get("title")
+        partition.mkdir(parents=True, exist_ok=True)
+        os.replace(path, target)
+
+        entry = {
+            "slug": path.stem,
+            "title": title,
+            "date": date.isoformat(),
+            "path": target.relative_to(archive_dir).as_posix(),
+            "archived_at": archived_at,
+        }
+        index["events"] = [e for e in index["events"] if e["slug"] != entry["slug"]] + [entry]
+        added.append(entry)
+
+    if added:
+        # Tri chronologique sur la date lue : des chaînes ISO à décalages différents ne se trient pas
+        index["events"].sort(key=lambda e: parse_datetime(e["date"]))
+        tmp = index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(index, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        tmp.replace(index_path)
+        print(f"✅ {len(added)} événement(s) archivé(s), index mis à jour: {display_path(index_path)}")
+    return added
+
+
+def check_hot_folder(now=None, upcoming_dir=UPCOMING_DIR):
+    """Vérification : échoue si des événements passés sont encore dans le dossier chaud"""
+    stale = find_stale_events(now, upcoming_dir)
+    if stale:
+        print(f"❌ {len(stale)} événement(s) passé(s) dans {display_path(upcoming_dir)}:")
+        for path, date in stale:
+            print(f"   - {path.name} ({date.isoformat()})")
+        print("🔧 Lancez 'python test/archive_events.py' pour les archiver.")
+        return False
+    print("✅ Le dossier des événements à venir ne contient que des événements futurs")
+    return True
+
+
+def main():
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Archivage des événements passés")
+    parser.add_argument("--check", action="store_true", help="Échoue si des événements passés restent à archiver")
+    parser.add_argument("--dry-run", action="store_true", help="Affiche les déplacements sans les effectuer")
+    parser.add_argument("--now", help="Date de référence ISO (par défaut : maintenant)")
+    args = parser.parse_args()
+
+    now = parse_datetime(args.now) if args.now else None
+    if args.now and now is None:
+        parser.error(f"date invalide: {args.now}")
+    if now is not None and now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+
+    if args.check:
+        return check_hot_folder(now)
+    archive_events(now, dry_run=args.dry_run)
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Profilage de la construction Eleventy
+Lance le build avec la sortie de benchmark d'Eleventy (DEBUG=Eleventy:Benchmark*), en tire le coût
+par collection, par filtre et par template, et le compare à l'historique des commits précédents
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+RESULTS_DIR = Path(__file__).parent / ".cache" / "build-profile"
+HISTORY_FILE = RESULTS_DIR / "history.jsonl"
+
+KINDS = ("collection", "filter", "template", "other")
+
+ANSI = re.compile(r"\x1b\[[0-9;]*m")
+# « Eleventy:Benchmark Benchmark    12ms   4%    32× (Configuration) "markdown" Nunjucks Filter +0ms »
+BENCHMARK_LINE = re.compile(
+    r"Benchmark\s+(?P<ms>[\d.,]+)ms\s+(?P<percent>\d+)%\s+(?P<calls>\d+)×\s+"
+    r"\((?P<group>[^)]+)\)\s+(?P<name>.+?)(?:\s+\+\d+(?:\.\d+)?m?s)?\s*$"
+)
+QUOTED_NAME = re.compile(r'^"(?P<name>[^"]+)"\s+(?P<kind>.*)$')
+TEMPLATE_PHASE = re.compile(r"^>\s*(?P<phase>[^>]+?)\s*>\s*(?P<path>.+)$")
+
+
+def parse_benchmarks(output):
+    """
+    Extrait les lignes de benchmark de la sortie d'Eleventy.
+
+    Returns:
+        list: entrées {group, name, ms, percent, calls}
+    """
+    entries = []
+    for line in ANSI.sub("", output).splitlines():
+        match = BENCHMARK_LINE.search(line)
+        if not match:
+            continue
+        entries.append({
+            "group": match.group("group"),
+            "name": match.group("name").strip(),
+            "ms": float(match.group("ms").replace(",", "")),
+            "percent": int(match.group("percent")),
+            "calls": int(match.group("calls")),
+        })
+    return entries
+
+
+def classify(name):
+    """
+    Catégorie et clé d'une entrée de benchmark.
+
+    Les filtres universels sont mesurés une fois par moteur (Nunjucks, Liquid, JavaScript) :
+    ils sont regroupés sous leur nom.
+
+    Returns:
+        tuple: (catégorie, clé)
+    """
+    quoted = QUOTED_NAME.match(name)
+    if quoted:
+        kind = quoted.group("kind").lower()
+        if "collection" in kind:
+            return "collection", quoted.group("name")
+        if "filter" in kind or "function" in kind or "shortcode" in kind:
+            return "filter", quoted.group("name")
+    phase = TEMPLATE_PHASE.match(name)
+    if phase:
+        return "template", f"{phase.group('path').strip()} ({phase.group('phase').lower()})"
+    if name.lower().startswith("collection"):
+        return "collection", name.split(":", 1)[-1].strip()
+    return "other", name
+
+
+def cost_table(entries):
+    """
+    Agrège les entrées par catégorie.
+
+    Returns:
+        dict: catégorie → {clé: {ms, calls}}
+    """
+    table = {kind: {} for kind in KINDS}
+    for entry in entries:
+        kind, key = classify(entry["name"])
+        row = table[kind].setdefault(key, {"ms": 0.0, "calls": 0})
+        row["ms"] += entry["ms"]
+        row["calls"] += entry["calls"]
+    return table
+
+
+def median_table(tables):
+    """Médiane par clé de plusieurs builds (une clé absente d'un build compte pour 0 ms)"""
+    merged = {kind: {} for kind in KINDS}
+    for kind in KINDS:
+        keys = set().union(*(table[kind] for table in tables))
+        for key in keys:
+            rows = [table[kind].get(key, {"ms": 0.0, "calls": 0}) for table in tables]
+            merged[kind][key] = {
+                "ms": round(statistics.median(row["ms"] for row in rows), 2),
+                "calls": max(row["calls"] for row in rows),
+            }
+    return merged
+
+
+def run_build(output_dir):
+    """
+    Construit le site dans output_dir avec les benchmarks d'Eleventy activés.
+
+    Returns:
+        tuple: (sortie complète, durée totale en ms)
+    """
+    npx = shutil.which("npx")
+    if npx is None:
+        raise FileNotFoundError("npx introuvable : installez Node.js")
+    env = dict(os.environ, DEBUG="Eleventy:Benchmark*", DEBUG_COLORS="0", DEBUG_HIDE_DATE="1")
+    started = time.perf_counter()
+    result = subprocess.run(
+        [npx, "@11ty/eleventy", f"--output={output_dir}"],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, encoding="utf-8", errors="replace",
+    )
+    elapsed = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"Build Eleventy en échec ({result.returncode}) :\n{result.stderr[-2000:]}")
+    return result.stdout + "\n" + result.stderr, elapsed
+
+
+def git_revision():
+    """Commit courant (suffixé de « + » si l'arbre de travail est modifié), ou None hors dépôt git"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--", "src", ".eleventy.js"],
+                               cwd=PROJECT_ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ("+" if dirty else "")
+
+
+def load_history(path=HISTORY_FILE):
+    """Profils enregistrés, du plus ancien au plus récent"""
+    try:
+        lines = Path(path).read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
+        return []
+    return [json.loads(line) for line in lines if line.strip()]
+
+
+def record_profile(profile, path=HISTORY_FILE):
+    """Ajoute un profil à l'historique ; un nouveau profil du même commit remplace le précédent"""
+    history = [entry for entry in load_history(path) if entry["commit"] != profile["commit"]]
+    history.append(profile)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in history), encoding="utf-8")
+
+
+def find_regressions(table, history, commit=None, window=5, threshold=1.25, min_ms=5.0):
+    """
+    Compare un profil à la médiane des derniers commits de l'historique.
+
+    Args:
+        window: nombre de commits précédents servant de référence
+        threshold: rapport au-delà duquel une entrée est signalée
+        min_ms: écart minimal en ms (les entrées de quelques ms sont trop bruitées)
+
+    Returns:
+        list: régressions {kind, key, ms, baseline, ratio}, de la plus coûteuse à la moins coûteuse
+    """
+    previous = [entry for entry in history if entry["commit"] != commit][-window:]
+    if not previous:
+        return []
+    regressions = []
+    for kind in KINDS:
+        for key, row in table[kind].items():
+            past = [entry["table"][kind][key]["ms"] for entry in previous if key in entry["table"].get(kind, {})]
+            if not past:
+                continue
+            baseline = statistics.median(past)
+            if row["ms"] - baseline >= min_ms and row["ms"] > baseline * threshold:
+                regressions.append({
+                    "kind": kind, "key": key, "ms": row["ms"], "baseline": baseline,
+                    "ratio": row["ms"] / baseline if baseline else float("inf"),
+                })
+    return sorted(regressions, key=lambda item: item["baseline"] - item["ms"])
+
+
+def profile_build(runs=3):
+    """
+    Construit le site plusieurs fois dans un dossier temporaire (_site/ n'est pas touché).
+
+    Returns:
+        dict: profil {commit, date, runs, total_ms, table}
+    """
+    tables, totals = [], []
+    with tempfile.TemporaryDirectory(prefix="eleventy-profile-") as output_dir:
+        for run in range(1, runs + 1):
+            output, elapsed = run_build(output_dir)
+            entries = parse_benchmarks(output)
+            if not entries:
+                raise RuntimeError("Aucune ligne de benchmark dans la sortie d'Eleventy")
+            tables.append(cost_table(entries))
+            totals.append(elapsed)
+            print(f"⏱️ Build {run}/{runs} : {elapsed:.0f} ms ({len(entries)} mesure(s))")
+    return {
+        "commit": git_revision(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "runs": runs,
+        "total_ms": round(statistics.median(totals), 1),
+        "table": median_table(tables),
+    }
+
+
+def print_report(profile, regressions, top=10):
+    """Coût par catégorie (entrées les plus chères d'abord) puis régressions"""
+    labels = {"collection": "📚 Collections", "filter": "🧪 Filtres", "template": "📄 Templates", "other": "⚙️ Autres"}
+    print(f"\n🏗️ Build {profile['commit'] or '(hors git)'} : {profile['total_ms']:.0f} ms "
+          f"(médiane de {profile['runs']} build(s))")
+    for kind in KINDS:
+        rows = sorted(profile["table"][kind].items(), key=lambda item: -item[1]["ms"])
+        if not rows:
+            continue
+        total = sum(row["ms"] for _, row in rows)
+        print(f"\n{labels[kind]} — {total:.0f} ms")
+        for key, row in rows[:top]:
+            print(f"   {row['ms']:>9.1f} ms {row['calls']:>6}×  {key}")
+        if len(rows) > top:
+            print(f"   … {len(rows) - top} autre(s)")
+
+    if regressions:
+        print(f"\n⚠️ {len(regressions)} régression(s) par rapport aux commits précédents :")
+        for item in regressions:
+            print(f"   {labels[item['kind']]} {item['key']} : {item['baseline']:.1f} → {item['ms']:.1f} ms "
+                  f"(×{item['ratio']:.2f})")
+    else:
+        print("\n✅ Aucune régression détectée")
+
+
+def main():
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Coût du build Eleventy par collection, filtre et template")
+    parser.add_argument("--runs", type=int, default=3, help="Nombre de builds (la médiane est retenue)")
+    parser.add_argument("--top", type=int, default=10, help="Entrées affichées par catégorie")
+    parser.add_argument("--window", type=int, default=5, help="Commits précédents servant de référence")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Rapport signalé comme régression")
+    parser.add_argument("--min-ms", type=float, default=5.0, help="Écart minimal signalé (ms)")
+    parser.add_argument("--no-record", action="store_true", help="N'enregistre pas ce profil dans l'historique")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Code de sortie 1 en cas de régression")
+    args = parser.parse_args()
+
+    try:
+        profile = profile_build(max(1, args.runs))
+    except (FileNotFoundError, RuntimeError) as e:
+        print(f"❌ {e}")
+        return False
+
+    history = load_history()
+    regressions = find_regressions(profile["table"], history, profile["commit"], args.window,
+                                   args.threshold, args.min_ms)
+    print_report(profile, regressions, args.top)
+    if not args.no_record:
+        record_profile(profile)
+        print(f"💾 Historique: {HISTORY_FILE}")
+    return not (regressions and args.fail_on_regression)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,247 @@
+"""
+Modèle de contenu typé du site Mélodie & Cie
+Charge l'arborescence src/services à partir des collections déclarées dans src/admin/config.yml,
+avec un cache indexé par mtime et des index par slug, hash et date
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import make_dataclass
+from datetime import datetime
+from pathlib import Path
+
+import yaml
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CONFIG_PATH = PROJECT_ROOT / "src" / "admin" / "config.yml"
+
+# Tris arbitraires appliqués par .eleventy.js (champ, ordre des valeurs)
+ELEVENTY_ORDERS = {
+    "production_offres": ("title", [
+        "Production", "Enregistrement", "Mix", "Mastering", "Sound design", "Collaboration à distance"
+    ]),
+    "production_processus": ("title", [
+        "Brief", "Pré-production", "Tracking", "Mix", "Master", "Livraison"
+    ]),
+    "production_forfaits": ("title", ["Simple", "Premium", "Full"]),
+}
+
+# Champs ajoutés à chaque entrée en plus de ceux déclarés dans config.yml
+META_FIELDS = ("slug", "source")
+
+
+def load_cms_config(config_path=CONFIG_PATH):
+    """Lit la configuration Decap CMS"""
+    with open(config_path, encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def parse_datetime(value):
+    """Convertit une date ISO du widget datetime de Decap en datetime (None si invalide)"""
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def normalize_hash(value):
+    """Ancre sans '#', telle qu'utilisée dans les id des pages"""
+    return (value or "").lstrip("#")
+
+
+def _class_name(collection_name):
+    return "".join(part.capitalize() for part in collection_name.split("_")) + "Entry"
+
+
+def _freeze(value):
+    """Listes → tuples pour des entrées immuables et compactes"""
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class CollectionSpec:
+    """Description d'une collection « folder » de config.yml et de son type d'entrée"""
+
+    __slots__ = ("name", "label", "folder", "fields", "field_names", "entry_type")
+
+    def __init__(self, definition, root):
+        self.name = definition["name"]
+        self.label = definition.get("label", self.name)
+        self.folder = Path(root) / definition["folder"]
+        self.fields = definition.get("fields", [])
+        self.field_names = tuple(field["name"] for field in self.fields)
+
+        names = META_FIELDS + self.field_names
+        self.entry_type = make_dataclass(
+            _class_name(self.name),
+            [(name, object) for name in names],
+            namespace={"__slots__": names},
+            frozen=True,
+        )
+
+    def widget_fields(self, widget):
+        """Noms des champs utilisant un widget donné"""
+        return [field["name"] for field in self.fields if field.get("widget") == widget]
+
+    def make_entry(self, path, data):
+        """Construit une entrée typée ; les champs absents valent None"""
+        values = {name: _freeze(data.get(name)) for name in self.field_names}
+        return self.entry_type(slug=path.stem, source=path, **values)
+
+
+def _read_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class ContentRepository:
+    """
+    Dépôt en mémoire du contenu des collections.
+
+    Chaque appel à load() ne relit que les fichiers dont (mtime, taille) a changé ;
+    les lectures sont faites en parallèle.
+    """
+
+    def __init__(self, root=PROJECT_ROOT, config_path=None, max_workers=8):
+        self.root = Path(root)
+        self.config_path = Path(config_path) if config_path else self.root / "src" / "admin" / "config.yml"
+        self.max_workers = max_workers
+        self.collections = {}
+        self._config_mtime = None
+        self._file_cache = {}  # chemin -> (mtime_ns, taille, entrée)
+        self._entries = {}
+        self._by_slug = {}
+        self._by_hash = {}
+        self._by_date = {}
+
+    def _load_config(self):
+        mtime = self.config_path.stat().st_mtime_ns
+        if mtime == self._config_mtime:
+            return
+        config = load_cms_config(self.config_path)
+        self.collections = {
+            definition["name"]: CollectionSpec(definition, self.root)
+            for definition in config.get("collections", [])
+            if "folder" in definition
+        }
+        self._config_mtime = mtime
+        self._file_cache.clear()
+
+    def load(self):
+        """Charge (ou recharge incrémentalement) toutes les collections"""
+        self._load_config()
+
+        listing = {}
+        for spec in self.collections.values():
+            if not spec.folder.is_dir():
+                listing[spec.name] = []
+                continue
+            # readdirSync de Node renvoie les fichiers triés par nom
+            listing[spec.name] = sorted(
+                (entry for entry in os.scandir(spec.folder) if entry.name.endswith(".json")),
+                key=lambda entry: entry.name,
+            )
+
+        stale = []
+        for name, dir_entries in listing.items():
+            for dir_entry in dir_entries:
+                stat = dir_entry.stat()
+                cached = self._file_cache.get(dir_entry.path)
+                if not cached or cached[:2] != (stat.st_mtime_ns, stat.st_size):
+                    stale.append((name, Path(dir_entry.path), stat))
+
+        if stale:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                contents = list(pool.map(lambda item: _read_json(item[1]), stale))
+            for (name, path, stat), data in zip(stale, contents):
+                entry = self.collections[name].make_entry(path, data)
+                self._file_cache[str(path)] = (stat.st_mtime_ns, stat.st_size, entry)
+
+        present = {dir_entry.path for dir_entries in listing.values() for dir_entry in dir_entries}
+        for path in list(self._file_cache):
+            if path not in present:
+                del self._file_cache[path]
+
+        self._build_indexes(listing)
+        return self
+
+    def _build_indexes(self, listing):
+        self._entries, self._by_slug, self._by_hash, self._by_date = {}, {}, {}, {}
+
+        for name, dir_entries in listing.items():
+            spec = self.collections[name]
+            entries = [self._file_cache[dir_entry.path][2] for dir_entry in dir_entries]
+
+            if name in ELEVENTY_ORDERS:
+                key, order = ELEVENTY_ORDERS[name]
+                rank = {value: index for index, value in enumerate(order)}
+                entries.sort(key=lambda entry: rank.get(getattr(entry, key), -1))
+
+            self._entries[name] = entries
+            self._by_slug[name] = {entry.slug: entry for entry in entries}
+
+            if "hash" in spec.field_names:
+                for entry in entries:
+                    self._by_hash[normalize_hash(entry.hash)] = entry
+
+            date_fields = spec.widget_fields("datetime")
+            if date_fields:
+                dated = [(parse_datetime(getattr(entry, date_fields[0])), entry) for entry in entries]
+                self._by_date[name] = sorted(
+                    ((date, entry) for date, entry in dated if date is not None),
+                    key=lambda item: item[0],
+                )
+
+    def entries(self, collection):
+        """Entrées d'une collection, dans l'ordre produit par Eleventy"""
+        return list(self._entries[collection])
+
+    def by_slug(self, collection, slug):
+        """Entrée d'une collection par nom de fichier (sans extension)"""
+        return self._by_slug[collection].get(slug)
+
+    def by_hash(self, value):
+        """Formation par ancre, avec ou sans '#'"""
+        return self._by_hash.get(normalize_hash(value))
+
+    def by_date(self, collection):
+        """Liste (datetime, entrée) triée chronologiquement"""
+        return list(self._by_date.get(collection, []))
+
+    def between(self, collection, start=None, end=None):
+        """Entrées datées dans l'intervalle [start, end["""
+        return [
+            entry for date, entry in self._by_date.get(collection, [])
+            if (start is None or date >= start) and (end is None or date < end)
+        ]
+
+    def __iter__(self):
+        for entries in self._entries.values():
+            yield from entries
+
+
+_repository = None
+
+
+def load_content(root=PROJECT_ROOT):
+    """Dépôt partagé, rechargé incrémentalement à chaque appel"""
+    global _repository
+    repository = _repository
+    # Référence locale : un autre thread peut remplacer le dépôt partagé pour une autre racine
+    if repository is None or repository.root != Path(root):
+        repository = _repository = ContentRepository(root)
+    return repository.load()
+
+
+def entry_as_dict(entry):
+    """Représentation dict d'une entrée (listes restaurées), pour les helpers existants"""
+    return {
+        name: list(value) if isinstance(value, tuple) else value
+        for name, value in ((name, getattr(entry, name)) for name in entry.__slots__)
+        if name not in META_FIELDS
+    }
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Validation du contenu JSON de src/ contre les champs déclarés dans src/admin/config.yml
+Les définitions de champs sont compilées une fois en fonctions de validation ; seuls les fichiers
+dont le contenu a changé depuis la dernière exécution valide sont revérifiés
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from content_model import PROJECT_ROOT, load_cms_config, parse_datetime
+from hash_cache import HashCache, file_digest
+
+
+# À incrémenter quand les règles de validation changent (invalide le cache)
+VALIDATOR_VERSION = "1"
+
+
+def _is_blank(value):
+    return value is None or value == "" or value == []
+
+
+def _type_check(expected_types, type_label):
+    def check(value, where):
+        if not isinstance(value, expected_types) or isinstance(value, bool) and bool not in expected_types:
+            return [f"{where}: {type_label} attendu, {type(value).__name__} trouvé"]
+        return []
+    return check
+
+
+def _datetime_check(value, where):
+    if not isinstance(value, str) or parse_datetime(value) is None:
+        return [f"{where}: date ISO invalide ({value!r})"]
+    return []
+
+
+def _bounds_check(base_check, field, measure, unit):
+    minimum, maximum = field.get("min"), field.get("max")
+    if minimum is None and maximum is None:
+        return base_check
+
+    def check(value, where):
+        errors = base_check(value, where)
+        if errors:
+            return errors
+        size = measure(value)
+        label = f"{size} {unit}".strip()
+        if minimum is not None and size < minimum:
+            errors.append(f"{where}: {label}, minimum {minimum}")
+        if maximum is not None and size > maximum:
+            errors.append(f"{where}: {label}, maximum {maximum}")
+        return errors
+    return check
+
+
+def compile_field(field):
+    """
+    Compile la définition Decap d'un champ en fonction de validation.
+
+    Returns:
+        callable(value, where) -> liste de messages d'erreur
+    """
+    widget = field.get("widget", "string")
+
+    if widget in ("string", "text", "markdown", "image", "file", "color"):
+        check = _type_check((str,), "texte")
+    elif widget == "datetime":
+        check = _datetime_check
+    elif widget == "number":
+        check = _bounds_check(_type_check((int, float), "nombre"), field, lambda v: v, "")
+    elif widget == "boolean":
+        check = _type_check((bool,), "booléen")
+    elif widget == "select":
+        options = [o["value"] if isinstance(o, dict) else o for o in field.get("options", [])]
+
+        def check(value, where):
+            return [] if value in options else [f"{where}: valeur {value!r} hors des options {options}"]
+    elif widget == "object":
+        check = compile_fields(field.get("fields", []))
+    elif widget == "list":
+        if "fields" in field or "field" in field:
+            item_check = compile_fields(field["fields"]) if "fields" in field else compile_field(field["field"])
+        else:
+            item_check = _type_check((str,), "texte")
+
+        def list_check(value, where):
+            if not isinstance(value, list):
+                return [f"{where}: liste attendue, {type(value).__name__} trouvé"]
+            errors = []
+            for index, item in enumerate(value):
+                errors += item_check(item, f"{where}[{index}]")
+            return errors
+        check = _bounds_check(list_check, field, len, "élément(s)")
+    else:
+        # Widget inconnu : seule la présence est vérifiée
+        def check(value, where):
+            return []
+
+    required = field.get("required", True)
+
+    def validate(value, where):
+        if _is_blank(value):
+            return [f"{where}: champ obligatoire manquant"] if required else []
+        return check(value, where)
+    return validate
+
+
+def compile_fields(fields):
+    """Compile une liste de champs en validateur d'objet"""
+    compiled = [(field["name"], compile_field(field)) for field in fields]
+
+    def validate(value, where):
+        if not isinstance(value, dict):
+            return [f"{where}: objet attendu, {type(value).__name__} trouvé"]
+        errors = []
+        for name, field_check in compiled:
+            errors += field_check(value.get(name), f"{where}.{name}" if where else name)
+        return errors
+    return validate
+
+
+class ContentValidator:
+    """Validateur incrémental du contenu des collections"""
+
+    def __init__(self, root=PROJECT_ROOT, use_cache=True, max_workers=8):
+        self.root = Path(root)
+        self.config_path = self.root / "src" / "admin" / "config.yml"
+        self.max_workers = max_workers
+        config = load_cms_config(self.config_path)
+
+        # Compilation unique : chemin de fichier ou dossier → validateur
+        self.folder_validators = {}
+        self.file_validators = {}
+        for collection in config.get("collections", []):
+            if "folder" in collection:
+                self.folder_validators[self.root / collection["folder"]] = (
+                    collection["name"], compile_fields(collection.get("fields", []))
+                )
+            for item in collection.get("files", []):
+                self.file_validators[self.root / item["file"]] = (
+                    f"{collection['name']}/{item['name']}", compile_fields(item.get("fields", []))
+                )
+
+        namespace = hashlib.sha256(
+            self.config_path.read_bytes() + VALIDATOR_VERSION.encode()
+        ).hexdigest()
+        self.cache = HashCache("content_validation.json", namespace) if use_cache else None
+
+    def content_files(self):
+        """Liste (chemin, collection, validateur) de tous les fichiers de contenu"""
+        files = []
+        for folder, (name, validator) in self.folder_validators.items():
+            if folder.is_dir():
+                files += [(path, name, validator) for path in sorted(folder.glob("*.json"))]
+        for path, (name, validator) in self.file_validators.items():
+            files.append((path, name, validator))
+        return files
+
+    def _check_file(self, item):
+        path, collection, validator = item
+        key = str(path.relative_to(self.root))
+        if not path.exists():
+            return key, None, [f"{key}: fichier déclaré dans config.yml introuvable"], False
+
+        digest = file_digest(path)
+        if self.cache and self.cache.is_fresh(key, digest):
+            return key, digest, [], True
+
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError as e:
+            return key, digest, [f"{key}: JSON invalide ({e})"], False
+        return key, digest, [f"{key}: {error}" for error in validator(data, "")], False
+
+    def validate(self):
+        """
+        Valide tous les fichiers de contenu.
+
+        Returns:
+            tuple: (liste d'erreurs, nombre de fichiers vérifiés, nombre de fichiers ignorés car inchangés)
+        """
+        files = self.content_files()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = list(pool.map(self._check_file, files))
+
+        errors, checked, skipped = [], 0, 0
+        for key, digest, file_errors, fresh in results:
+            if fresh:
+                skipped += 1
+                continue
+            checked += 1
+            errors += file_errors
+            if self.cache is not None:
+                if file_errors or digest is None:
+                    self.cache.discard(key)
+                else:
+                    self.cache.update(key, digest)
+
+        if self.cache is not None:
+            self.cache.prune(key for key, *_ in results)
+            self.cache.save()
+        return errors, checked, skipped
+
+
+def validate_content(root=PROJECT_ROOT, use_cache=True):
+    """Porte de pré-test : True si tout le contenu est conforme à config.yml"""
+    start = time.perf_counter()
+    errors, checked, skipped = ContentValidator(root, use_cache).validate()
+    elapsed = (time.perf_counter() - start) * 1000
+
+    if errors:
+        print(f"❌ Contenu invalide ({len(errors)} erreur(s), {elapsed:.0f} ms):")
+        for error in errors:
+            print(f"   - {error}")
+        return False
+
+    print(f"✅ Contenu conforme à config.yml ({checked} vérifié(s), {skipped} inchangé(s), {elapsed:.0f} ms)")
+    return True
+
+
+def main():
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Validation du contenu JSON contre src/admin/config.yml")
+    parser.add_argument("--no-cache", action="store_true", help="Revérifie tous les fichiers")
+    args = parser.parse_args()
+    return validate_content(use_cache=not args.no_cache)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
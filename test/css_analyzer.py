@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Analyse du CSS inutilisé et du CSS critique du site construit (_site/)
+Parse les feuilles liées et les blocs <style> des composants, calcule les règles qui s'appliquent
+réellement sur chaque page et extrait le CSS « au-dessus de la ligne de flottaison » à intégrer
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+
+from cssselect import HTMLTranslator, SelectorError
+from lxml import etree, html
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SITE_DIR = PROJECT_ROOT / "_site"
+CRITICAL_DIR = Path(__file__).parent / ".cache" / "critical"
+
+# Règles conditionnelles dont le contenu est analysé comme le reste de la feuille
+GROUPING_AT_RULES = {"media", "supports", "container", "layer"}
+
+# Pseudo-classes d'état : ignorées, la règle compte si l'élément existe
+# (nom complet exigé : « :focus » ne doit pas amputer « :focus-visible »)
+DYNAMIC_PSEUDO = re.compile(
+    r"::?(?:hover|focus|focus-within|focus-visible|active|visited|link|any-link|target|checked|"
+    r"disabled|enabled|placeholder-shown|before|after|first-line|first-letter|selection|"
+    r"placeholder|marker|backdrop|-webkit-[\w-]+|-moz-[\w-]+)(?![\w-])(?:\([^)]*\))?"
+)
+FOLD_ATTRIBUTE = "data-css-analyzer-fold"
+BLANK = re.compile(r"(?:\s+|/\*.*?\*/)+", re.S)
+
+
+# --- Parseur CSS -------------------------------------------------------------
+
+def _skip_string(text, i):
+    quote = text[i]
+    i += 1
+    while i < len(text) and text[i] != quote:
+        i += 2 if text[i] == "\\" else 1
+    return i + 1
+
+
+def _scan_until(text, i, stops):
+    """Index du premier caractère de stops hors chaînes, commentaires et parenthèses"""
+    depth = 0
+    while i < len(text):
+        char = text[i]
+        if text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = len(text) if end < 0 else end + 2
+            continue
+        if char in "\"'":
+            i = _skip_string(text, i)
+            continue
+        if char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif depth <= 0 and char in stops:
+            return i
+        i += 1
+    return len(text)
+
+
+def _matching_brace(text, i):
+    """Index de l'accolade fermante correspondant à text[i] == '{'"""
+    depth = 0
+    while i < len(text):
+        i = _scan_until(text, i, "{}")
+        if i >= len(text):
+            return len(text) - 1
+        depth += 1 if text[i] == "{" else -1
+        if depth == 0:
+            return i
+        i += 1
+    return len(text) - 1
+
+
+def _strip_comments(text):
+    return re.sub(r"/\*.*?\*/", "", text, flags=re.S)
+
+
+def split_selectors(prelude):
+    """Sépare une liste de sélecteurs sur les virgules de premier niveau"""
+    selectors = []
+    start = 0
+    while start < len(prelude):
+        end = _scan_until(prelude, start, ",")
+        selector = prelude[start:end].strip()
+        if selector:
+            selectors.append(selector)
+        start = end + 1
+    return selectors
+
+
+class StyleRule:
+    """Règle de style (sélecteurs + déclarations), avec ses conditions @media englobantes"""
+
+    __slots__ = ("selectors", "body", "text", "media", "size")
+
+    def __init__(self, prelude, body, text, media):
+        self.selectors = split_selectors(prelude)
+        self.body = body
+        self.text = text.strip()
+        self.media = media
+        self.size = len(self.text.encode("utf-8"))
+
+
+class AtRule:
+    """@keyframes, @font-face, @import… : conservée telle quelle"""
+
+    __slots__ = ("keyword", "name", "text", "media", "size")
+
+    def __init__(self, keyword, prelude, text, media):
+        self.keyword = keyword
+        parts = prelude.split(None, 1)
+        self.name = parts[1].strip().strip("\"'") if len(parts) > 1 else ""
+        self.text = text.strip()
+        self.media = media
+        self.size = len(self.text.encode("utf-8"))
+
+
+def parse_css(text, media=()):
+    """
+    Découpe une feuille de style en règles à plat.
+
+    Returns:
+        list: StyleRule et AtRule, dans l'ordre de la feuille
+    """
+    rules = []
+    i = 0
+    while i < len(text):
+        match = BLANK.match(text, i)
+        if match:
+            i = match.end()
+        if i >= len(text):
+            break
+        if text[i] == "}":
+            i += 1
+            continue
+        start = i
+        end = _scan_until(text, i, "{;")
+        if end >= len(text):
+            break
+        prelude = _strip_comments(text[start:end]).strip()
+        if text[end] == ";":
+            if prelude.startswith("@"):
+                keyword = re.match(r"@([\w-]+)", prelude).group(1).lower()
+                rules.append(AtRule(keyword, prelude, text[start:end + 1], media))
+            i = end + 1
+            continue
+        close = _matching_brace(text, end)
+        body = text[end + 1:close]
+        if prelude.startswith("@"):
+            keyword = re.match(r"@([\w-]+)", prelude).group(1).lower()
+            if keyword in GROUPING_AT_RULES:
+                rules.extend(parse_css(body, media + (prelude,)))
+            else:
+                rules.append(AtRule(keyword, prelude, text[start:close + 1], media))
+        else:
+            rules.append(StyleRule(prelude, body, text[start:close + 1], media))
+        i = close + 1
+    return rules
+
+
+# --- Correspondance sélecteurs / pages ----------------------------------------
+
+class SelectorMatcher:
+    """Traduit chaque sélecteur une seule fois en XPath compilé"""
+
+    def __init__(self):
+        self.translator = HTMLTranslator()
+        self.compiled = {}
+
+    def compile(self, selector):
+        """XPath compilé du sélecteur, ou None s'il n'est pas évaluable (compté comme utilisé)"""
+        if selector not in self.compiled:
+            # HTMLTranslator traduit :hover & co. par « jamais » : on les retire avant traduction
+            candidate = DYNAMIC_PSEUDO.sub("", selector).strip() or "*"
+            try:
+                self.compiled[selector] = etree.XPath(self.translator.css_to_xpath(candidate))
+            except (SelectorError, etree.XPathSyntaxError, NotImplementedError):
+                self.compiled[selector] = None
+        return self.compiled[selector]
+
+    def matches(self, rule, document):
+        """Éléments de la page ciblés par la règle (liste vide si aucun)"""
+        found = []
+        for selector in rule.selectors:
+            xpath = self.compile(selector)
+            if xpath is None:
+                return [document]
+            found.extend(xpath(document))
+        return found
+
+
+def _referenced(name, rules):
+    pattern = re.compile(rf"(?<![\w-]){re.escape(name)}(?![\w-])")
+    return any(pattern.search(rule.body) for rule in rules)
+
+
+def used_rules(rules, matched):
+    """
+    Règles utilisées : règles de style ciblant au moins un élément, @keyframes / @font-face
+    référencés par ces règles, autres règles @ conservées.
+    """
+    styles = [rule for rule in rules if isinstance(rule, StyleRule) and matched.get(id(rule))]
+    used = set(id(rule) for rule in styles)
+    for rule in rules:
+        if isinstance(rule, AtRule):
+            if rule.keyword.endswith("keyframes"):
+                if _referenced(rule.name, styles):
+                    used.add(id(rule))
+            elif rule.keyword == "font-face":
+                family = re.search(r"font-family\s*:\s*([^;]+)", rule.text)
+                if family and _referenced(family.group(1).strip().strip("\"'"), styles):
+                    used.add(id(rule))
+            else:
+                used.add(id(rule))
+    return used
+
+
+def render_rules(rules):
+    """Réassemble des règles en regroupant les blocs @media consécutifs identiques"""
+    output = []
+    current_media = ()
+    block = []
+
+    def flush():
+        if not block:
+            return
+        text = "\n".join(block)
+        for condition in reversed(current_media):
+            text = f"{condition} {{\n{text}\n}}"
+        output.append(text)
+
+    for rule in rules:
+        if rule.media != current_media:
+            flush()
+            current_media, block = rule.media, []
+        block.append(rule.text)
+    flush()
+    return "\n".join(output) + ("\n" if output else "")
+
+
+# --- Analyse du site -----------------------------------------------------------
+
+class Stylesheet:
+    """Feuille de style (fichier lié ou bloc <style>) analysée une seule fois"""
+
+    def __init__(self, name, text, inline):
+        self.name = name
+        self.inline = inline
+        self.size = len(text.encode("utf-8"))
+        self.rules = parse_css(text)
+        self.used_anywhere = set()
+
+
+class CssAnalyzer:
+    """
+    Analyse toutes les pages HTML de root.
+
+    Args:
+        root: Site construit
+        fold_sections: Nombre de blocs de <main> considérés au-dessus de la ligne de flottaison
+    """
+
+    def __init__(self, root=SITE_DIR, fold_sections=2):
+        self.root = Path(root)
+        self.fold_sections = fold_sections
+        self.matcher = SelectorMatcher()
+        self.sheets = {}
+
+    def pages(self):
+        return sorted(p for p in self.root.rglob("*.html") if p.is_file())
+
+    def _sheet(self, key, loader, inline):
+        if key not in self.sheets:
+            self.sheets[key] = Stylesheet(key, loader(), inline)
+        return self.sheets[key]
+
+    def page_stylesheets(self, document):
+        """Feuilles liées (locales) puis blocs <style> de la page, dans l'ordre du document"""
+        sheets = []
+        for element in document.iter("link", "style"):
+            if element.tag == "link":
+                if "stylesheet" not in (element.get("rel") or "").lower():
+                    continue
+                href = (element.get("href") or "").split("?")[0]
+                path = self.root / href.lstrip("/")
+                if href.startswith(("http:", "https:", "//")) or not path.is_file():
+                    continue
+                sheets.append(self._sheet(href, lambda: path.read_text(encoding="utf-8"), inline=False))
+            else:
+                text = element.text or ""
+                key = f"<style> {hashlib.sha1(text.encode('utf-8')).hexdigest()[:8]}"
+                sheets.append(self._sheet(key, lambda: text, inline=True))
+        return sheets
+
+    def mark_fold(self, document):
+        """Marque l'en-tête et les premiers blocs de <main> comme visibles au chargement"""
+        roots = list(document.iter("html", "body", "main"))
+        for header in document.iter("header"):
+            roots.extend(header.iter())
+        container = document.xpath("//main/*[contains(concat(' ', normalize-space(@class), ' '), ' container ')]")
+        parent = container[0] if container else (document.xpath("//main") or [None])[0]
+        if parent is not None:
+            roots.append(parent)
+            blocks = [child for child in parent if isinstance(child.tag, str) and child.tag not in ("style", "script")]
+            for block in blocks[:self.fold_sections]:
+                roots.extend(block.iter())
+        for element in roots:
+            if isinstance(element.tag, str):
+                element.set(FOLD_ATTRIBUTE, "1")
+
+    def analyze_page(self, path):
+        """Rapport d'une page et son CSS critique"""
+        document = html.fromstring(path.read_bytes())
+        self.mark_fold(document)
+        report = {"page": "/" + path.relative_to(self.root).as_posix(), "sheets": []}
+        critical = []
+
+        for sheet in self.page_stylesheets(document):
+            matched = {}
+            above_fold = set()
+            for rule in sheet.rules:
+                if isinstance(rule, StyleRule):
+                    elements = self.matcher.matches(rule, document)
+                    matched[id(rule)] = bool(elements)
+                    if any(el.get(FOLD_ATTRIBUTE) for el in elements):
+                        above_fold.add(id(rule))
+            used = used_rules(sheet.rules, matched)
+            sheet.used_anywhere |= {index for index, rule in enumerate(sheet.rules) if id(rule) in used}
+            used_bytes = sum(rule.size for rule in sheet.rules if id(rule) in used)
+            report["sheets"].append({
+                "sheet": sheet.name,
+                "inline": sheet.inline,
+                "bytes": sheet.size,
+                "rule_bytes": sum(rule.size for rule in sheet.rules),
+                "used_bytes": used_bytes,
+                "unused_rules": sum(1 for rule in sheet.rules if id(rule) not in used),
+            })
+
+            # Seules les feuilles liées bloquent le rendu ; les <style> sont déjà dans la page
+            if not sheet.inline:
+                fold_used = used_rules(sheet.rules, {rule_id: True for rule_id in above_fold})
+                critical.extend(rule for rule in sheet.rules if id(rule) in fold_used
+                                and not (isinstance(rule, AtRule) and rule.keyword in ("import", "charset")))
+
+        report["critical_css"] = render_rules(critical)
+        report["blocking_bytes"] = sum(s["bytes"] for s in report["sheets"] if not s["inline"])
+        report["critical_bytes"] = len(report["critical_css"].encode("utf-8"))
+        report["unused_bytes"] = sum(s["rule_bytes"] - s["used_bytes"] for s in report["sheets"])
+        report["total_bytes"] = sum(s["rule_bytes"] for s in report["sheets"])
+        return report
+
+    def run(self):
+        """Analyse toutes les pages ; renvoie (rapports par page, règles jamais utilisées par feuille)"""
+        reports = [self.analyze_page(path) for path in self.pages()]
+        dead = {}
+        for name, sheet in self.sheets.items():
+            if sheet.inline:
+                continue
+            unused = [rule for index, rule in enumerate(sheet.rules) if index not in sheet.used_anywhere]
+            if unused:
+                dead[name] = {
+                    "bytes": sum(rule.size for rule in unused),
+                    "selectors": [", ".join(rule.selectors) if isinstance(rule, StyleRule) else rule.text.split("{")[0].strip()
+                                  for rule in unused],
+                }
+        return reports, dead
+
+
+def page_slug(page):
+    slug = page.strip("/").replace("/index.html", "").replace(".html", "").replace("/", "-")
+    return slug or "index"
+
+
+def print_report(reports, dead):
+    """Affiche le CSS inutilisé par page, puis les règles inutilisées sur tout le site"""
+    def kb(value):
+        return f"{value / 1024:6.1f} Ko"
+
+    print(f"\n{'page':<36} {'CSS':>9} {'inutilisé':>10} {'':>5} {'bloquant':>9} {'critique':>9}")
+    for report in reports:
+        share = report["unused_bytes"] / report["total_bytes"] * 100 if report["total_bytes"] else 0
+        print(f"{report['page']:<36} {kb(report['total_bytes'])} {kb(report['unused_bytes'])} {share:4.0f}% "
+              f"{kb(report['blocking_bytes'])} {kb(report['critical_bytes'])}")
+    if dead:
+        print("\nRègles inutilisées sur toutes les pages :")
+        for name, info in dead.items():
+            print(f"   {name} ({info['bytes']} octets)")
+            for selector in info["selectors"]:
+                print(f"      {selector}")
+
+
+def main():
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="CSS inutilisé et CSS critique par page")
+    parser.add_argument("--root", default=str(SITE_DIR), help="Dossier du site construit")
+    parser.add_argument("--sections", type=int, default=2,
+                        help="Blocs de <main> au-dessus de la ligne de flottaison (en plus de l'en-tête)")
+    parser.add_argument("--output", default=str(CRITICAL_DIR), help="Dossier des fichiers de CSS critique")
+    parser.add_argument("--json", help="Écrit aussi le rapport complet au format JSON")
+    args = parser.parse_args()
+
+    root = Path(args.root)
+    if not root.is_dir():
+        print(f"❌ Site non construit : {root} (lancez 'npm run build')")
+        return False
+
+    analyzer = CssAnalyzer(root, args.sections)
+    reports, dead = analyzer.run()
+    print_report(reports, dead)
+
+    output = Path(args.output)
+    output.mkdir(parents=True, exist_ok=True)
+    for report in reports:
+        if report["critical_css"]:
+            (output / f"{page_slug(report['page'])}.css").write_text(report["critical_css"], encoding="utf-8")
+    print(f"\n💾 CSS critique par page: {output}")
+    if args.json:
+        Path(args.json).write_text(json.dumps({"pages": reports, "unused_everywhere": dead}, indent=2,
+                                              ensure_ascii=False), encoding="utf-8")
+        print(f"💾 Rapport: {args.json}")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,184 @@
+"""
+Assertions sur un instantané du DOM pour les tests de Mélodie & Cie
+Récupère page_source une seule fois puis évalue toutes les vérifications localement avec lxml,
+au lieu d'un aller-retour WebDriver par requête XPath
+"""
+
+from lxml import html as lxml_html
+
+
+def normalize_text(text):
+    """Normalise les espaces d'un texte (retours à la ligne, indentation, espaces multiples)"""
+    return " ".join((text or "").split())
+
+
+def _xpath_literal(value):
+    """Construit un littéral XPath 1.0 sûr, même si la valeur contient des apostrophes"""
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    parts = value.split("'")
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in parts) + ")"
+
+
+class DomSnapshot:
+    """Instantané immuable d'une page, interrogeable localement"""
+
+    def __init__(self, page_source, url=None):
+        self.url = url
+        self.tree = lxml_html.fromstring(page_source)
+        self._text = None
+
+    @classmethod
+    def from_driver(cls, driver):
+        """Capture le DOM courant du navigateur en un seul appel WebDriver"""
+        return cls(driver.page_source, driver.current_url)
+
+    @property
+    def text(self):
+        """Texte visible normalisé de toute la page (calculé une seule fois)"""
+        if self._text is None:
+            nodes = self.tree.xpath("//text()[not(ancestor::script or ancestor::style)]")
+            self._text = normalize_text(" ".join(nodes))
+        return self._text
+
+    def contains_text(self, text):
+        """Indique si le texte apparaît quelque part dans la page"""
+        return normalize_text(text) in self.text
+
+    def xpath(self, expression):
+        """Évalue une expression XPath sur l'instantané"""
+        return self.tree.xpath(expression)
+
+    def css(self, selector):
+        """Évalue un sélecteur CSS sur l'instantané"""
+        return self.tree.cssselect(selector)
+
+    def element_text(self, element):
+        """Texte normalisé d'un élément"""
+        return normalize_text(element.text_content())
+
+    def elements_containing(self, text):
+        """Éléments dont le texte propre contient la valeur (équivalent de //*[contains(text(), ...)])"""
+        return self.xpath(f"//*[contains(text(), {_xpath_literal(text)})]")
+
+
+class SnapshotAssertions:
+    """
+    Accumule des vérifications de contenu sur un instantané et les rapporte en une passe.
+
+    Les échecs sont collectés au lieu de lever immédiatement, afin d'obtenir
+    la liste complète des écarts avec une seule capture du DOM.
+    """
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.checks = 0
+        self.failures = []
+
+    def _record(self, ok, message):
+        self.checks += 1
+        if not ok:
+            self.failures.append(message)
+        return ok
+
+    def expect_text(self, text, description=None):
+        """Le texte doit apparaître dans la page"""
+        return self._record(
+            self.snapshot.contains_text(text),
+            f"{description or 'Texte'} absent: '{text}'"
+        )
+
+    def expect_no_text(self, text, description=None):
+        """Le texte ne doit pas apparaître dans la page"""
+        return self._record(
+            not self.snapshot.contains_text(text),
+            f"{description or 'Texte'} présent alors qu'il ne devrait pas: '{text}'"
+        )
+
+    def expect_xpath(self, expression, min_count=1, description=None):
+        """L'expression XPath doit correspondre à au moins min_count éléments"""
+        count = len(self.snapshot.xpath(expression))
+        return self._record(
+            count >= min_count,
+            f"{description or expression}: {count} élément(s) trouvé(s), {min_count} attendu(s)"
+        )
+
+    def expect_sequence(self, selector, expected, description=None):
+        """Les textes des éléments ciblés doivent apparaître dans cet ordre exact"""
+        actual = [self.snapshot.element_text(el) for el in self.snapshot.css(selector)]
+        expected = [normalize_text(value) for value in expected]
+        return self._record(
+            actual == expected,
+            f"{description or selector}: ordre {actual} au lieu de {expected}"
+        )
+
+    def expect_formation(self, formation):
+        """
+        Vérifie qu'une formation est rendue sur la page des formations.
+
+        Args:
+            formation: dict avec name, shortDescription, teachers, styles et hash
+
+        Returns:
+            bool: True si toutes les vérifications de la formation passent
+        """
+        name = formation["name"]
+        failures_before = len(self.failures)
+
+        # Carte de la galerie : titre + description courte
+        cards = [
+            card for card in self.snapshot.css("article.grid-gallery__card")
+            if any(self.snapshot.element_text(title) == normalize_text(name)
+                   for title in card.cssselect(".grid-gallery__title"))
+        ]
+        if self._record(bool(cards), f"Carte de galerie absente pour la formation '{name}'"):
+            descr = " ".join(self.snapshot.element_text(d) for d in cards[0].cssselect(".grid-gallery__descr"))
+            self._record(
+                normalize_text(formation.get("shortDescription")) in descr,
+                f"Description courte incorrecte pour '{name}': '{descr}'"
+            )
+
+        # Article de détail : ancre hash, professeurs et styles
+        anchor = (formation.get("hash") or "").replace("#", "")
+        articles = self.snapshot.xpath(
+            f"//article[contains(@class, 'formation-detail') and @id={_xpath_literal(anchor)}]"
+        )
+        if self._record(bool(articles), f"Article de détail absent pour '{name}' (#{anchor})"):
+            detail = self.snapshot.element_text(articles[0])
+            teachers = ", ".join(formation.get("teachers") or [])
+            styles = ", ".join(formation.get("styles") or [])
+            self._record(
+                f"Professeur : {normalize_text(teachers)}" in detail,
+                f"Professeurs incorrects pour '{name}' (attendu: {teachers})"
+            )
+            self._record(
+                f"Styles : {normalize_text(styles)}" in detail,
+                f"Styles incorrects pour '{name}' (attendu: {styles})"
+            )
+
+        return len(self.failures) == failures_before
+
+    def expect_formations(self, formations):
+        """Vérifie toutes les formations en une seule passe sur l'instantané"""
+        return all([self.expect_formation(formation) for formation in formations])
+
+    @property
+    def passed(self):
+        return not self.failures
+
+    def report(self):
+        """Affiche le bilan des vérifications"""
+        if self.passed:
+            print(f"✅ {self.checks} vérification(s) de contenu réussie(s)")
+        else:
+            print(f"❌ {len(self.failures)}/{self.checks} vérification(s) de contenu en échec:")
+            for failure in self.failures:
+                print(f"   - {failure}")
+
+    def assert_all(self):
+        """Lève une AssertionError listant tous les échecs"""
+        self.report()
+        if not self.passed:
+            raise AssertionError("❌ " + " | ".join(self.failures))
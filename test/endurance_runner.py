@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Test d'endurance du cycle de navigation
+Répète accueil → services → formation → événements → production → contact → accueil
+dans plusieurs navigateurs en parallèle, pendant une durée ou un nombre d'itérations donné,
+avec des histogrammes de latence par étape (style HDR, p50 à p99.9) en mémoire bornée
+et des instantanés périodiques sur disque
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from navigation_utils import NAVIGATION_CYCLE, NavigationHelper, create_chrome_driver
+
+
+RESULTS_DIR = Path(__file__).parent / ".cache" / "endurance"
+PERCENTILES = (50, 90, 99, 99.9)
+
+# 128 sous-compartiments par puissance de deux : erreur relative ≤ 1/64 ≈ 1,56 %
+SUB_BUCKET_BITS = 7
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+HALF_SUB_BUCKETS = SUB_BUCKETS // 2
+
+
+class LatencyHistogram:
+    """
+    Histogramme log-linéaire à la manière de HdrHistogram.
+
+    Les valeurs (en microsecondes) sont rangées dans des compartiments dont la largeur
+    double à chaque puissance de deux : la mémoire reste bornée quel que soit le nombre
+    de mesures, avec une précision relative constante.
+    """
+
+    __slots__ = ("counts", "total", "min", "max", "sum")
+
+    def __init__(self):
+        self.counts = {}
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.sum = 0
+
+    @staticmethod
+    def _index(value_us):
+        if value_us < SUB_BUCKETS:
+            return value_us
+        shift = value_us.bit_length() - SUB_BUCKET_BITS
+        mantissa = value_us >> shift
+        return SUB_BUCKETS + (shift - 1) * HALF_SUB_BUCKETS + (mantissa - HALF_SUB_BUCKETS)
+
+    @staticmethod
+    def _highest_value(index):
+        if index < SUB_BUCKETS:
+            return index
+        offset = index - SUB_BUCKETS
+        shift = offset // HALF_SUB_BUCKETS + 1
+        mantissa = offset % HALF_SUB_BUCKETS + HALF_SUB_BUCKETS
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, value_ms):
+        """Enregistre une latence en millisecondes"""
+        value_us = max(0, int(value_ms * 1000))
+        index = self._index(value_us)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total += 1
+        self.sum += value_us
+        self.min = value_us if self.min is None else min(self.min, value_us)
+        self.max = value_us if self.max is None else max(self.max, value_us)
+
+    def merge(self, other):
+        """Ajoute les mesures d'un autre histogramme"""
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total += other.total
+        self.sum += other.sum
+        if other.total:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentile(self, percent):
+        """Valeur (ms) sous laquelle se trouvent percent % des mesures"""
+        if not self.total:
+            return None
+        target = max(1, int(round(percent / 100 * self.total + 0.5 - 1e-9)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._highest_value(index), self.max) / 1000
+        return self.max / 1000
+
+    def summary(self):
+        """Résumé compact : nombre, min, moyenne, max et percentiles (ms)"""
+        if not self.total:
+            return {"count": 0}
+        result = {
+            "count": self.total,
+            "min": self.min / 1000,
+            "mean": round(self.sum / self.total / 1000, 3),
+            "max": self.max / 1000,
+        }
+        for percent in PERCENTILES:
+            result[f"p{percent:g}"] = self.percentile(percent)
+        return result
+
+
+class StepStats:
+    """Mesures d'une étape sur une fenêtre de temps"""
+
+    __slots__ = ("histogram", "errors")
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.errors = 0
+
+
+class RollingLatencyStats:
+    """
+    Statistiques par étape : cumul depuis le début + fenêtres glissantes bornées.
+
+    Seules les `windows` dernières fenêtres sont conservées (deque à taille fixe).
+    """
+
+    def __init__(self, window_seconds=60, windows=10):
+        self.window_seconds = window_seconds
+        self.lock = threading.Lock()
+        self.cumulative = {}
+        self.windows = deque(maxlen=windows)
+        self._open_window(time.time())
+
+    def _open_window(self, start):
+        self.current = {"start": start, "steps": {}}
+        self.windows.append(self.current)
+
+    def _rotate(self, now):
+        if now - self.current["start"] >= self.window_seconds:
+            self._open_window(now)
+
+    def record(self, step, latency_ms=None, error=False):
+        """Enregistre une mesure (ou une erreur) pour une étape"""
+        now = time.time()
+        with self.lock:
+            self._rotate(now)
+            for bucket in (self.cumulative, self.current["steps"]):
+                stats = bucket.setdefault(step, StepStats())
+                if error:
+                    stats.errors += 1
+                else:
+                    stats.histogram.record(latency_ms)
+
+    def snapshot(self, recent_windows=1):
+        """Résumé cumulé et sur les dernières fenêtres, par étape"""
+        with self.lock:
+            self._rotate(time.time())
+            recent = {}
+            for window in list(self.windows)[-recent_windows:]:
+                for step, stats in window["steps"].items():
+                    merged = recent.setdefault(step, StepStats())
+                    merged.histogram.merge(stats.histogram)
+                    merged.errors += stats.errors
+
+            def describe(stats):
+                attempts = stats.histogram.total + stats.errors
+                return {
+                    **stats.histogram.summary(),
+                    "errors": stats.errors,
+                    "error_rate": round(stats.errors / attempts, 4) if attempts else 0,
+                }
+
+            return {
+                "cumulative": {step: describe(stats) for step, stats in self.cumulative.items()},
+                "recent": {step: describe(stats) for step, stats in recent.items()},
+            }
+
+
+class EnduranceWorker(threading.Thread):
+    """Un navigateur qui répète le cycle de navigation"""
+
+    def __init__(self, worker_id, base_url, stats, stop_event, iterations=None, headless=True, think_time=0):
+        super().__init__(name=f"endurance-{worker_id}", daemon=True)
+        self.worker_id = worker_id
+        self.base_url = base_url
+        self.stats = stats
+        self.stop_event = stop_event
+        self.iterations = iterations
+        self.headless = headless
+        self.think_time = think_time
+        self.cycles = 0
+
+    def _timed_step(self, driver, nav_helper, step, method_name, url_part):
+        start = time.perf_counter()
+        try:
+            ok = getattr(nav_helper, method_name)()
+            if ok:
+                WebDriverWait(driver, 10).until(
+                    EC.url_contains(url_part) if url_part else EC.url_to_be(self.base_url.rstrip("/") + "/")
+                )
+                WebDriverWait(driver, 10).until(
+                    lambda d: d.execute_script("return document.readyState") == "complete"
+                )
+        except Exception as e:
+            print(f"   ⚠️ [{self.name}] {step}: {type(e).__name__}")
+            ok = False
+        if ok:
+            self.stats.record(step, (time.perf_counter() - start) * 1000)
+        else:
+            self.stats.record(step, error=True)
+            # Retour à l'accueil pour repartir d'un état connu ; son échec compte aussi comme une erreur
+            try:
+                driver.get(self.base_url)
+            except Exception as e:
+                print(f"   ⚠️ [{self.name}] chargement: {type(e).__name__}")
+                self.stats.record("chargement", error=True)
+        return ok
+
+    def run(self):
+        driver = create_chrome_driver(headless=self.headless)
+        nav_helper = NavigationHelper(driver, 10)
+        try:
+            start = time.perf_counter()
+            driver.get(self.base_url)
+            self.stats.record("chargement", (time.perf_counter() - start) * 1000)
+
+            while not self.stop_event.is_set():
+                if self.iterations is not None and self.cycles >= self.iterations:
+                    break
+                for step, method_name, url_part in NAVIGATION_CYCLE:
+                    if self.stop_event.is_set():
+                        break
+                    self._timed_step(driver, nav_helper, step, method_name, url_part)
+                    if self.think_time:
+                        time.sleep(self.think_time)
+                self.cycles += 1
+        finally:
+            driver.quit()
+
+
+class EnduranceRunner:
+    """Orchestration des navigateurs et écriture des instantanés périodiques"""
+
+    def __init__(self, base_url="http://localhost:8080", browsers=2, duration=None, iterations=None,
+                 snapshot_interval=30, window_seconds=60, headless=True, think_time=0):
+        self.base_url = base_url
+        self.browsers = browsers
+        self.duration = duration
+        self.iterations = iterations
+        self.snapshot_interval = snapshot_interval
+        self.headless = headless
+        self.think_time = think_time
+        self.stats = RollingLatencyStats(window_seconds)
+        self.stop_event = threading.Event()
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        self.output = RESULTS_DIR / f"endurance-{datetime.now().strftime('%Y%m%d-%H%M%S')}.jsonl"
+
+    def write_snapshot(self, workers, started):
+        """Ajoute un instantané (une ligne JSON) au fichier de résultats"""
+        snapshot = {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "elapsed_s": round(time.time() - started, 1),
+            "cycles": sum(worker.cycles for worker in workers),
+            **self.stats.snapshot(),
+        }
+        with open(self.output, "a", encoding="utf-8") as f:
+            f.write(json.dumps(snapshot, ensure_ascii=False) + "\n")
+        return snapshot
+
+    def run(self):
+        """Lance l'endurance et renvoie le dernier instantané"""
+        print(f"🏃 Endurance: {self.browsers} navigateur(s), "
+              + (f"{self.duration}s" if self.duration else f"{self.iterations} itération(s) par navigateur"))
+        print(f"💾 Instantanés: {self.output}")
+
+        workers = [
+            EnduranceWorker(i, self.base_url, self.stats, self.stop_event, self.iterations,
+                            self.headless, self.think_time)
+            for i in range(self.browsers)
+        ]
+        started = time.time()
+        for worker in workers:
+            worker.start()
+
+        next_snapshot = started + self.snapshot_interval
+        try:
+            while any(worker.is_alive() for worker in workers):
+                if self.duration and time.time() - started >= self.duration:
+                    self.stop_event.set()
+                if time.time() >= next_snapshot:
+                    snapshot = self.write_snapshot(workers, started)
+                    print(f"📸 {snapshot['elapsed_s']:.0f}s — {snapshot['cycles']} cycle(s) terminé(s)")
+                    next_snapshot += self.snapshot_interval
+                time.sleep(0.5)
+        except KeyboardInterrupt:
+            print("⏹️ Interruption demandée, arrêt des navigateurs...")
+            self.stop_event.set()
+        for worker in workers:
+            worker.join()
+
+        return self.write_snapshot(workers, started)
+
+
+def print_summary(snapshot):
+    """Tableau final des latences par étape"""
+    print("\n" + "=" * 90)
+    print(f"📊 ENDURANCE — {snapshot['cycles']} cycle(s) en {snapshot['elapsed_s']:.0f}s")
+    print("=" * 90)
+    header = f"{'étape':<12}{'n':>7}" + "".join(f"{'p' + format(p, 'g'):>10}" for p in PERCENTILES)
+    print(header + f"{'max':>10}{'erreurs':>10}")
+    for step, stats in snapshot["cumulative"].items():
+        if not stats.get("count"):
+            print(f"{step:<12}{0:>7}" + " " * 10 * (len(PERCENTILES) + 1) + f"{stats['errors']:>10}")
+            continue
+        values = "".join(f"{stats['p' + format(p, 'g')]:>10.0f}" for p in PERCENTILES)
+        print(f"{step:<12}{stats['count']:>7}{values}{stats['max']:>10.0f}"
+              f"{stats['errors']:>6} ({stats['error_rate']:.1%})")
+
+
+def main():
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Endurance du cycle de navigation")
+    parser.add_argument("--base-url", default="http://localhost:8080", help="URL du site")
+    parser.add_argument("--browsers", type=int, default=2, help="Navigateurs en parallèle")
+    limit = parser.add_mutually_exclusive_group(required=True)
+    limit.add_argument("--duration", type=float, help="Durée totale en secondes")
+    limit.add_argument("--iterations", type=int, help="Nombre de cycles par navigateur")
+    parser.add_argument("--snapshot-interval", type=float, default=30, help="Intervalle entre instantanés (s)")
+    parser.add_argument("--window", type=float, default=60, help="Durée d'une fenêtre glissante (s)")
+    parser.add_argument("--think-time", type=float, default=0, help="Pause après chaque étape (s)")
+    parser.add_argument("--headed", action="store_true", help="Affiche les navigateurs")
+    args = parser.parse_args()
+
+    runner = EnduranceRunner(
+        args.base_url, args.browsers, args.duration, args.iterations,
+        args.snapshot_interval, args.window, headless=not args.headed, think_time=args.think_time
+    )
+    snapshot = runner.run()
+    print_summary(snapshot)
+    errors = sum(stats["errors"] for stats in snapshot["cumulative"].values())
+    return errors == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,136 @@
+"""
+Capture des artefacts d'échec pour les tests Selenium de Mélodie & Cie
+Conserve en mémoire, dans un tampon circulaire borné, les captures d'écran, le DOM et les logs
+console des dernières étapes ; rien n'est écrit sur disque tant que le test passe
+"""
+
+import json
+import time
+import traceback
+import zlib
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+
+ARTIFACTS_DIR = Path(__file__).parent / "artifacts"
+
+
+class CapturedFrame:
+    """État du navigateur à une étape, stocké compressé"""
+
+    __slots__ = ("index", "step", "time", "url", "screenshot", "dom", "console")
+
+    def __init__(self, index, step, url, screenshot, dom, console):
+        self.index = index
+        self.step = step
+        self.time = time.time()
+        self.url = url
+        self.screenshot = screenshot  # PNG, déjà compressé
+        self.dom = dom                # HTML compressé zlib
+        self.console = console        # JSON compressé zlib
+
+    @property
+    def size(self):
+        return len(self.screenshot or b"") + len(self.dom or b"") + len(self.console or b"")
+
+
+class FailureCapture:
+    """
+    Tampon circulaire des N dernières étapes d'un test.
+
+    Args:
+        driver: WebDriver à observer
+        capacity: Nombre d'étapes conservées
+        screenshots: Capture d'écran à chaque étape (le plus coûteux ; désactivable)
+    """
+
+    def __init__(self, driver, capacity=10, screenshots=True, output_dir=ARTIFACTS_DIR):
+        self.driver = driver
+        self.frames = deque(maxlen=capacity)
+        self.screenshots = screenshots
+        self.output_dir = Path(output_dir)
+        self._count = 0
+
+    def attach(self, nav_helper):
+        """Capture automatiquement après chaque clic de navigation réussi"""
+        nav_helper.add_step_listener(self.capture)
+
+    def _console_logs(self):
+        try:
+            return self.driver.get_log("browser")
+        except Exception:
+            return []
+
+    def capture(self, step):
+        """Ajoute l'état courant du navigateur au tampon (aucune écriture disque)"""
+        self._count += 1
+        try:
+            url = self.driver.current_url
+            dom = zlib.compress(self.driver.page_source.encode("utf-8"), 1)
+            screenshot = self.driver.get_screenshot_as_png() if self.screenshots else None
+        except Exception as e:
+            url, dom, screenshot = None, zlib.compress(f"Capture impossible: {e}".encode("utf-8"), 1), None
+        console = zlib.compress(json.dumps(self._console_logs(), ensure_ascii=False).encode("utf-8"), 1)
+        self.frames.append(CapturedFrame(self._count, step, url, screenshot, dom, console))
+
+    @property
+    def memory_bytes(self):
+        """Taille occupée par le tampon"""
+        return sum(frame.size for frame in self.frames)
+
+    def dump(self, test_name, error=None):
+        """
+        Écrit le tampon sur disque (à appeler uniquement en cas d'échec).
+
+        Returns:
+            Path: Dossier contenant les artefacts
+        """
+        self.capture("échec")
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        target = self.output_dir / f"{test_name}-{stamp}"
+        target.mkdir(parents=True, exist_ok=True)
+
+        summary = {
+            "test": test_name,
+            "error": None if error is None else f"{type(error).__name__}: {error}",
+            "traceback": None if error is None else "".join(
+                traceback.format_exception(type(error), error, error.__traceback__)
+            ),
+            "steps": [],
+        }
+        for frame in self.frames:
+            prefix = f"{frame.index:03d}-{''.join(c if c.isalnum() else '_' for c in frame.step)[:40]}"
+            (target / f"{prefix}.html").write_bytes(zlib.decompress(frame.dom))
+            if frame.screenshot:
+                (target / f"{prefix}.png").write_bytes(frame.screenshot)
+            logs = json.loads(zlib.decompress(frame.console))
+            if logs:
+                with open(target / f"{prefix}.console.jsonl", "w", encoding="utf-8") as f:
+                    for entry in logs:
+                        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            summary["steps"].append({
+                "index": frame.index,
+                "step": frame.step,
+                "url": frame.url,
+                "time": datetime.fromtimestamp(frame.time).isoformat(timespec="milliseconds"),
+                "files": prefix,
+                "console_entries": len(logs),
+            })
+
+        (target / "summary.json").write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"🗂️ Artefacts d'échec ({len(self.frames)} étape(s)) écrits dans: {target}")
+        return target
+
+    @contextmanager
+    def guard(self, test_name):
+        """Écrit les artefacts si le bloc lève une exception, puis la propage"""
+        try:
+            yield self
+        except BaseException as e:
+            try:
+                self.dump(test_name, e)
+            except Exception as dump_error:
+                print(f"⚠️ Impossible d'écrire les artefacts d'échec: {dump_error}")
+            raise
@@ -0,0 +1,786 @@
+#!/usr/bin/env python3
+"""
+Simulateur local du backend git-gateway de production (Netlify Identity + API GitHub)
+Serveur asyncio adossé à un dépôt git sur disque, pour tester et mesurer hors ligne le parcours
+du back-office avec config.yml, y compris le coût des commits à chaque publication
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import os
+import re
+import secrets
+import shutil
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import requests
+
+from content_model import PROJECT_ROOT
+from harness_log import get_logger
+
+
+logger = get_logger("git_gateway")
+
+REPO_DIR = Path(__file__).parent / ".cache" / "git-gateway" / "repo.git"
+RESULTS_DIR = Path(__file__).parent / ".cache" / "git-gateway"
+DEFAULT_EMAIL = "test@melodie-et-cie.local"
+DEFAULT_PASSWORD = "melodie"
+IDENTITY_PREFIX = "/.netlify/identity"
+GATEWAY_PREFIX = "/.netlify/git"
+
+# Requêtes émises par Decap à chaque publication (mode de publication simple)
+PUBLISH_ROUTES = {
+    "POST github/git/blobs",
+    "GET github/branches/:branch",
+    "POST github/git/trees",
+    "POST github/git/commits",
+    "PATCH github/git/refs/heads/:branch",
+}
+PUBLISH_START = "POST github/git/blobs"
+
+REASONS = {
+    200: "OK", 201: "Created", 204: "No Content", 400: "Bad Request", 401: "Unauthorized",
+    404: "Not Found", 405: "Method Not Allowed", 422: "Unprocessable Entity", 500: "Internal Server Error",
+    502: "Bad Gateway",
+}
+
+HOP_HEADERS = {"connection", "keep-alive", "transfer-encoding", "content-encoding", "content-length"}
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+class GitError(Exception):
+    """Échec d'une commande git"""
+
+
+class GitRepository:
+    """Dépôt nu manipulé uniquement par les commandes de plomberie git"""
+
+    def __init__(self, path=REPO_DIR, branch="main"):
+        self.path = Path(path)
+        self.branch = branch
+        self.ref_lock = asyncio.Lock()
+        self.env = dict(
+            os.environ,
+            GIT_AUTHOR_NAME="Decap CMS", GIT_AUTHOR_EMAIL="cms@melodie-et-cie.local",
+            GIT_COMMITTER_NAME="git-gateway", GIT_COMMITTER_EMAIL="git-gateway@melodie-et-cie.local",
+        )
+
+    async def git(self, *args, input=None, env=None, cwd=None):
+        """Exécute une commande git sur le dépôt et renvoie sa sortie brute"""
+        process = await asyncio.create_subprocess_exec(
+            "git", f"--git-dir={self.path}", *args,
+            stdin=asyncio.subprocess.PIPE if input is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+            env=dict(self.env, **(env or {})), cwd=cwd,
+        )
+        out, err = await process.communicate(input)
+        if process.returncode != 0:
+            raise GitError(err.decode("utf-8", "replace").strip())
+        return out
+
+    async def init(self, source_root, paths=("src",)):
+        """Recrée le dépôt et y importe l'état courant de source_root en un seul commit"""
+        if self.path.exists():
+            shutil.rmtree(self.path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        process = await asyncio.create_subprocess_exec(
+            "git", "init", "--bare", "-q", str(self.path),
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE,
+        )
+        _, err = await process.communicate()
+        if process.returncode != 0:
+            raise GitError(err.decode("utf-8", "replace").strip())
+        await self.git("symbolic-ref", "HEAD", f"refs/heads/{self.branch}")
+
+        index = {"GIT_INDEX_FILE": str(self.path / "import.index")}
+        await self.git(f"--work-tree={source_root}", "add", "-A", "--", *paths, env=index, cwd=source_root)
+        tree = (await self.git("write-tree", env=index)).decode().strip()
+        commit = (await self.git("commit-tree", tree, "-m", "Import initial", env=index)).decode().strip()
+        await self.git("update-ref", f"refs/heads/{self.branch}", commit)
+        (self.path / "import.index").unlink()
+        return commit
+
+    async def rev_parse(self, revision):
+        try:
+            return (await self.git("rev-parse", "--verify", "-q", revision)).decode().strip()
+        except GitError:
+            raise GitError(f"Révision introuvable: {revision}")
+
+    async def ls_tree(self, treeish, recursive=False):
+        """Entrées d'un arbre au format de l'API GitHub"""
+        args = ["ls-tree", "-l", "-z"] + (["-r", "-t"] if recursive else []) + [treeish]
+        entries = []
+        for line in (await self.git(*args)).decode("utf-8").split("\0"):
+            if not line:
+                continue
+            meta, path = line.split("\t", 1)
+            mode, kind, sha, size = meta.split()
+            entry = {"path": path, "mode": mode, "type": kind, "sha": sha}
+            if kind == "blob":
+                entry["size"] = int(size)
+            entries.append(entry)
+        return entries
+
+    async def object_type(self, sha):
+        return (await self.git("cat-file", "-t", sha)).decode().strip()
+
+    async def read_blob(self, sha):
+        return await self.git("cat-file", "blob", sha)
+
+    async def write_blob(self, content):
+        return (await self.git("hash-object", "-w", "--stdin", input=content)).decode().strip()
+
+    async def write_tree(self, base_tree, entries):
+        """
+        Construit un arbre à partir de base_tree et d'entrées GitHub ({path, mode, sha}).
+        Une entrée avec sha null supprime le chemin.
+        """
+        index_path = self.path / f"tree-{uuid.uuid4().hex}.index"
+        env = {"GIT_INDEX_FILE": str(index_path)}
+        try:
+            if base_tree:
+                await self.git("read-tree", base_tree, env=env)
+            else:
+                await self.git("read-tree", "--empty", env=env)
+            lines = []
+            for entry in entries:
+                if entry.get("sha") is None and "content" in entry:
+                    entry["sha"] = await self.write_blob(entry["content"].encode("utf-8"))
+                if entry.get("sha") is None:
+                    lines.append(f"0 {'0' * 40}\t{entry['path']}")
+                else:
+                    lines.append(f"{entry.get('mode', '100644')} {entry['sha']}\t{entry['path']}")
+            await self.git("update-index", "--index-info", input=("\n".join(lines) + "\n").encode("utf-8"), env=env)
+            return (await self.git("write-tree", env=env)).decode().strip()
+        finally:
+            if index_path.exists():
+                index_path.unlink()
+
+    async def commit_tree(self, tree, parents, message, author=None):
+        args = ["commit-tree", tree]
+        for parent in parents:
+            args += ["-p", parent]
+        env = {}
+        if author:
+            env["GIT_AUTHOR_NAME"] = author.get("name") or "Decap CMS"
+            env["GIT_AUTHOR_EMAIL"] = author.get("email") or "cms@melodie-et-cie.local"
+            if author.get("date"):
+                env["GIT_AUTHOR_DATE"] = author["date"]
+        return (await self.git(*args, input=message.encode("utf-8"), env=env)).decode().strip()
+
+    async def commit_info(self, sha):
+        raw = (await self.git("show", "-s", "--format=%T%x1f%P%x1f%an%x1f%ae%x1f%aI%x1f%cI%x1f%B", sha)).decode("utf-8")
+        tree, parents, name, email, authored, committed, message = raw.split("\x1f", 6)
+        return {
+            "sha": sha,
+            "tree": {"sha": tree},
+            "parents": [{"sha": p} for p in parents.split()],
+            "author": {"name": name, "email": email, "date": authored},
+            "committer": {"name": name, "email": email, "date": committed},
+            "message": message.strip(),
+        }
+
+    async def log(self, revision, path=None, limit=30):
+        args = ["log", f"-n{limit}", "--format=%H%x1f%an%x1f%ae%x1f%aI%x1f%s", revision]
+        if path:
+            args += ["--", path]
+        commits = []
+        for line in (await self.git(*args)).decode("utf-8").splitlines():
+            sha, name, email, date, subject = line.split("\x1f", 4)
+            commits.append({
+                "sha": sha,
+                "commit": {
+                    "author": {"name": name, "email": email, "date": date},
+                    "committer": {"name": name, "email": email, "date": date},
+                    "message": subject,
+                },
+                "author": {"login": email},
+            })
+        return commits
+
+    async def changed_paths(self, old, new):
+        """Chemins modifiés entre deux commits : liste de (statut, chemin)"""
+        raw = (await self.git("diff-tree", "-r", "-z", "--no-renames", "--name-status", old, new)).decode("utf-8")
+        parts = [p for p in raw.split("\0") if p]
+        return list(zip(parts[0::2], parts[1::2]))
+
+    async def is_ancestor(self, ancestor, descendant):
+        try:
+            await self.git("merge-base", "--is-ancestor", ancestor, descendant)
+            return True
+        except GitError:
+            return False
+
+    async def update_ref(self, new, old=None):
+        args = ["update-ref", f"refs/heads/{self.branch}", new]
+        if old:
+            args.append(old)
+        await self.git(*args)
+
+
+class IdentityService:
+    """Sous-ensemble de GoTrue (Netlify Identity) : un utilisateur, jetons JWT HS256"""
+
+    def __init__(self, email=DEFAULT_EMAIL, password=DEFAULT_PASSWORD, roles=("admin",), ttl=3600):
+        self.email = email
+        self.password = password
+        self.roles = list(roles)
+        self.ttl = ttl
+        self.secret = secrets.token_bytes(32)
+        self.user_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, email))
+        self.created_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    @staticmethod
+    def _b64(data):
+        return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+    def _sign(self, message):
+        return self._b64(hmac.new(self.secret, message.encode("ascii"), hashlib.sha256).digest())
+
+    def issue_token(self):
+        header = self._b64(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+        payload = self._b64(json.dumps({
+            "sub": self.user_id,
+            "email": self.email,
+            "exp": int(time.time()) + self.ttl,
+            "app_metadata": {"provider": "email", "roles": self.roles},
+            "user_metadata": {"full_name": "Test Mélodie & Cie"},
+        }).encode())
+        return f"{header}.{payload}.{self._sign(f'{header}.{payload}')}"
+
+    def verify(self, authorization):
+        """Vérifie un en-tête « Bearer <jwt> » ; renvoie la charge utile ou None"""
+        if not authorization or not authorization.lower().startswith("bearer "):
+            return None
+        token = authorization[7:].strip()
+        try:
+            header, payload, signature = token.split(".")
+        except ValueError:
+            return None
+        if not hmac.compare_digest(signature, self._sign(f"{header}.{payload}")):
+            return None
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return claims if claims.get("exp", 0) > time.time() else None
+
+    def token_response(self):
+        return {
+            "access_token": self.issue_token(),
+            "token_type": "bearer",
+            "expires_in": self.ttl,
+            "refresh_token": secrets.token_urlsafe(24),
+        }
+
+    def user(self):
+        return {
+            "id": self.user_id,
+            "aud": "",
+            "role": "",
+            "email": self.email,
+            "confirmed_at": self.created_at,
+            "created_at": self.created_at,
+            "updated_at": self.created_at,
+            "app_metadata": {"provider": "email", "roles": self.roles},
+            "user_metadata": {"full_name": "Test Mélodie & Cie"},
+        }
+
+
+class Request:
+    """Requête HTTP reçue"""
+
+    __slots__ = ("method", "target", "path", "query", "headers", "body", "detail")
+
+    def __init__(self, method, target, headers, body):
+        parts = urlsplit(target)
+        self.method = method
+        self.target = target
+        self.path = parts.path
+        self.query = dict(parse_qsl(parts.query))
+        self.headers = headers
+        self.body = body
+        self.detail = {}
+
+    def json(self):
+        return json.loads(self.body or b"{}")
+
+
+def json_response(status, data):
+    return status, {"Content-Type": "application/json; charset=utf-8"}, json.dumps(data).encode("utf-8")
+
+
+def not_found():
+    return json_response(404, {"message": "Not Found"})
+
+
+async def read_request(reader):
+    """Lit une requête HTTP/1.1 (None si la connexion est fermée)"""
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    method, target, _ = line.decode("latin-1").split(" ", 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length") or 0)
+    body = await reader.readexactly(length) if length else b""
+    return Request(method, target, headers, body)
+
+
+class RequestStats:
+    """Latence serveur par route et coût de chaque publication"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.publishes = []
+        self._pending = {}  # jeton (ou connexion) → requêtes de la publication en cours
+        self._lock = threading.Lock()
+
+    def record(self, route, started, elapsed_ms, request):
+        with self._lock:
+            self.latencies.setdefault(route, []).append(elapsed_ms)
+            if route not in PUBLISH_ROUTES:
+                return
+            # Une publication commence au premier envoi de blob : les lectures de branche entre deux
+            # publications ne comptent pas ; chaque client a sa propre fenêtre
+            key = request.headers.get("authorization") or request.detail.get("connection")
+            pending = self._pending.get(key)
+            if pending is None:
+                if route != PUBLISH_START:
+                    return
+                pending = self._pending[key] = []
+            pending.append((route, started, elapsed_ms))
+            if not route.startswith("PATCH"):
+                return
+            del self._pending[key]
+            if request.detail.get("commit"):
+                blobs = [ms for r, _, ms in pending if r == PUBLISH_START]
+                self.publishes.append({
+                    "commit": request.detail["commit"],
+                    "files": request.detail.get("files", len(blobs)),
+                    "requests": len(pending),
+                    "blob_uploads": len(blobs),
+                    "server_ms": round(sum(ms for _, _, ms in pending), 2),
+                    "wall_ms": round((started - pending[0][1]) * 1000 + elapsed_ms, 2),
+                    "deploy_ms": request.detail.get("deploy_ms"),
+                })
+
+    def report(self):
+        routes = {
+            route: {
+                "count": len(values),
+                "p50_ms": round(_percentile(values, 0.50), 2),
+                "p95_ms": round(_percentile(values, 0.95), 2),
+                "max_ms": round(max(values), 2),
+            }
+            for route, values in sorted(self.latencies.items())
+        }
+        return {"routes": routes, "publishes": self.publishes}
+
+
+class GitGatewayMock:
+    """
+    Serveur local simulant Netlify Identity et git-gateway devant le site.
+
+    Args:
+        upstream: Site à servir pour toutes les autres URL (serveur de dev ou proxy des scripts tiers)
+        source_root: Projet importé dans le dépôt au démarrage
+        deploy_root: Si défini, chaque publication y est recopiée (comme un déploiement Netlify),
+                     ce qui laisse Eleventy --serve reconstruire le site
+    """
+
+    def __init__(self, upstream="http://localhost:8080", port=0, repo_dir=REPO_DIR, source_root=PROJECT_ROOT,
+                 deploy_root=None, branch="main", email=DEFAULT_EMAIL, password=DEFAULT_PASSWORD):
+        self.upstream = upstream.rstrip("/") if upstream else None
+        self.port = port
+        self.source_root = Path(source_root)
+        self.deploy_root = Path(deploy_root) if deploy_root else None
+        self.repo_dir = Path(repo_dir)
+        self.branch = branch
+        self.identity = IdentityService(email, password)
+        self.stats = RequestStats()
+        self.session = requests.Session()
+        # (méthode, motif, nom de route pour les statistiques, gestionnaire)
+        routes = [
+            ("GET", r"/settings", "settings", self.gateway_settings),
+            ("GET", r"/github/branches/(?P<branch>[^/]+)", "github/branches/:branch", self.get_branch),
+            ("GET", r"/github/git/refs/heads/(?P<branch>[^/]+)", "github/git/refs/heads/:branch", self.get_ref),
+            ("PATCH", r"/github/git/refs/heads/(?P<branch>[^/]+)", "github/git/refs/heads/:branch", self.patch_ref),
+            ("GET", r"/github/git/trees/(?P<treeish>.+)", "github/git/trees/:tree", self.get_tree),
+            ("POST", r"/github/git/trees", "github/git/trees", self.create_tree),
+            ("GET", r"/github/git/blobs/(?P<sha>[0-9a-f]{40})", "github/git/blobs/:sha", self.get_blob),
+            ("POST", r"/github/git/blobs", "github/git/blobs", self.create_blob),
+            ("GET", r"/github/git/commits/(?P<sha>[0-9a-f]{40})", "github/git/commits/:sha", self.get_commit),
+            ("POST", r"/github/git/commits", "github/git/commits", self.create_commit),
+            ("GET", r"/github/commits", "github/commits", self.list_commits),
+            ("GET", r"/github/contents/(?P<path>.+)", "github/contents/:path", self.get_contents),
+        ]
+        self.routes = [(method, re.compile(pattern + "$"), name, handler) for method, pattern, name, handler in routes]
+        self.repo = None
+        self._loop = None
+        self._stopping = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._error = None
+        self._connections = {}
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    # --- Cycle de vie -------------------------------------------------------
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        self.repo = GitRepository(self.repo_dir, self.branch)
+        await self.repo.init(self.source_root)
+        server = await asyncio.start_server(self._handle_connection, "127.0.0.1", self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        async with server:
+            await self._stopping.wait()
+            # Fermer les connexions keep-alive pour laisser leurs tâches se terminer proprement
+            for writer in self._connections.values():
+                writer.close()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+
+    def _run(self):
+        try:
+            asyncio.run(self._serve())
+        except Exception as e:
+            self._error = e
+            self._ready.set()
+
+    def start(self, timeout=15):
+        """Importe le projet dans le dépôt, démarre le serveur dans un thread et retourne son URL"""
+        started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout) or self._error:
+            raise RuntimeError(f"Démarrage du simulateur git-gateway impossible: {self._error}")
+        print(f"✅ Simulateur git-gateway actif sur {self.url} → {self.upstream or 'aucun site'} "
+              f"(prêt en {time.perf_counter() - started:.2f}s)")
+        return self.url
+
+    def stop(self):
+        """Arrête le serveur"""
+        if self._loop and self._stopping:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+        if self._thread:
+            self._thread.join(5)
+        self.session.close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    # --- HTTP ---------------------------------------------------------------
+
+    async def _handle_connection(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                request.detail["connection"] = id(writer)
+                wall = time.time()
+                started = time.perf_counter()
+                try:
+                    route, (status, headers, body) = await self._dispatch(request)
+                except Exception as e:
+                    # JSON invalide, champ manquant… : Decap reçoit une erreur exploitable, pas une coupure
+                    logger.exception(f"❌ {request.method} {request.path}: {type(e).__name__}: {e}")
+                    route = f"{request.method} erreur interne"
+                    status, headers, body = json_response(500, {"message": f"{type(e).__name__}: {e}"})
+                self.stats.record(route, wall, (time.perf_counter() - started) * 1000, request)
+
+                keep_alive = request.headers.get("connection", "").lower() != "close"
+                head = [f"HTTP/1.1 {status} {REASONS.get(status, 'OK')}",
+                        f"Content-Length: {len(body)}",
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+                head += [f"{name}: {value}" for name, value in headers.items()]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+                if request.method != "HEAD":
+                    writer.write(body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+
+    async def _dispatch(self, request):
+        """Renvoie (route, (statut, en-têtes, corps))"""
+        if request.path.startswith(IDENTITY_PREFIX):
+            return await self._identity(request, request.path[len(IDENTITY_PREFIX):])
+        if request.path.startswith(GATEWAY_PREFIX):
+            return await self._gateway(request, request.path[len(GATEWAY_PREFIX):])
+        return "proxy", await self._loop.run_in_executor(None, self._proxy, request)
+
+    async def _identity(self, request, path):
+        route = f"{request.method} identity{path}"
+        if path == "/settings":
+            return route, json_response(200, {
+                "external": {"email": True, "github": False, "gitlab": False, "google": False, "bitbucket": False},
+                "disable_signup": True,
+                "autoconfirm": True,
+            })
+        if path == "/token" and request.method == "POST":
+            form = dict(parse_qsl(request.body.decode("utf-8")))
+            grant = form.get("grant_type")
+            if grant == "refresh_token" or (grant == "password" and form.get("username") == self.identity.email
+                                            and form.get("password") == self.identity.password):
+                return route, json_response(200, self.identity.token_response())
+            return route, json_response(400, {"error": "invalid_grant",
+                                              "error_description": "No user found with that email, or password invalid."})
+        if path == "/user":
+            if not self.identity.verify(request.headers.get("authorization")):
+                return route, json_response(401, {"msg": "Invalid token"})
+            return route, json_response(200, self.identity.user())
+        if path == "/logout":
+            return route, (204, {}, b"")
+        return route, not_found()
+
+    async def _gateway(self, request, path):
+        for method, pattern, name, handler in self.routes:
+            match = pattern.match(path)
+            if match and method == request.method:
+                route = f"{method} {name}"
+                if not self.identity.verify(request.headers.get("authorization")):
+                    return route, json_response(401, {"msg": "Invalid token"})
+                try:
+                    return route, await handler(request, **{k: unquote(v) for k, v in match.groupdict().items()})
+                except GitError as e:
+                    return route, json_response(404 if request.method == "GET" else 422, {"message": str(e)})
+        return f"{request.method} gateway (inconnue)", not_found()
+
+    def _proxy(self, request):
+        if not self.upstream:
+            return not_found()
+        headers = {k: v for k, v in request.headers.items() if k not in HOP_HEADERS and k != "host"}
+        try:
+            response = self.session.request(
+                request.method, self.upstream + request.target, headers=headers,
+                data=request.body or None, allow_redirects=False, timeout=30,
+            )
+        except requests.RequestException as e:
+            return 502, {"Content-Type": "text/plain; charset=utf-8"}, f"Site inaccessible: {e}".encode("utf-8")
+        body = response.content
+        content_type = response.headers.get("Content-Type", "")
+        if request.path.rstrip("/").endswith("/admin") or request.path.endswith("/admin/index.html"):
+            if "html" in content_type:
+                body = self._rewrite_admin(body.decode(response.encoding or "utf-8")).encode("utf-8")
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in HOP_HEADERS}
+        return response.status_code, headers, body
+
+    @staticmethod
+    def _rewrite_admin(html):
+        """Force config.yml (git-gateway) et l'écran de connexion intégré de Decap"""
+        html = html.replace("/admin/config.dev.yml", "/admin/config.yml")
+        return re.sub(r'<script[^>]*netlify-identity-widget[^>]*>\s*</script>', "", html)
+
+    # --- API GitHub ---------------------------------------------------------
+
+    async def gateway_settings(self, request):
+        return json_response(200, {"github_enabled": True, "gitlab_enabled": False,
+                                   "bitbucket_enabled": False, "roles": self.identity.roles})
+
+    async def get_branch(self, request, branch):
+        commit = await self.repo.rev_parse(f"refs/heads/{branch}")
+        info = await self.repo.commit_info(commit)
+        return json_response(200, {"name": branch, "protected": False,
+                                   "commit": {"sha": commit, "commit": info}})
+
+    async def get_ref(self, request, branch):
+        commit = await self.repo.rev_parse(f"refs/heads/{branch}")
+        return json_response(200, {"ref": f"refs/heads/{branch}", "object": {"sha": commit, "type": "commit"}})
+
+    async def patch_ref(self, request, branch):
+        data = request.json()
+        async with self.repo.ref_lock:
+            old = await self.repo.rev_parse(f"refs/heads/{branch}")
+            if not data.get("force") and not await self.repo.is_ancestor(old, data["sha"]):
+                return json_response(422, {"message": "Update is not a fast forward"})
+            await self.repo.update_ref(data["sha"], old)
+            changes = await self.repo.changed_paths(old, data["sha"])
+            request.detail.update(commit=data["sha"], files=len(changes))
+            if self.deploy_root:
+                started = time.perf_counter()
+                await self._deploy(changes)
+                request.detail["deploy_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return json_response(200, {"ref": f"refs/heads/{branch}", "object": {"sha": data["sha"], "type": "commit"}})
+
+    async def _deploy(self, changes):
+        """Recopie les fichiers publiés dans deploy_root"""
+        for status, path in changes:
+            target = self.deploy_root / path
+            if status == "D":
+                if target.exists():
+                    target.unlink()
+                continue
+            content = await self.repo.git("show", f"refs/heads/{self.branch}:{path}")
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(content)
+
+    async def get_tree(self, request, treeish):
+        # « main:src/services/formation » désigne directement un arbre ; « main » un commit
+        sha = await self.repo.rev_parse(treeish if ":" in treeish else f"{treeish}^{{tree}}")
+        if await self.repo.object_type(sha) != "tree":
+            return not_found()
+        entries = await self.repo.ls_tree(sha, recursive=bool(request.query.get("recursive")))
+        return json_response(200, {"sha": sha, "tree": entries, "truncated": False})
+
+    async def create_tree(self, request):
+        data = request.json()
+        sha = await self.repo.write_tree(data.get("base_tree"), data.get("tree", []))
+        request.detail["files"] = len(data.get("tree", []))
+        return json_response(201, {"sha": sha, "tree": await self.repo.ls_tree(sha)})
+
+    async def get_blob(self, request, sha):
+        content = await self.repo.read_blob(sha)
+        if "raw" in request.headers.get("accept", ""):
+            return 200, {"Content-Type": "application/octet-stream", "Cache-Control": "private, max-age=31536000"}, content
+        return json_response(200, {"sha": sha, "size": len(content), "encoding": "base64",
+                                   "content": base64.b64encode(content).decode("ascii")})
+
+    async def create_blob(self, request):
+        data = request.json()
+        content = data["content"]
+        raw = base64.b64decode(content) if data.get("encoding") == "base64" else content.encode("utf-8")
+        return json_response(201, {"sha": await self.repo.write_blob(raw)})
+
+    async def get_commit(self, request, sha):
+        return json_response(200, await self.repo.commit_info(sha))
+
+    async def create_commit(self, request):
+        data = request.json()
+        sha = await self.repo.commit_tree(data["tree"], data.get("parents", []), data.get("message", ""), data.get("author"))
+        return json_response(201, await self.repo.commit_info(sha))
+
+    async def list_commits(self, request):
+        revision = request.query.get("sha", self.branch)
+        return json_response(200, await self.repo.log(revision, request.query.get("path")))
+
+    async def get_contents(self, request, path):
+        ref = request.query.get("ref", self.branch)
+        object_id = await self.repo.rev_parse(f"{ref}:{path}")
+        if await self.repo.object_type(object_id) == "tree":
+            entries = await self.repo.ls_tree(object_id)
+            return json_response(200, [
+                {"name": e["path"], "path": f"{path}/{e['path']}", "sha": e["sha"], "size": e.get("size", 0),
+                 "type": "file" if e["type"] == "blob" else "dir"}
+                for e in entries
+            ])
+        content = await self.repo.read_blob(object_id)
+        if "raw" in request.headers.get("accept", ""):
+            return 200, {"Content-Type": "application/octet-stream"}, content
+        return json_response(200, {"type": "file", "name": path.rsplit("/", 1)[-1], "path": path, "sha": object_id,
+                                   "size": len(content), "encoding": "base64",
+                                   "content": base64.b64encode(content).decode("ascii")})
+
+
+def print_report(report):
+    """Affiche les latences par route et le coût des publications"""
+    print("\n" + "=" * 70)
+    print("🔐 SIMULATEUR GIT-GATEWAY")
+    print("=" * 70)
+    print(f"{'route':<44} {'n':>5} {'p50':>8} {'p95':>8} {'max':>8}")
+    for route, stats in report["routes"].items():
+        print(f"{route:<44} {stats['count']:>5} {stats['p50_ms']:>6.1f}ms {stats['p95_ms']:>6.1f}ms {stats['max_ms']:>6.1f}ms")
+    if report["publishes"]:
+        print("\nPublications :")
+        for publish in report["publishes"]:
+            print(f"   {publish['commit'][:8]} {publish['files']} fichier(s), {publish['requests']} requêtes, "
+                  f"serveur {publish['server_ms']:.1f} ms, total {publish['wall_ms']:.1f} ms")
+
+
+def run_benchmark(mock, publishes=20, files=3):
+    """
+    Rejoue la séquence de requêtes d'une publication Decap (blobs en parallèle, arbre, commit, ref)
+    sans navigateur, pour mesurer le coût des commits par publication.
+    """
+    session = requests.Session()
+    token = session.post(f"{mock.url}{IDENTITY_PREFIX}/token", data={
+        "grant_type": "password", "username": mock.identity.email, "password": mock.identity.password,
+    }).json()["access_token"]
+    session.headers["Authorization"] = f"Bearer {token}"
+    api = f"{mock.url}{GATEWAY_PREFIX}/github"
+
+    with ThreadPoolExecutor(max_workers=files) as pool:
+        for run in range(publishes):
+            contents = [json.dumps({"name": f"Bench {run}-{i}", "hash": f"#bench-{run}-{i}"}).encode("utf-8")
+                        for i in range(files)]
+            blobs = list(pool.map(lambda content: session.post(f"{api}/git/blobs", json={
+                "content": base64.b64encode(content).decode("ascii"), "encoding": "base64",
+            }).json()["sha"], contents))
+            head = session.get(f"{api}/branches/{mock.branch}").json()["commit"]
+            tree = session.post(f"{api}/git/trees", json={
+                "base_tree": head["commit"]["tree"]["sha"],
+                "tree": [{"path": f"src/services/formation/bench-{i}.json", "mode": "100644", "type": "blob", "sha": sha}
+                         for i, sha in enumerate(blobs)],
+            }).json()
+            commit = session.post(f"{api}/git/commits", json={
+                "message": f"Update Formations “bench-{run}”", "tree": tree["sha"], "parents": [head["sha"]],
+            }).json()
+            session.patch(f"{api}/git/refs/heads/{mock.branch}", json={"sha": commit["sha"], "force": False})
+    session.close()
+
+
+def main():
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Simulateur local de git-gateway / Netlify Identity")
+    parser.add_argument("--upstream", default="http://localhost:8080", help="Site servi pour les autres URL")
+    parser.add_argument("--port", type=int, default=8091, help="Port du simulateur")
+    parser.add_argument("--deploy", action="store_true", help="Recopie chaque publication dans le projet (src/)")
+    parser.add_argument("--bench", type=int, metavar="N", help="Mesure N publications sans navigateur puis quitte")
+    parser.add_argument("--files", type=int, default=3, help="Avec --bench : fichiers par publication")
+    args = parser.parse_args()
+
+    mock = GitGatewayMock(args.upstream, args.port, deploy_root=PROJECT_ROOT if args.deploy else None)
+    mock.start()
+    if args.bench:
+        run_benchmark(mock, args.bench, args.files)
+    else:
+        print(f"🔑 Connexion au back-office {mock.url}/admin/ : {mock.identity.email} / {mock.identity.password}")
+        try:
+            mock._thread.join()
+        except KeyboardInterrupt:
+            pass
+    mock.stop()
+
+    report = mock.stats.report()
+    print_report(report)
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    output = RESULTS_DIR / f"report-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"💾 Rapport complet: {output}")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
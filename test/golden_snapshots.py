@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Instantanés de référence (golden) des pages construites (_site/)
+Chaque page est réduite à une forme canonique (structure + texte), hachée et comparée à sa référence
+dans test/golden/ ; seules les pages dont l'empreinte a changé sont comparées, en parallèle
+"""
+
+import argparse
+import difflib
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from lxml import etree, html
+
+from dom_snapshot import normalize_text
+from hash_cache import HashCache, file_digest
+
+
+SITE_DIR = Path(__file__).parent.parent / "_site"
+GOLDEN_DIR = Path(__file__).parent / "golden"
+INDEX_FILE = GOLDEN_DIR / "index.json"
+NORMALIZE_VERSION = "1"
+
+# Éléments rendus sur leur propre ligne, imbriqués par indentation
+BLOCK_ELEMENTS = {
+    "body", "header", "footer", "main", "nav", "section", "article", "aside", "div", "address",
+    "h1", "h2", "h3", "h4", "h5", "h6", "p", "pre", "blockquote", "figure", "figcaption", "hr",
+    "ul", "ol", "li", "dl", "dt", "dd", "table", "thead", "tbody", "tfoot", "tr", "td", "th", "caption",
+    "form", "fieldset", "legend", "details", "summary",
+}
+# Sans contenu visible : ignorés avec tout leur sous-arbre
+SKIPPED_ELEMENTS = {"script", "style", "noscript", "template", "svg"}
+
+
+def _descriptor(element):
+    """tag#id.classes (+ cible des liens), classes triées pour ne pas dépendre de leur ordre"""
+    descriptor = element.tag
+    if element.get("id"):
+        descriptor += "#" + element.get("id")
+    descriptor += "".join("." + name for name in sorted(element.get("class", "").split()))
+    if element.tag == "a":
+        descriptor += f" → {element.get('href', '')}"
+    return descriptor
+
+
+def _is_block(element):
+    if element.tag in BLOCK_ELEMENTS:
+        return True
+    # Lien « carte » contenant des blocs (ex. a.service-link > h3)
+    return element.tag == "a" and any(
+        isinstance(child.tag, str) and child.tag in BLOCK_ELEMENTS for child in element.iterdescendants()
+    )
+
+
+def _inline(element):
+    """Rendu d'un élément en ligne : liens, images et champs gardent leur cible ou leur nom"""
+    if element.tag == "img":
+        return f"![{element.get('alt', '')}]({element.get('src', '')})"
+    if element.tag == "br":
+        return " "
+    if element.tag in ("input", "select", "textarea", "button"):
+        label = element.get("name") or element.get("type") or element.tag
+        return f"[{element.tag}:{label}] {element.text_content() if element.tag == 'button' else ''}"
+    parts = [element.text or ""]
+    for child in element:
+        if isinstance(child.tag, str) and child.tag not in SKIPPED_ELEMENTS:
+            parts.append(_inline(child))
+        parts.append(child.tail or "")
+    content = normalize_text(" ".join(parts))
+    if element.tag == "a":
+        return f"[{content}]({element.get('href', '')})"
+    return content
+
+
+def _render(element, depth, lines):
+    indent = "  " * depth
+    header = [_descriptor(element)]
+    buffer = [element.text or ""]
+
+    def flush():
+        text = normalize_text(" ".join(buffer))
+        buffer.clear()
+        if header:
+            lines.append(indent + header.pop() + (f": {text}" if text else ""))
+        elif text:
+            lines.append(f"{indent}  | {text}")
+
+    for child in element:
+        if isinstance(child.tag, str) and child.tag not in SKIPPED_ELEMENTS:
+            if _is_block(child):
+                flush()
+                _render(child, depth + 1, lines)
+            else:
+                buffer.append(_inline(child))
+        buffer.append(child.tail or "")
+    flush()
+
+
+def canonical_form(source):
+    """
+    Forme canonique d'une page : titre, description, puis un bloc par ligne avec son texte propre.
+
+    Indentation, ordre des classes, commentaires, scripts et styles n'y figurent pas : seule une
+    modification du contenu ou de la structure change l'empreinte.
+    """
+    document = html.fromstring(source)
+    title = normalize_text(" ".join(document.xpath("//head/title//text()")))
+    description = normalize_text(" ".join(document.xpath("//head/meta[@name='description']/@content")))
+    lines = [f"title: {title}", f"description: {description}"]
+    etree.strip_elements(document, etree.Comment, with_tail=False)
+    for element in document.iter():
+        if isinstance(element.tag, str):
+            element.tag = element.tag.lower()
+    body = document.find("body")
+    if body is not None:
+        _render(body, 0, lines)
+    return "\n".join(lines) + "\n"
+
+
+def text_digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def golden_path(page):
+    """test/golden/<chemin de la page>.txt"""
+    return GOLDEN_DIR / Path(page).with_suffix(".txt")
+
+
+def compare_page(path, page, expected, context=3):
+    """
+    Normalise une page et la compare à sa référence (exécuté dans un processus du pool).
+
+    Returns:
+        dict: empreinte canonique, forme canonique et diff unifié (vide si identique)
+    """
+    canonical = canonical_form(Path(path).read_bytes())
+    digest = text_digest(canonical)
+    diff = []
+    if digest != expected:
+        reference = golden_path(page)
+        golden = reference.read_text(encoding="utf-8") if reference.exists() else ""
+        diff = list(difflib.unified_diff(
+            golden.splitlines(), canonical.splitlines(), f"golden/{page}", f"_site/{page}",
+            n=context, lineterm="",
+        ))
+    return {"digest": digest, "canonical": canonical, "diff": diff}
+
+
+def load_index():
+    try:
+        return json.loads(INDEX_FILE.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+
+
+def check_snapshots(root=SITE_DIR, update=False, max_workers=None, use_cache=True, context=3):
+    """
+    Compare toutes les pages du site à leur référence.
+
+    Args:
+        update: Réécrit les références des pages modifiées, ajoutées ou supprimées
+
+    Returns:
+        dict: {"changed": {page: diff}, "added": [...], "removed": [...], "unchanged": n}
+    """
+    root = Path(root)
+    index = load_index()
+    cache = HashCache("golden.json", NORMALIZE_VERSION)
+    pages = sorted(p.relative_to(root).as_posix() for p in root.rglob("*.html") if p.is_file())
+
+    # Empreinte canonique connue pour les pages dont le HTML n'a pas changé depuis la dernière exécution
+    stale = []
+    unchanged = 0
+    for page in pages:
+        digest = file_digest(root / page)
+        entry = cache.get(page)
+        if use_cache and cache.is_fresh(page, digest) and entry["canonical"] == index.get(page):
+            unchanged += 1
+        else:
+            stale.append((page, digest))
+
+    outcomes = []
+    if stale:
+        arguments = ([str(root / page) for page, _ in stale], [page for page, _ in stale],
+                     [index.get(page) for page, _ in stale], [context] * len(stale))
+        if len(stale) == 1:
+            outcomes = [compare_page(*[column[0] for column in arguments])]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                outcomes = list(pool.map(
+                    compare_page, *arguments,
+                    chunksize=max(1, len(stale) // ((max_workers or os.cpu_count() or 1) * 4)),
+                ))
+
+    result = {"changed": {}, "added": [], "removed": sorted(set(index) - set(pages)), "unchanged": unchanged}
+    for (page, digest), outcome in zip(stale, outcomes):
+        cache.update(page, digest, canonical=outcome["digest"])
+        if outcome["digest"] == index.get(page):
+            result["unchanged"] += 1
+            continue
+        if page in index:
+            result["changed"][page] = outcome["diff"]
+        else:
+            result["added"].append(page)
+        if update:
+            reference = golden_path(page)
+            reference.parent.mkdir(parents=True, exist_ok=True)
+            reference.write_text(outcome["canonical"], encoding="utf-8")
+            index[page] = outcome["digest"]
+
+    if update:
+        for page in result["removed"]:
+            reference = golden_path(page)
+            if reference.exists():
+                reference.unlink()
+            index.pop(page, None)
+        GOLDEN_DIR.mkdir(parents=True, exist_ok=True)
+        INDEX_FILE.write_text(json.dumps(dict(sorted(index.items())), indent=2) + "\n", encoding="utf-8")
+
+    cache.prune(pages)
+    cache.save()
+    return result
+
+
+def print_report(result, update=False, max_lines=60):
+    """Diff de chaque page modifiée puis synthèse"""
+    for page, diff in result["changed"].items():
+        print(f"\n📝 {page}")
+        for line in diff[:max_lines]:
+            print(f"   {line}")
+        if len(diff) > max_lines:
+            print(f"   … {len(diff) - max_lines} ligne(s) de diff supplémentaire(s)")
+    for page in result["added"]:
+        print(f"🆕 {page} : pas de référence")
+    for page in result["removed"]:
+        print(f"🗑️ {page} : référence sans page construite")
+
+    verb = "mise(s) à jour" if update else "différente(s)"
+    print(f"\n📊 {len(result['changed'])} page(s) {verb}, {len(result['added'])} nouvelle(s), "
+          f"{len(result['removed'])} disparue(s), {result['unchanged']} identique(s)")
+
+
+def main():
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Comparaison des pages construites à leurs instantanés de référence")
+    parser.add_argument("--root", default=str(SITE_DIR), help="Dossier du site construit")
+    parser.add_argument("--update", action="store_true", help="Enregistre l'état actuel comme référence")
+    parser.add_argument("--workers", type=int, help="Nombre de processus (défaut : nombre de cœurs)")
+    parser.add_argument("--no-cache", action="store_true", help="Renormalise toutes les pages")
+    parser.add_argument("--context", type=int, default=3, help="Lignes de contexte des diffs")
+    args = parser.parse_args()
+
+    root = Path(args.root)
+    if not (root / "index.html").exists():
+        print(f"❌ Site non construit : {root} (lancez 'npm run build')")
+        return False
+
+    start = time.perf_counter()
+    result = check_snapshots(root, args.update, args.workers, not args.no_cache, args.context)
+    print_report(result, args.update)
+    print(f"⏱️ {(time.perf_counter() - start) * 1000:.0f} ms")
+    if args.update:
+        print(f"💾 Références: {GOLDEN_DIR}")
+        return True
+    if result["changed"] or result["added"] or result["removed"]:
+        print("🔧 Si ces changements sont voulus : python test/golden_snapshots.py --update")
+        return False
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,223 @@
+"""
+Journalisation structurée des tests de Mélodie & Cie
+Niveaux, écriture asynchrone et bufferisée d'un journal JSON lines complet, console réduite à l'essentiel
+et échantillonnage des messages répétitifs (tentatives de sélecteurs)
+"""
+
+import atexit
+import io
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+
+LOG_DIR = Path(__file__).parent / "logs"
+ROOT_LOGGER = "melodie"
+
+# Attributs standard d'un LogRecord, exclus des champs JSON supplémentaires
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+_console = None
+_listener = None
+_queue_handler = None
+_log_path = None
+_sample_counts = {}
+_counts_lock = threading.Lock()
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Échantillonne les messages portant un `sample_key` (ex: tentatives d'un même sélecteur).
+
+    Les `first` premiers messages d'une clé passent, puis un sur `every` ; le nombre de
+    messages masqués est reporté dans le champ `suppressed` du message suivant qui passe.
+    """
+
+    def __init__(self, first=3, every=25):
+        super().__init__()
+        self.first = first
+        self.every = every
+        self.seen = {}
+        self.suppressed = {}
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        key = getattr(record, "sample_key", None)
+        if key is None or self.every <= 0:
+            return True
+        with self.lock:
+            count = self.seen[key] = self.seen.get(key, 0) + 1
+            if count <= self.first or (count - self.first) % self.every == 0:
+                record.suppressed = self.suppressed.pop(key, 0)
+                return True
+            self.suppressed[key] = self.suppressed.get(key, 0) + 1
+            return False
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Une ligne JSON par message, avec les champs passés via `extra`"""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value if isinstance(value, (str, int, float, bool, type(None))) else str(value)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class ConsoleFormatter(logging.Formatter):
+    """Message seul, comme les print historiques ; signale les répétitions masquées"""
+
+    def format(self, record):
+        message = record.getMessage()
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            message += f"  (+{suppressed} message(s) similaire(s) masqué(s))"
+        return message
+
+
+class BufferedFileHandler(logging.StreamHandler):
+    """Écriture dans un fichier avec un gros tampon ; vidé sur erreur et à la fermeture"""
+
+    def __init__(self, path, buffer_size=64 * 1024):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        super().__init__(io.open(path, "a", encoding="utf-8", buffering=buffer_size))
+
+    def flush(self):
+        pass  # le tampon n'est vidé qu'au besoin (voir emit/close)
+
+    def emit(self, record):
+        super().emit(record)
+        if record.levelno >= logging.ERROR:
+            self.stream.flush()
+
+    def close(self):
+        self.acquire()
+        try:
+            if self.stream and not self.stream.closed:
+                self.stream.flush()
+                self.stream.close()
+        finally:
+            self.release()
+        super().close()
+
+
+class StdoutHandler(logging.StreamHandler):
+    """Console synchrone sur le sys.stdout courant : les messages restent à leur place parmi les print()"""
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+
+    def emit(self, record):
+        self.stream = sys.stdout
+        super().emit(record)
+
+
+class SampleCounter(logging.Handler):
+    """Compte tous les messages échantillonnables, quel que soit le niveau affiché en console"""
+
+    def emit(self, record):
+        key = getattr(record, "sample_key", None)
+        if key is not None:
+            with _counts_lock:
+                _sample_counts[key] = _sample_counts.get(key, 0) + 1
+
+
+def _install_console(sample_first=3, sample_every=25):
+    """Console et compteurs attachés au logger racine du harnais (sans journal fichier)"""
+    global _console
+    if _console is not None:
+        return _console
+    _console = StdoutHandler()
+    _console.setLevel(os.environ.get("MELODIE_LOG_LEVEL", "INFO"))
+    _console.setFormatter(ConsoleFormatter())
+    _console.addFilter(SamplingFilter(sample_first, sample_every))
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(logging.DEBUG)
+    root.propagate = False
+    root.addHandler(SampleCounter())
+    root.addHandler(_console)
+    return _console
+
+
+def configure_logging(console_level=None, log_path=None, sample_first=3, sample_every=25):
+    """
+    Configure la journalisation du harnais ; à appeler depuis les points d'entrée (main()).
+
+    La console écrit de façon synchrone ; seul le journal fichier passe par une file et un thread.
+    Un nouvel appel ne change que le niveau console.
+
+    Args:
+        console_level: Niveau affiché en console (défaut : INFO, ou $MELODIE_LOG_LEVEL)
+        log_path: Journal JSON lines complet (défaut : test/logs/run-<date>.jsonl)
+        sample_first / sample_every: Échantillonnage console des messages répétitifs
+
+    Returns:
+        Path: Chemin du journal complet
+    """
+    global _listener, _log_path, _queue_handler
+    console = _install_console(sample_first, sample_every)
+    if console_level:
+        console.setLevel(console_level)
+    if _listener is not None:
+        return _log_path
+
+    _log_path = Path(log_path) if log_path else LOG_DIR / f"run-{datetime.now().strftime('%Y%m%d-%H%M%S')}.jsonl"
+    file_handler = BufferedFileHandler(_log_path)
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(JsonLinesFormatter())
+
+    # Les appelants ne font que déposer le message dans une file ; l'écriture disque se fait dans un thread
+    log_queue = queue.SimpleQueue()
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    logging.getLogger(ROOT_LOGGER).addHandler(_queue_handler)
+    _listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _log_path
+
+
+def get_logger(name):
+    """Logger du harnais (console seule tant que configure_logging n'a pas été appelé)"""
+    _install_console()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def sampling_summary():
+    """Nombre de messages par clé d'échantillonnage depuis le début du run"""
+    with _counts_lock:
+        return dict(_sample_counts)
+
+
+def shutdown_logging():
+    """Vide les files et ferme le journal (appelé automatiquement à la sortie)"""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    logging.getLogger(ROOT_LOGGER).removeHandler(_queue_handler)
+    _queue_handler = None
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+def log_path():
+    """Chemin du journal complet du run courant"""
+    return _log_path
+
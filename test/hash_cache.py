@@ -0,0 +1,81 @@
+"""
+Cache d'empreintes de contenu partagé par les outils de test
+Permet de ne retraiter que les fichiers dont le contenu (sha256) a changé depuis la dernière exécution
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+
+CACHE_ROOT = Path(__file__).parent / ".cache"
+
+
+def file_digest(path):
+    """Empreinte sha256 du contenu d'un fichier"""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+class HashCache:
+    """
+    Association clé → empreinte (+ métadonnées) persistée en JSON.
+
+    Args:
+        name: nom du fichier de cache dans test/.cache/
+        namespace: empreinte globale (configuration, version d'outil) ; si elle change,
+                   tout le cache est invalidé
+    """
+
+    def __init__(self, name, namespace=""):
+        self.path = CACHE_ROOT / name
+        self.namespace = namespace
+        self.entries = {}
+        self.dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return
+        if data.get("namespace") == self.namespace:
+            self.entries = data.get("entries", {})
+
+    def is_fresh(self, key, digest):
+        """Indique si la clé a déjà été traitée avec ce contenu"""
+        entry = self.entries.get(key)
+        return entry is not None and entry.get("digest") == digest
+
+    def get(self, key):
+        """Métadonnées enregistrées pour une clé (ou None)"""
+        return self.entries.get(key)
+
+    def update(self, key, digest, **extra):
+        """Enregistre le traitement d'une clé"""
+        self.entries[key] = {"digest": digest, **extra}
+        self.dirty = True
+
+    def discard(self, key):
+        """Oublie une clé (ex: fichier en erreur, à revérifier la prochaine fois)"""
+        if self.entries.pop(key, None) is not None:
+            self.dirty = True
+
+    def prune(self, keys):
+        """Supprime les clés qui ne correspondent plus à aucun fichier"""
+        keys = set(keys)
+        for key in [k for k in self.entries if k not in keys]:
+            del self.entries[key]
+            self.dirty = True
+
+    def save(self):
+        """Écrit le cache sur disque (écriture atomique)"""
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({"namespace": self.namespace, "entries": self.entries}, ensure_ascii=False),
+            encoding="utf-8"
+        )
+        tmp.replace(self.path)
+        self.dirty = False
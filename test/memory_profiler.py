@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Profilage mémoire du navigateur et du harnais de test
+Échantillonne la RSS des processus Chrome, le tas JavaScript et les allocations Python (tracemalloc)
+après chaque étape de navigation, et signale une fuite quand la mémoire croît de façon monotone
+sur des cycles répétés du test de navigation interne
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+import psutil
+
+from navigation_utils import NavigationHelper, create_chrome_driver
+
+
+RESULTS_DIR = Path(__file__).parent / ".cache" / "memory"
+METRICS = ("chrome_rss", "js_heap", "python_alloc")
+# Échantillons détaillés conservés (les plus récents) ; au-delà, seuls les agrégats sont tenus à jour
+MAX_SAMPLES = 1000
+
+# Croissance minimale entre le premier et le dernier cycle pour parler de fuite
+DEFAULT_MIN_GROWTH = {
+    "chrome_rss": 20 * 1024 * 1024,
+    "js_heap": 2 * 1024 * 1024,
+    "python_alloc": 512 * 1024,
+}
+
+
+def format_bytes(value):
+    if value is None:
+        return "—"
+    return f"{value / (1024 * 1024):.1f} Mo"
+
+
+class MemorySampler:
+    """Mesure la mémoire du navigateur piloté et du processus Python courant"""
+
+    def __init__(self, driver, collect_garbage=True, max_samples=MAX_SAMPLES):
+        self.driver = driver
+        self.collect_garbage = collect_garbage
+        # Tampon borné : les échantillons du profileur ne doivent pas eux-mêmes faire croître python_alloc
+        self.samples = deque(maxlen=max_samples)
+        self.count = 0
+        self.aggregates = {metric: {"min": None, "max": None, "sum": 0, "n": 0} for metric in METRICS}
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        try:
+            self.driver.execute_cdp_cmd("Performance.enable", {})
+            self.cdp = True
+        except Exception:
+            self.cdp = False
+
+    def chrome_rss(self):
+        """RSS cumulée de chromedriver, du navigateur et de tous ses processus de rendu"""
+        try:
+            root = psutil.Process(self.driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+        except (AttributeError, psutil.Error):
+            return None
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                continue
+        return total
+
+    def js_heap(self):
+        """Tas JavaScript utilisé par la page (CDP, sinon performance.memory)"""
+        if self.cdp:
+            try:
+                if self.collect_garbage:
+                    self.driver.execute_cdp_cmd("HeapProfiler.collectGarbage", {})
+                metrics = self.driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+                for metric in metrics:
+                    if metric["name"] == "JSHeapUsedSize":
+                        return int(metric["value"])
+            except Exception:
+                pass
+        try:
+            return self.driver.execute_script(
+                "return performance.memory ? performance.memory.usedJSHeapSize : null;"
+            )
+        except Exception:
+            return None
+
+    def python_alloc(self):
+        """Mémoire Python allouée, hors allocations du profileur (échantillons) et de tracemalloc"""
+        snapshot = tracemalloc.take_snapshot().filter_traces(own_allocations_filter())
+        return sum(trace.size for trace in snapshot.traces)
+
+    def sample(self, label, cycle=None):
+        """Prend un échantillon des trois mesures"""
+        entry = {
+            "label": label,
+            "cycle": cycle,
+            "time": time.time(),
+            "chrome_rss": self.chrome_rss(),
+            "js_heap": self.js_heap(),
+            "python_alloc": self.python_alloc(),
+        }
+        self.samples.append(entry)
+        self.count += 1
+        for metric in METRICS:
+            value = entry[metric]
+            if value is None:
+                continue
+            stats = self.aggregates[metric]
+            stats["min"] = value if stats["min"] is None else min(stats["min"], value)
+            stats["max"] = value if stats["max"] is None else max(stats["max"], value)
+            stats["sum"] += value
+            stats["n"] += 1
+        return entry
+
+    def summary(self):
+        """Agrégats sur tous les échantillons pris, y compris ceux sortis du tampon"""
+        return {
+            metric: {
+                "min": stats["min"], "max": stats["max"],
+                "mean": stats["sum"] / stats["n"] if stats["n"] else None,
+            }
+            for metric, stats in self.aggregates.items()
+        }
+
+
+def own_allocations_filter():
+    """Exclut des instantanés tracemalloc les allocations du profileur et de tracemalloc lui-même"""
+    return (
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, tracemalloc.__file__),
+    )
+
+
+def detect_leak(values, min_growth, noise_ratio=0.02):
+    """
+    Détecte une croissance monotone d'une série (une valeur par cycle).
+
+    Chaque valeur peut reculer au plus de noise_ratio par rapport à la précédente,
+    et la croissance totale doit dépasser min_growth.
+
+    Returns:
+        bool: True si la série ressemble à une fuite
+    """
+    values = [v for v in values if v is not None]
+    if len(values) < 3:
+        return False
+    for previous, current in zip(values, values[1:]):
+        if current < previous * (1 - noise_ratio):
+            return False
+    return values[-1] - values[0] >= min_growth
+
+
+class NavigationMemoryProfiler:
+    """Répète le cycle de navigation en échantillonnant la mémoire à chaque étape"""
+
+    def __init__(self, base_url="http://localhost:8080", headless=True, step_wait=1, collect_garbage=True):
+        self.base_url = base_url
+        self.step_wait = step_wait
+        self.driver = create_chrome_driver(headless=headless)
+        self.sampler = MemorySampler(self.driver, collect_garbage)
+        self.nav_helper = NavigationHelper(self.driver, 10)
+        self.cycle = 0
+        self.nav_helper.add_step_listener(lambda step: self.sampler.sample(step, self.cycle))
+
+    def run(self, cycles=10):
+        """
+        Lance les cycles de navigation.
+
+        Returns:
+            dict: rapport (échantillons, valeur de fin de cycle par métrique, verdicts de fuite)
+        """
+        per_cycle = {metric: [] for metric in METRICS}
+        first_snapshot = None
+        try:
+            for cycle in range(1, cycles + 1):
+                self.cycle = cycle
+                results = self.nav_helper.run_navigation_cycle(self.base_url, self.step_wait)
+                failed = [step for step, ok in results if not ok]
+                end = self.sampler.sample("fin de cycle", self.cycle)
+                for metric in METRICS:
+                    per_cycle[metric].append(end[metric])
+                if first_snapshot is None:
+                    first_snapshot = tracemalloc.take_snapshot().filter_traces(own_allocations_filter())
+                print(f"🔁 Cycle {self.cycle}/{cycles}: Chrome {format_bytes(end['chrome_rss'])} | "
+                      f"JS {format_bytes(end['js_heap'])} | Python {format_bytes(end['python_alloc'])}"
+                      + (f" | ⚠️ étapes échouées: {', '.join(failed)}" if failed else ""))
+            last_snapshot = tracemalloc.take_snapshot().filter_traces(own_allocations_filter())
+        finally:
+            self.driver.quit()
+
+        leaks = {metric: detect_leak(values, DEFAULT_MIN_GROWTH[metric]) for metric, values in per_cycle.items()}
+        top_growth = []
+        if first_snapshot is not None:
+            top_growth = [str(stat) for stat in last_snapshot.compare_to(first_snapshot, "lineno")[:5]]
+
+        return {
+            "base_url": self.base_url,
+            "cycles": cycles,
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            "per_cycle": per_cycle,
+            "leaks": leaks,
+            "python_top_growth": top_growth,
+            "sample_count": self.sampler.count,
+            "summary": self.sampler.summary(),
+            "samples": list(self.sampler.samples),
+        }
+
+
+def print_report(report):
+    """Affiche le verdict par métrique"""
+    print("\n" + "=" * 70)
+    print("🧠 PROFIL MÉMOIRE")
+    print("=" * 70)
+    for metric in METRICS:
+        values = [v for v in report["per_cycle"][metric] if v is not None]
+        if not values:
+            print(f"{metric:<14} non mesurable")
+            continue
+        verdict = "❌ croissance monotone (fuite probable)" if report["leaks"][metric] else "✅ stable"
+        print(f"{metric:<14} {format_bytes(values[0])} → {format_bytes(values[-1])}  {verdict}")
+    if report["leaks"]["python_alloc"] and report["python_top_growth"]:
+        print("\nPlus fortes croissances d'allocations Python :")
+        for line in report["python_top_growth"]:
+            print(f"   {line}")
+
+
+def main():
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Profilage mémoire du cycle de navigation")
+    parser.add_argument("--cycles", type=int, default=10, help="Nombre de cycles de navigation")
+    parser.add_argument("--base-url", default="http://localhost:8080", help="URL du site")
+    parser.add_argument("--headed", action="store_true", help="Affiche le navigateur")
+    parser.add_argument("--step-wait", type=float, default=1, help="Pause après chaque étape (s)")
+    parser.add_argument("--no-gc", action="store_true", help="Ne force pas le ramasse-miettes JS avant les mesures")
+    args = parser.parse_args()
+
+    profiler = NavigationMemoryProfiler(
+        args.base_url, headless=not args.headed, step_wait=args.step_wait, collect_garbage=not args.no_gc
+    )
+    report = profiler.run(args.cycles)
+    print_report(report)
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    output = RESULTS_DIR / f"memory-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"💾 Rapport complet: {output}")
+    return not any(report["leaks"].values())
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Minification HTML après construction du site (_site/)
+Supprime commentaires et indentation, compacte les blocs <style> des composants sans toucher
+à <pre>, <textarea> ni aux scripts ; traitement parallèle, seules les pages reconstruites sont reprises
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from hash_cache import HashCache
+
+
+SITE_DIR = Path(__file__).parent.parent / "_site"
+MINIFY_VERSION = "1"
+
+# Éléments dont le contenu est conservé tel quel (sauf <style>, compacté)
+RAW_ELEMENTS = ("pre", "textarea", "script", "style")
+
+# Autour de ces balises, un blanc n'a aucun rendu : il peut être supprimé
+BLOCK_ELEMENTS = {
+    "!doctype", "html", "head", "body", "title", "meta", "link", "style", "script", "noscript", "base",
+    "div", "section", "article", "header", "footer", "main", "nav", "aside", "address",
+    "h1", "h2", "h3", "h4", "h5", "h6", "p", "pre", "hr", "br", "blockquote", "figure", "figcaption",
+    "ul", "ol", "li", "dl", "dt", "dd", "table", "caption", "thead", "tbody", "tfoot", "tr", "td", "th",
+    "colgroup", "col", "form", "fieldset", "legend", "details", "summary", "template", "option", "optgroup",
+}
+
+TOKEN = re.compile(
+    r"<!--.*?-->"
+    r"|<(?P<raw>pre|textarea|script|style)\b(?:[^>\"']|\"[^\"]*\"|'[^']*')*>.*?</(?P=raw)\s*>"
+    r"|<[!/]?[a-zA-Z](?:[^>\"']|\"[^\"]*\"|'[^']*')*>",
+    re.S | re.I,
+)
+TAG_NAME = re.compile(r"<[/]?(!?[a-zA-Z][\w:-]*)")
+OPEN_TAG = re.compile(r"<(?:[^>\"']|\"[^\"]*\"|'[^']*')*>", re.S)
+CSS_STRING = re.compile(r"(\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*')")
+
+
+def minify_css(css):
+    """Compactage sûr d'une feuille : commentaires, blancs et « ; » final, chaînes préservées"""
+    parts = CSS_STRING.split(css)
+    for index in range(0, len(parts), 2):
+        part = re.sub(r"/\*.*?\*/", "", parts[index], flags=re.S)
+        part = re.sub(r"\s+", " ", part)
+        part = re.sub(r"\s*([{};,>])\s*", r"\1", part)
+        parts[index] = part.replace(";}", "}")
+    return "".join(parts).strip()
+
+
+def minify_tag(tag):
+    """Blancs entre attributs réduits à un espace, valeurs entre guillemets préservées"""
+    tag = re.sub(r"(\"[^\"]*\"|'[^']*')|\s+", lambda m: m.group(1) or " ", tag)
+    return re.sub(r"\s+(/?>)$", r"\1", tag)
+
+
+def _tag_name(token):
+    match = TAG_NAME.match(token)
+    return match.group(1).lower() if match else None
+
+
+def minify_html(source, dedupe_styles=False):
+    """
+    Minifie un document HTML.
+
+    Args:
+        dedupe_styles: Supprime les blocs <style> identiques à un bloc précédent de la page
+
+    Returns:
+        tuple: (html minifié, nombre d'octets de <style> dupliqués dans la page)
+    """
+    pieces = []  # (nom de balise ou None pour du texte, texte)
+    seen_styles = set()
+    duplicate_bytes = 0
+    position = 0
+
+    for match in TOKEN.finditer(source):
+        if match.start() > position:
+            pieces.append((None, source[position:match.start()]))
+        position = match.end()
+        token = match.group(0)
+
+        if token.startswith("<!--"):
+            # Commentaires conditionnels conservés, les autres supprimés
+            if token.startswith("<!--[if"):
+                pieces.append(("!--", token))
+            continue
+
+        raw = (match.group("raw") or "").lower()
+        if raw:
+            open_tag = OPEN_TAG.match(token).group(0)
+            close_start = token.lower().rindex("</")
+            content = token[len(open_tag):close_start]
+            if raw == "style":
+                content = minify_css(content)
+                if content in seen_styles:
+                    duplicate_bytes += len(content.encode("utf-8"))
+                    if dedupe_styles:
+                        continue
+                seen_styles.add(content)
+            pieces.append((raw, minify_tag(open_tag) + content + f"</{raw}>"))
+        else:
+            pieces.append((_tag_name(token), minify_tag(token)))
+    if position < len(source):
+        pieces.append((None, source[position:]))
+
+    output = []
+    for index, (name, text) in enumerate(pieces):
+        if name is not None:
+            output.append(text)
+            continue
+        previous = pieces[index - 1][0] if index > 0 else "!doctype"
+        following = pieces[index + 1][0] if index + 1 < len(pieces) else "!doctype"
+        text = re.sub(r"\s+", " ", text)
+        if previous in BLOCK_ELEMENTS or previous == "!--":
+            text = text.lstrip()
+        if following in BLOCK_ELEMENTS or following == "!--":
+            text = text.rstrip()
+        output.append(text)
+    return "".join(output), duplicate_bytes
+
+
+def minify_file(path, dedupe_styles=False):
+    """
+    Minifie une page sur place (exécuté dans un processus du pool).
+
+    Returns:
+        dict: tailles avant/après, empreinte du résultat, octets de <style> dupliqués
+    """
+    path = Path(path)
+    source = path.read_text(encoding="utf-8")
+    minified, duplicate_bytes = minify_html(source, dedupe_styles)
+    data = minified.encode("utf-8")
+    if data != source.encode("utf-8"):
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+    return {
+        "original": len(source.encode("utf-8")),
+        "minified": len(data),
+        "digest": hashlib.sha256(data).hexdigest(),
+        "duplicate_style_bytes": duplicate_bytes,
+    }
+
+
+def minify_site(root=SITE_DIR, max_workers=None, use_cache=True, dedupe_styles=False):
+    """
+    Minifie toutes les pages de root.
+
+    Une page dont le contenu est identique à la sortie de la dernière exécution est déjà
+    minifiée : elle n'est pas retraitée.
+
+    Returns:
+        dict: page → statistiques
+    """
+    root = Path(root)
+    cache = HashCache("minify_html.json", f"{MINIFY_VERSION}-{int(dedupe_styles)}")
+    pages = sorted(p.relative_to(root).as_posix() for p in root.rglob("*.html") if p.is_file())
+
+    results = {}
+    stale = []
+    for key in pages:
+        digest = hashlib.sha256((root / key).read_bytes()).hexdigest()
+        entry = cache.get(key)
+        if use_cache and cache.is_fresh(key, digest):
+            results[key] = {name: entry[name] for name in ("original", "minified", "duplicate_style_bytes")}
+        else:
+            stale.append(key)
+
+    if stale:
+        paths = [str(root / key) for key in stale]
+        if len(stale) == 1:
+            outcomes = [minify_file(paths[0], dedupe_styles)]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                outcomes = list(pool.map(
+                    minify_file, paths, [dedupe_styles] * len(paths),
+                    chunksize=max(1, len(paths) // ((max_workers or os.cpu_count() or 1) * 4)),
+                ))
+        for key, outcome in zip(stale, outcomes):
+            digest = outcome.pop("digest")
+            results[key] = outcome
+            cache.update(key, digest, **outcome)
+
+    cache.prune(pages)
+    cache.save()
+    print(f"✂️ {len(stale)} page(s) minifiée(s), {len(pages) - len(stale)} déjà à jour")
+    return results
+
+
+def print_report(results):
+    """Octets gagnés par page"""
+    print(f"\n{'page':<44} {'avant':>9} {'après':>9} {'gain':>7} {'<style> dupliqués':>18}")
+    total_before = total_after = total_duplicates = 0
+    for page, stats in sorted(results.items(), key=lambda item: item[1]["minified"] - item[1]["original"]):
+        saved = stats["original"] - stats["minified"]
+        share = saved / stats["original"] * 100 if stats["original"] else 0
+        duplicates = f"{stats['duplicate_style_bytes']:,}" if stats["duplicate_style_bytes"] else "—"
+        print(f"{page:<44} {stats['original']:>9,} {stats['minified']:>9,} {share:6.1f}% {duplicates:>18}")
+        total_before += stats["original"]
+        total_after += stats["minified"]
+        total_duplicates += stats["duplicate_style_bytes"]
+    if total_before:
+        print(f"{'total':<44} {total_before:>9,} {total_after:>9,} "
+              f"{(total_before - total_after) / total_before * 100:6.1f}% {total_duplicates:>18,}")
+
+
+def main():
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Minification HTML du site construit")
+    parser.add_argument("--root", default=str(SITE_DIR), help="Dossier du site construit")
+    parser.add_argument("--workers", type=int, help="Nombre de processus (défaut : nombre de cœurs)")
+    parser.add_argument("--no-cache", action="store_true", help="Retraite toutes les pages")
+    parser.add_argument("--dedupe-styles", action="store_true",
+                        help="Supprime les blocs <style> répétés à l'identique dans une même page")
+    args = parser.parse_args()
+
+    root = Path(args.root)
+    if not root.is_dir():
+        print(f"❌ Site non construit : {root} (lancez 'npm run build')")
+        return False
+
+    results = minify_site(root, args.workers, use_cache=not args.no_cache, dedupe_styles=args.dedupe_styles)
+    print_report(results)
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
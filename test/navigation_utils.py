@@ -4,11 +4,61 @@ Contient des méthodes communes de navigation et d'interaction avec le site
 """
 
 import time
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+from harness_log import get_logger
+
+
+logger = get_logger("navigation")
+
+
+def create_chrome_driver(headless=False, extra_arguments=None, page_load_strategy=None):
+    """
+    Crée un Chrome configuré comme pour les tests back-office.
+    
+    Args:
+        headless: Lance Chrome sans fenêtre (CI, mesures répétées)
+        extra_arguments: Arguments de ligne de commande Chrome supplémentaires
+        page_load_strategy: "normal" (défaut), "eager" ou "none" (navigation non bloquante)
+    
+    Returns:
+        webdriver.Chrome: Navigateur prêt à l'emploi
+    """
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--window-size=1920,1080")
+    else:
+        chrome_options.add_argument("--start-maximized")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    for argument in extra_arguments or []:
+        chrome_options.add_argument(argument)
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.set_capability("goog:loggingPrefs", {"browser": "ALL"})
+    if page_load_strategy:
+        chrome_options.page_load_strategy = page_load_strategy
+    
+    driver = webdriver.Chrome(options=chrome_options)
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    return driver
+
+
+# Cycle de navigation du test interne : (étape, méthode de NavigationHelper, fragment d'URL attendu)
+NAVIGATION_CYCLE = [
+    ("services", "navigate_to_services_page", "services"),
+    ("formation", "navigate_to_formation_page", "formation"),
+    ("evenements", "navigate_to_evenements_page", "evenements"),
+    ("production", "navigate_to_production_page", "production"),
+    ("contact", "navigate_to_contact_page", "contact"),
+    ("accueil", "navigate_to_home", None),
+]
+
 
 class NavigationHelper:
     """Classe utilitaire pour la navigation robuste sur le site"""
@@ -16,6 +66,20 @@ class NavigationHelper:
     def __init__(self, driver, wait_timeout=10):
         self.driver = driver
         self.wait = WebDriverWait(driver, wait_timeout)
+        self.step_listeners = []
+    
+    def add_step_listener(self, listener):
+        """
+        Enregistre une fonction appelée après chaque clic de navigation réussi.
+        
+        Args:
+            listener: callable(element_description) (mesures, captures, profilage...)
+        """
+        self.step_listeners.append(listener)
+    
+    def _notify_step(self, element_description):
+        for listener in self.step_listeners:
+            listener(element_description)
     
     def click_with_multiple_strategies(self, selectors_list, element_description="élément", timeout=10):
         """
@@ -29,24 +93,34 @@ class NavigationHelper:
         Returns:
             bool: True si le clic a réussi, False sinon
         """
-        print(f"🔍 Recherche de l'{element_description}...")
+        logger.info(f"🔍 Recherche de l'{element_description}...")
         
         for i, (selector_type, selector_value) in enumerate(selectors_list, 1):
             try:
-                print(f"   Tentative {i}/{len(selectors_list)}: {selector_type} = '{selector_value}'")
+                logger.debug(
+                    f"   Tentative {i}/{len(selectors_list)}: {selector_type} = '{selector_value}'",
+                    extra={"event": "attempt", "target": element_description, "selector": selector_value,
+                           "sample_key": f"attempt:{element_description}"}
+                )
                 
                 element = WebDriverWait(self.driver, timeout).until(
                     EC.element_to_be_clickable((selector_type, selector_value))
                 )
                 element.click()
-                print(f"✅ {element_description.capitalize()} trouvé et cliqué avec succès !")
+                logger.info(f"✅ {element_description.capitalize()} trouvé et cliqué avec succès !",
+                            extra={"event": "click", "target": element_description, "selector": selector_value,
+                                   "attempt": i})
+                self._notify_step(element_description)
                 return True
                 
             except (TimeoutException, NoSuchElementException) as e:
-                print(f"   ⏳ Tentative {i} échouée: {type(e).__name__}")
+                logger.debug(f"   ⏳ Tentative {i} échouée: {type(e).__name__}",
+                             extra={"event": "attempt_failed", "target": element_description,
+                                    "selector": selector_value, "sample_key": f"attempt:{element_description}"})
                 continue
         
-        print(f"❌ {element_description.capitalize()} non trouvé avec toutes les stratégies")
+        logger.warning(f"❌ {element_description.capitalize()} non trouvé avec toutes les stratégies",
+                       extra={"event": "not_found", "target": element_description, "attempts": len(selectors_list)})
         return False
     
     def navigate_to_services_page(self):
@@ -144,14 +218,39 @@ class NavigationHelper:
             "lien vers l'accueil"
         )
     
+    def run_navigation_cycle(self, base_url, step_wait=2):
+        """
+        Parcourt le cycle accueil → services → formation → événements → production → contact → accueil.
+        
+        Args:
+            base_url: URL du site
+            step_wait: Pause après chaque étape (secondes)
+        
+        Returns:
+            list: Tuples (étape, succès) dans l'ordre du cycle
+        """
+        self.driver.get(base_url)
+        self.safe_page_wait(step_wait)
+        
+        results = []
+        for step, method_name, url_part in NAVIGATION_CYCLE:
+            ok = getattr(self, method_name)()
+            if ok:
+                self.safe_page_wait(step_wait)
+                if url_part and url_part not in self.driver.current_url:
+                    logger.warning(f"⚠️ Étape {step}: URL inattendue {self.driver.current_url}")
+                    ok = False
+            results.append((step, ok))
+        return results
+    
     def wait_for_url_contains(self, url_part, timeout=10):
         """Attend que l'URL contienne une partie spécifique"""
         try:
             self.wait.until(EC.url_contains(url_part))
-            print(f"✅ URL contient '{url_part}' - Navigation réussie")
+            logger.info(f"✅ URL contient '{url_part}' - Navigation réussie")
             return True
         except TimeoutException:
-            print(f"❌ L'URL ne contient toujours pas '{url_part}' après {timeout}s")
+            logger.warning(f"❌ L'URL ne contient toujours pas '{url_part}' après {timeout}s")
             return False
     
     def safe_page_wait(self, seconds=2):
@@ -169,7 +268,7 @@ class CMSHelper:
     
     def wait_for_cms_load(self, timeout=15):
         """Attend que Decap CMS soit complètement chargé"""
-        print("⏳ Attente du chargement complet de Decap CMS...")
+        logger.info("⏳ Attente du chargement complet de Decap CMS...")
         
         cms_selectors = [
             "[data-testid='app']",
@@ -184,13 +283,13 @@ class CMSHelper:
                 element = WebDriverWait(self.driver, timeout).until(
                     EC.presence_of_element_located((By.CSS_SELECTOR, selector))
                 )
-                print(f"✅ CMS chargé (détecté via {selector})")
+                logger.info(f"✅ CMS chargé (détecté via {selector})")
                 time.sleep(3)  # Temps supplémentaire pour stabilité
                 return True
             except TimeoutException:
                 continue
         
-        print("⚠️ CMS possiblement chargé mais sélecteurs standards non trouvés")
+        logger.warning("⚠️ CMS possiblement chargé mais sélecteurs standards non trouvés")
         time.sleep(5)  # Attente de fallback
         return False
     
@@ -222,7 +321,7 @@ class CMSHelper:
         
         # Gestion spéciale pour le bouton Publish (dropdown)
         elif any(text in ["Publish", "Save", "Publier", "Sauvegarder", "Enregistrer"] for text in button_texts):
-            print("🎯 Gestion spéciale du bouton Publish (dropdown)")
+            logger.info("🎯 Gestion spéciale du bouton Publish (dropdown)")
             return self._handle_publish_dropdown()
         
         # Sélecteurs génériques pour les autres boutons
@@ -243,7 +342,7 @@ class CMSHelper:
     
     def _handle_publish_dropdown(self):
         """Gère spécifiquement le bouton Publish dropdown de Decap CMS"""
-        print("📤 Étape 1: Clic sur le bouton Publish principal...")
+        logger.info("📤 Étape 1: Clic sur le bouton Publish principal...")
         
         # Sélecteurs pour le bouton Publish principal
         publish_button_selectors = [
@@ -262,21 +361,23 @@ class CMSHelper:
                     EC.element_to_be_clickable((selector_type, selector_value))
                 )
                 publish_btn.click()
-                print(f"✅ Bouton Publish principal cliqué: {selector_value}")
+                logger.info(f"✅ Bouton Publish principal cliqué: {selector_value}")
                 publish_clicked = True
                 break
             except Exception as e:
-                print(f"   ⏳ Sélecteur Publish '{selector_value}' échoué: {str(e)[:50]}")
+                logger.debug(f"   ⏳ Sélecteur Publish '{selector_value}' échoué: {str(e)[:50]}",
+                             extra={"event": "attempt_failed", "target": "Publish", "selector": selector_value,
+                                    "sample_key": "attempt:Publish"})
                 continue
         
         if not publish_clicked:
-            print("❌ Impossible de cliquer sur le bouton Publish principal")
+            logger.error("❌ Impossible de cliquer sur le bouton Publish principal")
             return False
         
         # Attendre que le dropdown s'ouvre
         self.nav_helper.safe_page_wait(1)
         
-        print("📤 Étape 2: Clic sur 'Publish now' dans le dropdown...")
+        logger.info("📤 Étape 2: Clic sur 'Publish now' dans le dropdown...")
         
         # Sélecteurs pour "Publish now" dans le dropdown
         publish_now_selectors = [
@@ -294,13 +395,15 @@ class CMSHelper:
                     EC.element_to_be_clickable((selector_type, selector_value))
                 )
                 publish_now_btn.click()
-                print(f"✅ 'Publish now' cliqué: {selector_value}")
+                logger.info(f"✅ 'Publish now' cliqué: {selector_value}")
                 return True
             except Exception as e:
-                print(f"   ⏳ Sélecteur 'Publish now' '{selector_value}' échoué: {str(e)[:50]}")
+                logger.debug(f"   ⏳ Sélecteur 'Publish now' '{selector_value}' échoué: {str(e)[:50]}",
+                             extra={"event": "attempt_failed", "target": "Publish now", "selector": selector_value,
+                                    "sample_key": "attempt:Publish now"})
                 continue
         
-        print("❌ Impossible de cliquer sur 'Publish now' dans le dropdown")
+        logger.error("❌ Impossible de cliquer sur 'Publish now' dans le dropdown")
         return False
     
     def fill_input_field(self, field_name, value, field_description=None):
@@ -308,11 +411,11 @@ class CMSHelper:
         if not field_description:
             field_description = f"champ {field_name}"
             
-        print(f"📝 Remplissage du {field_description}...")
+        logger.info(f"📝 Remplissage du {field_description}...")
         
         # Gestion spéciale pour les emojis - fallback si ChromeDriver échoue
         if field_name == "emoji" and any(ord(c) > 0xFFFF for c in str(value)):
-            print(f"⚠️ Emoji détecté qui peut poser problème avec ChromeDriver: {value}")
+            logger.warning(f"⚠️ Emoji détecté qui peut poser problème avec ChromeDriver: {value}")
             # Alternatives compatibles BMP
             emoji_fallbacks = {
                 "🎺": "♪",  # Note musicale
@@ -326,7 +429,7 @@ class CMSHelper:
             original_value = value
             if value in emoji_fallbacks:
                 value = emoji_fallbacks[value]
-                print(f"  → Remplacement par caractère compatible: {original_value} → {value}")
+                logger.info(f"  → Remplacement par caractère compatible: {original_value} → {value}")
         
         # Sélecteurs basés sur la structure HTML réelle de Decap CMS
         field_selectors = [
@@ -371,10 +474,13 @@ class CMSHelper:
                     field = self.driver.find_element(By.ID, field_id)
                     field.clear()
                     field.send_keys(value)
-                    print(f"✅ {field_description.capitalize()} rempli via ID '{field_id}': '{value}'")
+                    logger.info(f"✅ {field_description.capitalize()} rempli via ID '{field_id}': '{value}'",
+                                extra={"event": "fill", "field": field_name, "selector": field_id})
                     return True
                 except Exception as e:
-                    print(f"   ⏳ Erreur avec ID '{field_id}': {str(e)[:100]}")
+                    logger.debug(f"   ⏳ Erreur avec ID '{field_id}': {str(e)[:100]}",
+                                 extra={"event": "attempt_failed", "field": field_name, "selector": field_id,
+                                        "sample_key": f"fill:{field_name}"})
                     continue
         
         # Fallback sur les sélecteurs génériques
@@ -383,10 +489,15 @@ class CMSHelper:
                 field = self.driver.find_element(selector_type, selector_value)
                 field.clear()
                 field.send_keys(value)
-                print(f"✅ {field_description.capitalize()} rempli via '{selector_value}': '{value}'")
+                logger.info(f"✅ {field_description.capitalize()} rempli via '{selector_value}': '{value}'",
+                            extra={"event": "fill", "field": field_name, "selector": selector_value})
                 return True
             except Exception as e:
+                logger.debug(f"   ⏳ Sélecteur '{selector_value}' échoué: {type(e).__name__}",
+                             extra={"event": "attempt_failed", "field": field_name, "selector": selector_value,
+                                    "sample_key": f"fill:{field_name}"})
                 continue
         
-        print(f"❌ {field_description.capitalize()} non trouvé avec aucun sélecteur")
+        logger.warning(f"❌ {field_description.capitalize()} non trouvé avec aucun sélecteur",
+                       extra={"event": "not_found", "field": field_name})
         return False
\ No newline at end of file
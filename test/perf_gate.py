@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Porte de régression de performance
+Répète un benchmark K fois (après échauffement), conserve les échantillons bruts et les compare à une
+référence (Mann-Whitney + intervalle bootstrap) : seul un ralentissement réel fait échouer la porte
+"""
+
+import argparse
+import json
+import math
+import random
+import shlex
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+RESULTS_DIR = Path(__file__).parent / ".cache" / "perf"
+
+
+class CommandBenchmark:
+    """Durée d'une commande externe (build, script de test...)"""
+
+    def __init__(self, arguments):
+        self.arguments = arguments
+
+    def setup(self):
+        pass
+
+    def run_once(self):
+        started = time.perf_counter()
+        result = subprocess.run(self.arguments, cwd=PROJECT_ROOT, capture_output=True)
+        elapsed = (time.perf_counter() - started) * 1000
+        if result.returncode != 0:
+            raise RuntimeError(f"Commande en échec ({result.returncode}) : {' '.join(self.arguments)}\n"
+                               f"{result.stderr.decode('utf-8', 'replace')[-1500:]}")
+        return elapsed
+
+    def teardown(self):
+        pass
+
+
+class BuildBenchmark(CommandBenchmark):
+    """`npm run build`, dans un dossier de sortie temporaire pour ne pas toucher _site/"""
+
+    def setup(self):
+        npx = shutil.which("npx")
+        if npx is None:
+            raise FileNotFoundError("npx introuvable : installez Node.js")
+        self._output = tempfile.TemporaryDirectory(prefix="perf-build-")
+        self.arguments = [npx, "@11ty/eleventy", "--quiet", f"--output={self._output.name}"]
+
+    def teardown(self):
+        self._output.cleanup()
+
+
+class NavigationBenchmark:
+    """Cycle de navigation interne complet, sans pause entre étapes, dans un Chrome gardé ouvert"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.driver = None
+
+    def setup(self):
+        from navigation_utils import NavigationHelper, create_chrome_driver
+        self.driver = create_chrome_driver(headless=True)
+        self.helper = NavigationHelper(self.driver)
+
+    def run_once(self):
+        started = time.perf_counter()
+        results = self.helper.run_navigation_cycle(self.base_url, step_wait=0)
+        elapsed = (time.perf_counter() - started) * 1000
+        failed = [step for step, ok in results if not ok]
+        if failed:
+            raise RuntimeError(f"Navigation en échec : {', '.join(failed)}")
+        return elapsed
+
+    def teardown(self):
+        if self.driver:
+            self.driver.quit()
+
+
+def collect_samples(benchmark, runs=10, warmup=2):
+    """
+    Exécute le benchmark warmup + runs fois ; les exécutions d'échauffement sont ignorées.
+
+    Returns:
+        list: Durées en ms
+    """
+    samples = []
+    benchmark.setup()
+    try:
+        for index in range(warmup + runs):
+            elapsed = benchmark.run_once()
+            if index < warmup:
+                print(f"   🔥 échauffement {index + 1}/{warmup} : {elapsed:.0f} ms")
+            else:
+                samples.append(elapsed)
+                print(f"   ⏱️ {len(samples)}/{runs} : {elapsed:.0f} ms")
+    finally:
+        benchmark.teardown()
+    return samples
+
+
+def mann_whitney_greater(candidate, baseline):
+    """
+    Test de Mann-Whitney unilatéral : les durées candidates sont-elles plus grandes ?
+
+    Approximation normale avec correction des ex æquo et de continuité.
+
+    Returns:
+        tuple: (U du candidat, p-valeur)
+    """
+    combined = sorted([(value, 0) for value in candidate] + [(value, 1) for value in baseline])
+    ranks = [0.0] * len(combined)
+    ties = []
+    index = 0
+    while index < len(combined):
+        end = index
+        while end + 1 < len(combined) and combined[end + 1][0] == combined[index][0]:
+            end += 1
+        for position in range(index, end + 1):
+            ranks[position] = (index + end) / 2 + 1
+        ties.append(end - index + 1)
+        index = end + 1
+
+    n1, n2 = len(candidate), len(baseline)
+    n = n1 + n2
+    u = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0) - n1 * (n1 + 1) / 2
+    tie_term = sum(t ** 3 - t for t in ties) / (n * (n - 1)) if n > 1 else 0
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term))
+    if sigma == 0:
+        return u, 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / sigma
+    return u, 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def bootstrap_ratio_ci(candidate, baseline, confidence=0.95, resamples=2000, seed=0):
+    """
+    Intervalle de confiance bootstrap (percentiles) de médiane(candidat) / médiane(référence) - 1.
+
+    Returns:
+        tuple: (borne basse, borne haute)
+    """
+    rng = random.Random(seed)
+    ratios = []
+    for _ in range(resamples):
+        sample_candidate = [rng.choice(candidate) for _ in candidate]
+        sample_baseline = [rng.choice(baseline) for _ in baseline]
+        ratios.append(statistics.median(sample_candidate) / statistics.median(sample_baseline) - 1)
+    ratios.sort()
+    tail = (1 - confidence) / 2
+    return ratios[int(tail * (resamples - 1))], ratios[int((1 - tail) * (resamples - 1))]
+
+
+def compare(candidate, baseline, threshold=0.05, alpha=0.05, confidence=0.95, resamples=2000):
+    """
+    Verdict de la porte.
+
+    Un ralentissement est retenu seulement s'il est significatif (Mann-Whitney, p < alpha) et si
+    toute la fourchette bootstrap dépasse le seuil : le bruit ne fait pas échouer la porte.
+
+    Returns:
+        dict: médianes, écart relatif et son intervalle, p-valeur et verdict
+              ("regression", "improvement" ou "unchanged")
+    """
+    baseline_median = statistics.median(baseline)
+    candidate_median = statistics.median(candidate)
+    _, p_value = mann_whitney_greater(candidate, baseline)
+    low, high = bootstrap_ratio_ci(candidate, baseline, confidence, resamples)
+    if p_value < alpha and low > threshold:
+        verdict = "regression"
+    elif high < -threshold:
+        verdict = "improvement"
+    else:
+        verdict = "unchanged"
+    return {
+        "baseline_median": baseline_median, "candidate_median": candidate_median,
+        "change": candidate_median / baseline_median - 1, "ci": [low, high],
+        "p_value": p_value, "threshold": threshold, "verdict": verdict,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_samples(name, samples, path):
+    """Échantillons bruts + contexte (commit, date)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {"benchmark": name, "commit": git_revision(), "date": datetime.now().isoformat(timespec="seconds"),
+            "samples": samples}
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    return data
+
+
+def print_report(name, result, baseline_info):
+    """Rapport compact : médianes, écart [IC], p-valeur, verdict"""
+    icons = {"regression": "❌ RÉGRESSION", "improvement": "🚀 amélioration", "unchanged": "✅ pas de régression"}
+    low, high = result["ci"]
+    print(f"\n📊 {name} vs référence {baseline_info.get('commit') or '?'} ({baseline_info.get('date', '?')})")
+    print(f"   médiane  {result['baseline_median']:.0f} ms → {result['candidate_median']:.0f} ms "
+          f"({result['change']:+.1%}, IC [{low:+.1%} ; {high:+.1%}])")
+    print(f"   Mann-Whitney p = {result['p_value']:.4f}   seuil {result['threshold']:.0%}")
+    print(f"   {icons[result['verdict']]}")
+
+
+def main():
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Porte de régression de performance sur exécutions répétées")
+    parser.add_argument("benchmark", choices=["build", "navigation", "command"], help="Mesure à répéter")
+    parser.add_argument("--command", help="Commande mesurée avec le benchmark « command »")
+    parser.add_argument("--name", help="Nom des échantillons (défaut : nom du benchmark)")
+    parser.add_argument("--url", default="http://localhost:8080", help="URL du site (navigation)")
+    parser.add_argument("--runs", type=int, default=10, help="Exécutions mesurées")
+    parser.add_argument("--warmup", type=int, default=2, help="Exécutions d'échauffement ignorées")
+    parser.add_argument("--threshold", type=float, default=0.05, help="Ralentissement toléré (0.05 = 5 %%)")
+    parser.add_argument("--alpha", type=float, default=0.05, help="Seuil de significativité")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Niveau de l'intervalle bootstrap")
+    parser.add_argument("--save-baseline", action="store_true", help="Enregistre les échantillons comme référence")
+    parser.add_argument("--baseline", help="Fichier de référence (défaut : test/.cache/perf/<nom>/baseline.json)")
+    args = parser.parse_args()
+
+    if args.benchmark == "command" and not args.command:
+        parser.error("--command est requis avec le benchmark « command »")
+    name = args.name or args.benchmark
+    benchmark = {
+        "build": lambda: BuildBenchmark([]),
+        "navigation": lambda: NavigationBenchmark(args.url),
+        "command": lambda: CommandBenchmark(shlex.split(args.command)),
+    }[args.benchmark]()
+
+    print(f"🏁 {name} : {args.warmup} échauffement(s) + {args.runs} mesure(s)")
+    try:
+        samples = collect_samples(benchmark, max(2, args.runs), max(0, args.warmup))
+    except (FileNotFoundError, RuntimeError) as e:
+        print(f"❌ {e}")
+        return False
+
+    bench_dir = RESULTS_DIR / name
+    save_samples(name, samples, bench_dir / f"run-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    baseline_path = Path(args.baseline) if args.baseline else bench_dir / "baseline.json"
+    if args.save_baseline:
+        save_samples(name, samples, baseline_path)
+        print(f"💾 Référence enregistrée : {baseline_path} (médiane {statistics.median(samples):.0f} ms)")
+        return True
+    if not baseline_path.exists():
+        print(f"❌ Pas de référence : {baseline_path} (relancez avec --save-baseline sur la branche principale)")
+        return False
+
+    baseline_info = json.loads(baseline_path.read_text(encoding="utf-8"))
+    result = compare(samples, baseline_info["samples"], args.threshold, args.alpha, args.confidence)
+    print_report(name, result, baseline_info)
+    return result["verdict"] != "regression"
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
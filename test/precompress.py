@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Précompression du site construit (_site/)
+Écrit en parallèle les variantes brotli (.br) et gzip (.gz) de chaque fichier compressible,
+ne retraite que les fichiers modifiés et rapporte le taux de compression par type de fichier
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from hash_cache import HashCache, file_digest
+
+
+SITE_DIR = Path(__file__).parent.parent / "_site"
+PRECOMPRESS_VERSION = "1"
+
+COMPRESSIBLE_EXTENSIONS = {
+    ".html", ".css", ".js", ".mjs", ".json", ".svg", ".xml", ".txt", ".yml", ".yaml",
+    ".webmanifest", ".map", ".ico", ".ttf", ".otf",
+}
+VARIANT_SUFFIXES = (".gz", ".br")
+# En dessous, l'en-tête de compression coûte plus qu'il ne rapporte
+MIN_SIZE = 256
+
+
+def _write_variant(path, data, original_size):
+    """Écrit une variante seulement si elle est plus petite que l'original ; renvoie sa taille"""
+    if len(data) >= original_size:
+        if path.exists():
+            path.unlink()
+        return None
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+    return len(data)
+
+
+def compress_file(path, gzip_level=9, brotli_quality=11):
+    """
+    Compresse un fichier (exécuté dans un processus du pool).
+
+    Returns:
+        dict: tailles de l'original et des variantes écrites (None si non écrite)
+    """
+    path = Path(path)
+    data = path.read_bytes()
+    result = {"size": len(data), "gzip": None, "br": None}
+    result["gzip"] = _write_variant(
+        path.with_name(path.name + ".gz"), gzip.compress(data, compresslevel=gzip_level, mtime=0), len(data)
+    )
+    if brotli is not None:
+        mode = brotli.MODE_TEXT if path.suffix in (".html", ".css", ".js", ".json", ".svg", ".xml", ".txt") \
+            else brotli.MODE_GENERIC
+        result["br"] = _write_variant(
+            path.with_name(path.name + ".br"), brotli.compress(data, mode=mode, quality=brotli_quality), len(data)
+        )
+    return result
+
+
+def find_compressible(root):
+    """Fichiers compressibles de root (chemins relatifs triés)"""
+    files = []
+    for path in root.rglob("*"):
+        if path.is_file() and path.suffix.lower() in COMPRESSIBLE_EXTENSIONS:
+            files.append(path.relative_to(root).as_posix())
+    return sorted(files)
+
+
+def remove_orphan_variants(root):
+    """Supprime les .gz/.br dont le fichier source a disparu"""
+    removed = 0
+    for suffix in VARIANT_SUFFIXES:
+        for variant in root.rglob(f"*{suffix}"):
+            if not variant.with_name(variant.name[:-len(suffix)]).exists():
+                variant.unlink()
+                removed += 1
+    return removed
+
+
+def _variants_present(root, key, entry):
+    for name, suffix in (("gzip", ".gz"), ("br", ".br")):
+        if entry.get(name) and not (root / (key + suffix)).exists():
+            return False
+    return True
+
+
+def _touch_variants(root, key, source):
+    """
+    Aligne la date des variantes inchangées sur celle de la source : Eleventy réécrit chaque page à
+    chaque build, et static_server ignore les variantes plus anciennes que leur source
+    """
+    mtime_ns = source.stat().st_mtime_ns
+    for suffix in VARIANT_SUFFIXES:
+        variant = root / (key + suffix)
+        if variant.exists():
+            os.utime(variant, ns=(mtime_ns, mtime_ns))
+
+
+def precompress(root=SITE_DIR, max_workers=None, use_cache=True, gzip_level=9, brotli_quality=11):
+    """
+    Précompresse le site.
+
+    Returns:
+        dict: chemin relatif → {size, gzip, br} pour tous les fichiers compressibles
+    """
+    root = Path(root)
+    namespace = f"{PRECOMPRESS_VERSION}-gz{gzip_level}-br{brotli_quality if brotli else 'absent'}"
+    cache = HashCache("precompress.json", namespace)
+    files = find_compressible(root)
+
+    results = {}
+    stale = []
+    small = 0
+    for key in files:
+        path = root / key
+        if path.stat().st_size < MIN_SIZE:
+            small += 1
+            for suffix in VARIANT_SUFFIXES:
+                variant = root / (key + suffix)
+                if variant.exists():
+                    variant.unlink()
+            results[key] = {"size": path.stat().st_size, "gzip": None, "br": None}
+            continue
+        digest = file_digest(path)
+        entry = cache.get(key)
+        if use_cache and cache.is_fresh(key, digest) and _variants_present(root, key, entry):
+            results[key] = {name: entry[name] for name in ("size", "gzip", "br")}
+            _touch_variants(root, key, path)
+        else:
+            stale.append((key, digest))
+
+    if stale:
+        paths = [str(root / key) for key, _ in stale]
+        if len(stale) == 1:
+            outcomes = [compress_file(paths[0], gzip_level, brotli_quality)]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                outcomes = list(pool.map(
+                    compress_file, paths, [gzip_level] * len(paths), [brotli_quality] * len(paths),
+                    chunksize=max(1, len(paths) // ((max_workers or os.cpu_count() or 1) * 4)),
+                ))
+        for (key, digest), outcome in zip(stale, outcomes):
+            results[key] = outcome
+            cache.update(key, digest, **outcome)
+
+    cache.prune(files)
+    cache.save()
+    removed = remove_orphan_variants(root)
+    print(f"🗜️ {len(stale)} fichier(s) compressé(s), {len(files) - len(stale) - small} inchangé(s), "
+          f"{small} trop petit(s)"
+          + (f", {removed} variante(s) orpheline(s) supprimée(s)" if removed else ""))
+    return results
+
+
+def ratio_report(results):
+    """Agrège les tailles par extension"""
+    report = {}
+    for key, sizes in results.items():
+        ext = Path(key).suffix.lower() or "(aucune)"
+        row = report.setdefault(ext, {"files": 0, "size": 0, "gzip": 0, "br": 0})
+        row["files"] += 1
+        row["size"] += sizes["size"]
+        # Un fichier sans variante est servi tel quel : il compte pour sa taille d'origine
+        row["gzip"] += sizes["gzip"] or sizes["size"]
+        row["br"] += sizes["br"] or sizes["size"]
+    return dict(sorted(report.items(), key=lambda item: -item[1]["size"]))
+
+
+def print_report(report):
+    """Affiche le taux de compression par type de fichier"""
+    def ratio(compressed, size):
+        return f"{compressed / size * 100:5.1f}%" if size else "    —"
+
+    print(f"\n{'type':<14} {'fichiers':>8} {'original':>11} {'gzip':>11} {'':>6} {'brotli':>11} {'':>6}")
+    totals = {"files": 0, "size": 0, "gzip": 0, "br": 0}
+    for ext, row in report.items():
+        print(f"{ext:<14} {row['files']:>8} {row['size']:>11,} {row['gzip']:>11,} {ratio(row['gzip'], row['size'])} "
+              f"{row['br']:>11,} {ratio(row['br'], row['size'])}")
+        for name in totals:
+            totals[name] += row[name]
+    print(f"{'total':<14} {totals['files']:>8} {totals['size']:>11,} {totals['gzip']:>11,} "
+          f"{ratio(totals['gzip'], totals['size'])} {totals['br']:>11,} {ratio(totals['br'], totals['size'])}")
+    if brotli is None:
+        print("⚠️ Module brotli absent : seules les variantes gzip ont été écrites (pip install brotli)")
+
+
+def main():
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Précompression brotli/gzip du site construit")
+    parser.add_argument("--root", default=str(SITE_DIR), help="Dossier du site construit")
+    parser.add_argument("--workers", type=int, help="Nombre de processus (défaut : nombre de cœurs)")
+    parser.add_argument("--no-cache", action="store_true", help="Recompresse tous les fichiers")
+    parser.add_argument("--report", help="Écrit aussi le rapport par type au format JSON")
+    args = parser.parse_args()
+
+    root = Path(args.root)
+    if not root.is_dir():
+        print(f"❌ Site non construit : {root} (lancez 'npm run build')")
+        return False
+
+    results = precompress(root, args.workers, use_cache=not args.no_cache)
+    report = ratio_report(results)
+    print_report(report)
+    if args.report:
+        Path(args.report).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"💾 Rapport: {args.report}")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -2,9 +2,10 @@
 """
 Script de lancement pour tous les tests E2E
 Vérifie que le serveur de développement est actif avant de lancer les tests
-Lance tous les tests disponibles : navigation interne + back-office CMS
+Lance tous les tests disponibles : contenu + navigation interne + back-office CMS
 """
 
+import argparse
 import requests
 import sys
 import time
@@ -13,6 +14,9 @@ import importlib.util
 import os
 from pathlib import Path
 
+from content_validator import validate_content
+from harness_log import configure_logging, sampling_summary
+
 
 def check_server_status(url, max_retries=5, delay=2):
     """Vérifie si le serveur local est accessible"""
@@ -46,8 +50,8 @@ def load_test_module(module_name, file_path):
         return None
 
 
-def run_navigation_test():
-    """Lance le test de navigation interne"""
+def run_navigation_test(base_url="http://localhost:8080", driver=None, step_wait=2):
+    """Lance le test de navigation interne (dans driver s'il est fourni)"""
     print("🧭 Lancement du test de navigation interne...")
     print("=" * 60)
     
@@ -63,7 +67,7 @@ def run_navigation_test():
         # Importer et exécuter la fonction de test
         nav_module = load_test_module("test_navigation_interne", str(nav_test_path))
         if nav_module and hasattr(nav_module, 'test_navigation_interne'):
-            nav_module.test_navigation_interne()
+            nav_module.test_navigation_interne(base_url, driver, step_wait)
             print("✅ Test de navigation terminé avec succès")
             return True
         else:
@@ -75,8 +79,52 @@ def run_navigation_test():
         return False
 
 
-def run_backoffice_test():
-    """Lance le test E2E back-office CMS"""
+def run_viewport_test(base_url="http://localhost:8080"):
+    """Lance la navigation interne sur mobile, tablette et desktop (un onglet émulé par appareil)"""
+    print("📱 Lancement de la matrice de viewports...")
+    print("=" * 60)
+    
+    try:
+        from viewport_matrix import run_viewport_matrix
+        if run_viewport_matrix(base_url):
+            print("✅ Matrice de viewports terminée avec succès")
+            return True
+        print("❌ Matrice de viewports en échec")
+        return False
+    except Exception as e:
+        print(f"❌ Erreur durant la matrice de viewports: {e}")
+        return False
+
+
+def run_content_test(server_url, session=None):
+    """Lance le test de contenu des pages services (sans navigateur)"""
+    print("📚 Lancement du test de contenu des pages services...")
+    print("=" * 60)
+    
+    try:
+        current_dir = Path(__file__).parent
+        content_test_path = current_dir / "test_contenu_services.py"
+        
+        if not content_test_path.exists():
+            print("⚠️ Fichier test_contenu_services.py non trouvé")
+            return False
+            
+        content_module = load_test_module("test_contenu_services", str(content_test_path))
+        if content_module and hasattr(content_module, 'test_contenu_services'):
+            content_module.test_contenu_services(server_url, session)
+            print("✅ Test de contenu terminé avec succès")
+            return True
+        else:
+            print("❌ Fonction test_contenu_services non trouvée")
+            return False
+            
+    except Exception as e:
+        print(f"❌ Erreur durant le test de contenu: {e}")
+        return False
+
+
+def run_backoffice_test(admin_url=None, credentials=None, driver=None):
+    """Lance le test E2E back-office CMS (dans driver s'il est fourni)"""
     print("🎯 Lancement du test E2E Back-Office CMS...")
     print("=" * 60)
     
@@ -92,7 +140,7 @@ def run_backoffice_test():
         # Importer et exécuter la classe de test
         cms_module = load_test_module("test_backoffice_cms", str(cms_test_path))
         if cms_module and hasattr(cms_module, 'TestBackOfficeCMS'):
-            test = cms_module.TestBackOfficeCMS()
+            test = cms_module.TestBackOfficeCMS(admin_url=admin_url, credentials=credentials, driver=driver)
             test.run_test()
             print("✅ Test back-office terminé avec succès")
             return True
@@ -105,14 +153,84 @@ def run_backoffice_test():
         return False
 
 
+def parse_args():
+    """Options de la ligne de commande"""
+    parser = argparse.ArgumentParser(description="Suite complète des tests E2E")
+    parser.add_argument(
+        "--vendor-cache", action="store_true",
+        help="Sert decap-cms et Netlify Identity depuis le cache local (test/.cache/vendor)"
+    )
+    parser.add_argument(
+        "--offline", action="store_true",
+        help="Avec --vendor-cache : interdit tout téléchargement, échoue si un script manque"
+    )
+    parser.add_argument(
+        "--static", action="store_true",
+        help="Tests en lecture seule sur _site/ servi en Python (sans npm run dev, sans back-office)"
+    )
+    parser.add_argument(
+        "--git-gateway", action="store_true",
+        help="Teste le back-office avec config.yml (git-gateway) via le simulateur local"
+    )
+    parser.add_argument(
+        "--viewports", action="store_true",
+        help="Ajoute la navigation interne sur mobile, tablette et desktop (émulation, un seul navigateur)"
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="Surveille src/ et relance les tests concernés à chaque reconstruction (navigateur gardé ouvert)"
+    )
+    parser.add_argument(
+        "--log-level", default=None, choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Niveau affiché en console (le journal complet dans test/logs/ reste en DEBUG)"
+    )
+    return parser.parse_args()
+
+
 def main():
     """Point d'entrée principal"""
+    args = parse_args()
+    log_file = configure_logging(args.log_level)
     print("🚀 Lanceur de tests E2E - Suite complète")
     print("=" * 70)
     
     # Configuration
     server_url = "http://localhost:8080"
     admin_url = f"{server_url}/admin/"
+    vendor_proxy = None
+    
+    # Porte de pré-test : un contenu invalide échoue en quelques millisecondes, avant tout navigateur
+    if not validate_content():
+        print()
+        print("🔧 Corrigez les fichiers de contenu ci-dessus avant de relancer les tests.")
+        print()
+        return False
+    
+    # Sélecteurs de navigation évalués sur _site/ : une navigation cassée est signalée avant tout navigateur
+    # (import tardif : navigation_utils ne doit être chargé qu'une fois la journalisation configurée)
+    from selector_health import check_selectors
+    if not check_selectors():
+        print()
+        print("🔧 Mettez à jour les sélecteurs de navigation_utils.py ou le balisage des pages.")
+        print()
+        return False
+    
+    if args.watch and args.static:
+        print("❌ --watch a besoin de la reconstruction d'Eleventy : lancez 'npm run dev' sans --static")
+        return False
+    
+    # Site déjà construit servi en Python : démarrage immédiat, aucun processus Node
+    static_server = None
+    if args.static:
+        from static_server import StaticSiteServer
+        try:
+            static_server = StaticSiteServer()
+            server_url = static_server.start()
+        except FileNotFoundError as e:
+            print()
+            print(f"❌ {e}")
+            print()
+            return False
     
     # Vérifier que le serveur principal est actif
     if not check_server_status(server_url):
@@ -123,37 +241,106 @@ def main():
         return False
     
     # Vérifier que la page admin est accessible
-    if not check_server_status(admin_url):
+    if not args.static and not check_server_status(admin_url):
         print()
         print("❌ La page d'administration n'est pas accessible.")
         print("🔧 Vérifiez que Decap CMS est correctement configuré.")
         print()
         return False
     
+    # Proxy des scripts tiers : le back-office charge decap-cms depuis le cache disque
+    cms_admin_url = None
+    if args.vendor_cache:
+        from script_cache import VendorProxyServer, VendorScriptCache
+        cache = VendorScriptCache(allow_network=not args.offline)
+        unpinned = cache.unpinned()
+        if unpinned:
+            print()
+            print("❌ Scripts tiers non épinglés : " + ", ".join(unpinned))
+            print("🔧 Lancez 'python test/script_cache.py --update' puis committez test/vendor_scripts.json.")
+            print()
+            return False
+        missing = [url for url in cache.entries if not cache.is_cached(url)]
+        if missing and args.offline:
+            print()
+            print("❌ Scripts tiers absents du cache : " + ", ".join(missing))
+            print("🔧 Lancez 'python test/script_cache.py --fetch' sur une machine connectée.")
+            print()
+            return False
+        vendor_proxy = VendorProxyServer(server_url, cache)
+        cms_admin_url = f"{vendor_proxy.start()}/admin/"
+    
+    # Backend de production simulé : Identity + git-gateway devant le site (ou le proxy des scripts)
+    gateway = None
+    credentials = None
+    if args.git_gateway:
+        from git_gateway_mock import GitGatewayMock
+        upstream = vendor_proxy.url if vendor_proxy else server_url
+        gateway = GitGatewayMock(upstream, deploy_root=Path(__file__).parent.parent)
+        cms_admin_url = f"{gateway.start()}/admin/"
+        credentials = (gateway.identity.email, gateway.identity.password)
+    
     print()
     print("✅ Serveurs accessibles, lancement des tests...")
     print()
     
+    # Mode watch : relances incrémentales jusqu'à Ctrl+C
+    if args.watch:
+        from watch_runner import WatchRunner
+        WatchRunner(server_url, cms_admin_url, credentials).run()
+        if gateway:
+            gateway.stop()
+        if vendor_proxy:
+            vendor_proxy.stop()
+        print(f"Journal complet: {log_file}")
+        return True
+    
+    
     # Compteurs de résultats
     total_tests = 0
     successful_tests = 0
     
-    # Test 1 : Navigation interne
+    # Test 1 : Contenu des pages services (rapide, sans navigateur)
+    print("\n" + "🔸" * 70)
+    total_tests += 1
+    if run_content_test(server_url):
+        successful_tests += 1
+    
+    # Test 2 : Navigation interne
     print("\n" + "🔸" * 70)
     total_tests += 1
-    if run_navigation_test():
+    if run_navigation_test(server_url):
         successful_tests += 1
+    
+    # Test 2 bis : Navigation interne par viewport
+    if args.viewports:
+        print("\n" + "🔸" * 70)
+        total_tests += 1
+        if run_viewport_test(server_url):
+            successful_tests += 1
         
     print("\n" + "🔸" * 70)
     
-    # Attente entre les tests pour laisser le temps au navigateur de se fermer
-    print("⏳ Pause entre les tests...")
-    time.sleep(3)
+    if static_server:
+        # Le back-office a besoin de decap-server : non testé sur le site statique
+        print("ℹ️ Test back-office ignoré (--static)")
+        static_server.stop()
+    else:
+        # Attente entre les tests pour laisser le temps au navigateur de se fermer
+        print("⏳ Pause entre les tests...")
+        time.sleep(3)
+        
+        # Test 3 : Back-office CMS
+        total_tests += 1
+        if run_backoffice_test(cms_admin_url, credentials):
+            successful_tests += 1
     
-    # Test 2 : Back-office CMS
-    total_tests += 1
-    if run_backoffice_test():
-        successful_tests += 1
+    if gateway:
+        gateway.stop()
+        from git_gateway_mock import print_report
+        print_report(gateway.stats.report())
+    if vendor_proxy:
+        vendor_proxy.stop()
     
     # Résumé final
     print("\n" + "=" * 70)
@@ -162,6 +349,10 @@ def main():
     print(f"Tests exécutés: {total_tests}")
     print(f"Tests réussis: {successful_tests}")
     print(f"Tests échoués: {total_tests - successful_tests}")
+    attempts = sampling_summary()
+    if attempts:
+        print(f"Tentatives de sélecteurs journalisées: {sum(attempts.values())} ({len(attempts)} cible(s))")
+    print(f"Journal complet: {log_file}")
     
     if successful_tests == total_tests:
         print("\n🎉 Tous les tests ont réussi ! 🎉")
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Test de montée en charge des vues de collection Decap CMS
+Peuple une collection avec 100, 1 000 puis 5 000 entrées et mesure dans le navigateur
+le temps d'affichage de la liste et de la sidebar, la fluidité du défilement
+et la latence d'ouverture de l'éditeur « New Formation »
+"""
+
+import argparse
+import atexit
+import json
+import signal
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from content_model import PROJECT_ROOT, load_cms_config, CollectionSpec
+from navigation_utils import CMSHelper, create_chrome_driver
+from workspace_manager import Workspace
+
+
+DEFAULT_SIZES = (100, 1000, 5000)
+SEED_PREFIX = "scale-test-"
+RESULTS_DIR = Path(__file__).parent / ".cache" / "scale"
+
+# Attend le rendu de la sidebar et de la liste ; renvoie les instants (performance.now, ms depuis la navigation)
+WAIT_FOR_LIST_JS = """
+const [collection, expected, timeoutMs, done] = arguments;
+const result = {sidebar: null, firstEntry: null, fullList: null, rendered: 0};
+const entrySelector = `a[href*="/collections/${collection}/entries/"]`;
+const sidebarSelector = `a[href$="/collections/${collection}"], [data-testid="${collection}"]`;
+const check = () => {
+    const now = performance.now();
+    if (result.sidebar === null && document.querySelector(sidebarSelector)) result.sidebar = now;
+    const count = document.querySelectorAll(entrySelector).length;
+    result.rendered = count;
+    if (result.firstEntry === null && count > 0) result.firstEntry = now;
+    if (result.fullList === null && count >= expected) result.fullList = now;
+    return result.sidebar !== null && result.fullList !== null;
+};
+if (check()) return done(result);
+const observer = new MutationObserver(() => {
+    if (check()) { observer.disconnect(); clearTimeout(timer); done(result); }
+});
+observer.observe(document.body, {childList: true, subtree: true});
+const timer = setTimeout(() => { observer.disconnect(); check(); done(result); }, timeoutMs);
+"""
+
+# Défilement scripté de la liste ; mesure les intervalles entre frames et les tâches longues
+SCROLL_JANK_JS = """
+const [steps, done] = arguments;
+const scroller = document.scrollingElement;
+const longTasks = [];
+let observer = null;
+try {
+    observer = new PerformanceObserver(list => longTasks.push(...list.getEntries().map(e => e.duration)));
+    observer.observe({entryTypes: ["longtask"]});
+} catch (e) {}
+const maxScroll = Math.max(scroller.scrollHeight - window.innerHeight, 0);
+const deltas = [];
+let last = performance.now();
+let step = 0;
+const frame = (now) => {
+    deltas.push(now - last);
+    last = now;
+    scroller.scrollTop = maxScroll * (step / steps);
+    if (++step <= steps) return requestAnimationFrame(frame);
+    if (observer) observer.disconnect();
+    done({deltas: deltas.slice(1), longTasks, scrollHeight: scroller.scrollHeight});
+};
+requestAnimationFrame(frame);
+"""
+
+# Clic et instant de départ dans le même script : la recherche du bouton n'est pas mesurée
+CLICK_AND_MARK_JS = """
+const t0 = performance.now();
+arguments[0].click();
+return t0;
+"""
+
+WAIT_FOR_EDITOR_JS = """
+const [timeoutMs, done] = arguments;
+const ready = () => document.querySelector("input[id*='-field-'], textarea[id*='-field-']");
+if (ready()) return done(performance.now());
+const observer = new MutationObserver(() => {
+    if (ready()) { observer.disconnect(); clearTimeout(timer); done(performance.now()); }
+});
+observer.observe(document.body, {childList: true, subtree: true});
+const timer = setTimeout(() => { observer.disconnect(); done(null); }, timeoutMs);
+"""
+
+
+def percentile(values, fraction):
+    """Percentile par rang le plus proche (None si liste vide)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+class CollectionSeeder:
+    """Écrit puis supprime des entrées factices dans le dossier d'une collection"""
+
+    def __init__(self, collection="formations", root=PROJECT_ROOT):
+        config = load_cms_config(Path(root) / "src" / "admin" / "config.yml")
+        definition = next(c for c in config["collections"] if c["name"] == collection)
+        self.spec = CollectionSpec(definition, root)
+        self.seeded = []
+
+    def _value(self, field, index):
+        widget = field.get("widget", "string")
+        if widget == "list":
+            return [f"Élément {index}-a", f"Élément {index}-b"]
+        if widget == "datetime":
+            return datetime(2030, 1, 1, tzinfo=timezone.utc).isoformat()
+        if widget == "number":
+            return index
+        if widget == "boolean":
+            return False
+        if field["name"] == "hash":
+            return f"#{SEED_PREFIX}{index:05d}"
+        return f"Scale test {index:05d}"
+
+    def seed(self, count):
+        """Complète la collection jusqu'à count entrées factices"""
+        if not self.seeded:
+            # Filet de sécurité si le processus s'arrête avant le nettoyage normal
+            atexit.register(self.cleanup)
+        for index in range(len(self.seeded), count):
+            path = self.spec.folder / f"{SEED_PREFIX}{index:05d}.json"
+            data = {field["name"]: self._value(field, index) for field in self.spec.fields}
+            path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            self.seeded.append(path)
+
+    def existing_entries(self):
+        """Nombre d'entrées réelles (hors entrées factices)"""
+        return sum(1 for p in self.spec.folder.glob("*.json") if not p.name.startswith(SEED_PREFIX))
+
+    def cleanup(self):
+        """Supprime toutes les entrées factices"""
+        if not self.spec.folder.is_dir():
+            return
+        for path in self.spec.folder.glob(f"{SEED_PREFIX}*.json"):
+            path.unlink()
+        if self.seeded:
+            print("🧹 Entrées factices supprimées")
+        self.seeded = []
+
+
+class CollectionScaleTest:
+    """Mesure les vues de collection Decap pour plusieurs tailles de collection"""
+
+    def __init__(self, admin_url="http://localhost:8080/admin/", collection="formations",
+                 headless=True, timeout=120, root=PROJECT_ROOT):
+        self.admin_url = admin_url
+        self.collection = collection
+        self.timeout = timeout
+        self.seeder = CollectionSeeder(collection, root)
+        self.driver = create_chrome_driver(headless=headless)
+        self.driver.set_script_timeout(timeout + 5)
+        self.cms_helper = CMSHelper(self.driver, 10)
+
+    def measure(self, size):
+        """Mesure une taille de collection ; renvoie un point de la courbe"""
+        self.seeder.seed(size)
+        expected = size + self.seeder.existing_entries()
+        print(f"📏 Collection '{self.collection}' avec {expected} entrées...")
+
+        # Laisser decap-server voir les nouveaux fichiers avant d'ouvrir la vue
+        time.sleep(1)
+        self.driver.get("about:blank")
+        self.driver.get(f"{self.admin_url}#/collections/{self.collection}")
+        timings = self.driver.execute_async_script(
+            WAIT_FOR_LIST_JS, self.collection, expected, self.timeout * 1000
+        )
+        if timings["fullList"] is None:
+            print(f"⚠️ Liste incomplète après {self.timeout}s ({timings['rendered']}/{expected} entrées)")
+
+        scroll = self.driver.execute_async_script(SCROLL_JANK_JS, 120)
+        deltas = scroll["deltas"]
+
+        # Ouverture de l'éditeur : bouton résolu avant la mesure, chronomètre lancé au clic
+        editor_ms = None
+        try:
+            button = WebDriverWait(self.driver, 10).until(EC.element_to_be_clickable(
+                (By.CSS_SELECTOR, f"a[href*='/collections/{self.collection}/new']")
+            ))
+        except TimeoutException:
+            print("⚠️ Bouton « New » introuvable : ouverture de l'éditeur non mesurée")
+        else:
+            started_at = self.driver.execute_script(CLICK_AND_MARK_JS, button)
+            ready_at = self.driver.execute_async_script(WAIT_FOR_EDITOR_JS, self.timeout * 1000)
+            if ready_at is not None:
+                editor_ms = ready_at - started_at
+
+        point = {
+            "entries": expected,
+            "rendered": timings["rendered"],
+            "sidebar_ms": timings["sidebar"],
+            "first_entry_ms": timings["firstEntry"],
+            "list_rendered_ms": timings["fullList"],
+            "frame_p50_ms": percentile(deltas, 0.50),
+            "frame_p95_ms": percentile(deltas, 0.95),
+            "janky_frames": sum(1 for d in deltas if d > 50),
+            "frames": len(deltas),
+            "long_tasks": len(scroll["longTasks"]),
+            "long_tasks_ms": round(sum(scroll["longTasks"]), 1),
+            "editor_open_ms": editor_ms,
+        }
+        self._print_point(point)
+        return point
+
+    def _print_point(self, point):
+        def fmt(value):
+            return "—" if value is None else f"{value:.0f} ms"
+        print(f"   sidebar {fmt(point['sidebar_ms'])} | liste {fmt(point['list_rendered_ms'])} | "
+              f"frames p95 {fmt(point['frame_p95_ms'])} ({point['janky_frames']}/{point['frames']} saccadées) | "
+              f"éditeur {fmt(point['editor_open_ms'])}")
+
+    def run(self, sizes=DEFAULT_SIZES):
+        """Lance toutes les tailles et renvoie la courbe complète"""
+        points = []
+        version = None
+        try:
+            self.driver.get(self.admin_url)
+            self.cms_helper.wait_for_cms_load()
+            version = self.driver.execute_script(
+                "return window.DECAP_CMS_VERSION || window.CMS_VERSION || null;"
+            )
+            for size in sorted(sizes):
+                try:
+                    points.append(self.measure(size))
+                except TimeoutException as e:
+                    print(f"❌ Mesure interrompue pour {size} entrées: {e}")
+                    break
+        finally:
+            self.seeder.cleanup()
+            self.driver.quit()
+
+        return {
+            "collection": self.collection,
+            "decap_version": version,
+            "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "points": points,
+        }
+
+
+def save_curve(curve, output=None):
+    """Enregistre une courbe, nommée par version de Decap pour comparaison ultérieure"""
+    if output is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = RESULTS_DIR / f"{curve['collection']}-decap-{curve['decap_version'] or 'inconnu'}-{stamp}.json"
+    Path(output).write_text(json.dumps(curve, indent=2), encoding="utf-8")
+    print(f"💾 Courbe enregistrée: {output}")
+    return output
+
+
+def compare_curves(paths):
+    """Affiche plusieurs courbes côte à côte (une colonne par fichier)"""
+    curves = [json.loads(Path(p).read_text(encoding="utf-8")) for p in paths]
+    metrics = ["sidebar_ms", "list_rendered_ms", "frame_p95_ms", "janky_frames", "editor_open_ms"]
+    print("entrées  métrique           " + "  ".join(f"{c['decap_version'] or '?':>14}" for c in curves))
+    sizes = sorted({point["entries"] for c in curves for point in c["points"]})
+    for size in sizes:
+        for metric in metrics:
+            row = []
+            for c in curves:
+                value = next((p[metric] for p in c["points"] if p["entries"] == size), None)
+                row.append(f"{'—' if value is None else round(value, 1):>14}")
+            print(f"{size:>7}  {metric:<18} " + "  ".join(row))
+
+
+def main():
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Montée en charge des vues de collection Decap CMS")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Tailles à mesurer")
+    parser.add_argument("--collection", default="formations", help="Collection de config.yml à peupler")
+    parser.add_argument("--in-place", action="store_true",
+                        help="Peuple le src/ du projet et utilise le serveur de --admin-url (npm run dev)")
+    parser.add_argument("--admin-url", default="http://localhost:8080/admin/", help="URL du back-office (--in-place)")
+    parser.add_argument("--headed", action="store_true", help="Affiche le navigateur")
+    parser.add_argument("--output", help="Fichier de sortie de la courbe (JSON)")
+    parser.add_argument("--compare", nargs="+", metavar="COURBE", help="Compare des courbes enregistrées")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare_curves(args.compare)
+        return True
+
+    if args.in_place:
+        print("ℹ️ Assurez-vous que 'npm run dev' est actif (Eleventy + decap-server)")
+        # SIGTERM passe par SystemExit : les entrées factices sont supprimées comme sur Ctrl+C
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(1))
+        test = CollectionScaleTest(args.admin_url, args.collection, headless=not args.headed)
+        curve = test.run(args.sizes)
+    else:
+        # Copie de travail isolée : une mesure interrompue ne laisse rien dans src/
+        try:
+            with Workspace("scale") as workspace:
+                test = CollectionScaleTest(workspace.admin_url, args.collection, headless=not args.headed,
+                                           root=workspace.root)
+                curve = test.run(args.sizes)
+        except (FileNotFoundError, RuntimeError) as e:
+            print(f"❌ {e}")
+            return False
+    save_curve(curve, args.output)
+    return len(curve["points"]) == len(args.sizes)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Cache local des scripts tiers chargés par le back-office Decap CMS
+Sert des copies épinglées (decap-cms, Netlify Identity) depuis un cache disque
+adressé par contenu, via un proxy qui réécrit les URLs dans le HTML servi
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+
+TEST_DIR = Path(__file__).parent
+DEFAULT_MANIFEST = TEST_DIR / "vendor_scripts.json"
+DEFAULT_CACHE_DIR = TEST_DIR / ".cache" / "vendor"
+VENDOR_PREFIX = "/__vendor__/"
+
+# En-têtes qui ne doivent pas être recopiés tels quels par le proxy
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailers", "transfer-encoding", "upgrade", "content-encoding",
+    "content-length", "host",
+}
+
+
+class VendorScriptCache:
+    """Cache disque adressé par contenu (sha256) des scripts tiers épinglés"""
+
+    def __init__(self, manifest_path=DEFAULT_MANIFEST, cache_dir=DEFAULT_CACHE_DIR, allow_network=True):
+        self.manifest_path = Path(manifest_path)
+        self.cache_dir = Path(cache_dir)
+        self.allow_network = allow_network
+        self._lock = threading.Lock()
+        self._verified = set()
+        self.manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        self.entries = {entry["url"]: entry for entry in self.manifest["scripts"]}
+
+    def unpinned(self):
+        """URLs du manifeste sans URL résolue ni empreinte (à épingler avec --update)"""
+        return [url for url, entry in self.entries.items()
+                if not (entry.get("resolved_url") and entry.get("sha256"))]
+
+    def blob_path(self, sha256):
+        """Chemin du fichier de cache correspondant à une empreinte"""
+        return self.cache_dir / f"{sha256}.js"
+
+    def is_cached(self, url):
+        """Indique si le script épinglé pour cette URL est présent et intègre"""
+        entry = self.entries.get(url)
+        if not entry or not entry.get("sha256"):
+            return False
+        return self.read_blob(entry["sha256"]) is not None
+
+    def read_blob(self, sha256):
+        """Lit un blob du cache et vérifie son empreinte"""
+        path = self.blob_path(sha256)
+        if not path.exists():
+            return None
+        content = path.read_bytes()
+        if sha256 not in self._verified:
+            if hashlib.sha256(content).hexdigest() != sha256:
+                print(f"⚠️ Blob corrompu dans le cache, ignoré: {path.name}")
+                return None
+            self._verified.add(sha256)
+        return content
+
+    def get(self, url):
+        """
+        Retourne le contenu épinglé d'un script tiers.
+
+        Args:
+            url: URL telle qu'elle apparaît dans src/admin/index.njk
+
+        Returns:
+            tuple: (sha256, contenu en bytes)
+        """
+        entry = self.entries.get(url)
+        if entry is None:
+            raise KeyError(f"Script non référencé dans {self.manifest_path.name}: {url}")
+        if url in self.unpinned():
+            raise ValueError(
+                f"Script non épinglé dans {self.manifest_path.name}: {url} "
+                f"(lancez 'python test/script_cache.py --update' puis committez le manifeste)"
+            )
+
+        content = self.read_blob(entry["sha256"])
+        if content is not None:
+            return entry["sha256"], content
+
+        if not self.allow_network:
+            raise FileNotFoundError(
+                f"Script absent du cache et réseau désactivé: {url} "
+                f"(lancez 'python test/script_cache.py --fetch' sur une machine connectée)"
+            )
+        return self.fetch(url)
+
+    def fetch(self, url, update=False):
+        """
+        Télécharge un script et l'ajoute au cache.
+        Sans update, le script doit déjà être épinglé (URL résolue et empreinte) : pas de confiance
+        au premier téléchargement, l'épinglage se fait explicitement avec update.
+        """
+        entry = self.entries[url]
+        if not update and url in self.unpinned():
+            raise ValueError(
+                f"Script non épinglé dans {self.manifest_path.name}: {url} "
+                f"(lancez 'python test/script_cache.py --update' puis committez le manifeste)"
+            )
+        source_url = url if update else entry["resolved_url"]
+
+        print(f"🌐 Téléchargement de {source_url}...")
+        response = requests.get(source_url, timeout=60)
+        response.raise_for_status()
+        content = response.content
+        sha256 = hashlib.sha256(content).hexdigest()
+
+        if entry.get("sha256") and entry["sha256"] != sha256 and not update:
+            raise ValueError(
+                f"Empreinte inattendue pour {url}: {sha256[:12]} au lieu de {entry['sha256'][:12]} "
+                f"(utilisez --update pour ré-épingler)"
+            )
+
+        with self._lock:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            blob = self.blob_path(sha256)
+            tmp = blob.with_suffix(".tmp")
+            tmp.write_bytes(content)
+            tmp.replace(blob)
+
+            entry["resolved_url"] = response.url
+            entry["sha256"] = sha256
+            self.save_manifest()
+
+        print(f"✅ {url} épinglé ({len(content) // 1024} Ko, sha256 {sha256[:12]})")
+        return sha256, content
+
+    def save_manifest(self):
+        """Réécrit le manifeste avec les URLs résolues et les empreintes"""
+        self.manifest_path.write_text(
+            json.dumps(self.manifest, indent=2, ensure_ascii=False) + "\n",
+            encoding="utf-8"
+        )
+
+    def rewrite_html(self, html):
+        """Remplace les URLs des scripts tiers par leur copie locale"""
+        for url in self.entries:
+            if url not in html:
+                continue
+            try:
+                sha256, _ = self.get(url)
+            except (FileNotFoundError, ValueError, requests.exceptions.RequestException) as e:
+                print(f"⚠️ Réécriture impossible pour {url}: {e}")
+                continue
+            html = html.replace(url, f"{VENDOR_PREFIX}{sha256}.js")
+        return html
+
+
+class VendorProxyHandler(BaseHTTPRequestHandler):
+    """Proxy HTTP vers le serveur de dev, qui sert les scripts tiers depuis le cache"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.startswith(VENDOR_PREFIX):
+            self._serve_vendor_blob()
+        else:
+            self._forward()
+
+    def do_HEAD(self):
+        self._forward()
+
+    def do_POST(self):
+        self._forward()
+
+    def do_PUT(self):
+        self._forward()
+
+    def do_DELETE(self):
+        self._forward()
+
+    def _serve_vendor_blob(self):
+        sha256 = self.path[len(VENDOR_PREFIX):].split("?")[0]
+        if sha256.endswith(".js"):
+            sha256 = sha256[:-3]
+        content = self.server.cache.read_blob(sha256)
+        if content is None:
+            self.send_error(404, "Script absent du cache")
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/javascript; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.send_header("Cache-Control", "public, max-age=31536000, immutable")
+        self.send_header("ETag", f'"{sha256}"')
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _forward(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else None
+        headers = {k: v for k, v in self.headers.items() if k.lower() not in HOP_BY_HOP_HEADERS}
+
+        try:
+            upstream = self.server.session.request(
+                self.command, self.server.upstream + self.path,
+                headers=headers, data=body, allow_redirects=False, timeout=30
+            )
+        except requests.exceptions.RequestException as e:
+            self.send_error(502, f"Serveur amont inaccessible: {e}")
+            return
+
+        content = upstream.content
+        if "text/html" in upstream.headers.get("Content-Type", ""):
+            html = content.decode(upstream.encoding or "utf-8", errors="replace")
+            content = self.server.cache.rewrite_html(html).encode("utf-8")
+
+        self.send_response(upstream.status_code)
+        for key, value in upstream.headers.items():
+            if key.lower() not in HOP_BY_HOP_HEADERS:
+                self.send_header(key, value)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(content)
+
+
+class VendorProxyServer(ThreadingHTTPServer):
+    """Serveur proxy local démarrable en arrière-plan pour la durée des tests"""
+
+    daemon_threads = True
+
+    def __init__(self, upstream, cache=None, port=0):
+        super().__init__(("127.0.0.1", port), VendorProxyHandler)
+        self.upstream = upstream.rstrip("/")
+        self.cache = cache or VendorScriptCache()
+        self.session = requests.Session()
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        """Démarre le proxy dans un thread et retourne son URL"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        print(f"✅ Proxy des scripts tiers actif sur {self.url} → {self.upstream}")
+        return self.url
+
+    def stop(self):
+        """Arrête le proxy"""
+        self.shutdown()
+        self.server_close()
+        self.session.close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def main():
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Cache local des scripts tiers du back-office")
+    parser.add_argument("--fetch", action="store_true", help="Télécharge les scripts manquants dans le cache")
+    parser.add_argument("--update", action="store_true", help="Ré-résout et ré-épingle tous les scripts")
+    parser.add_argument("--check", action="store_true", help="Vérifie que tous les scripts sont en cache")
+    parser.add_argument("--serve", action="store_true", help="Lance le proxy en avant-plan")
+    parser.add_argument("--upstream", default="http://localhost:8080", help="Serveur de dev à proxifier")
+    parser.add_argument("--port", type=int, default=8090, help="Port du proxy")
+    args = parser.parse_args()
+
+    cache = VendorScriptCache(allow_network=args.fetch or args.update)
+
+    unpinned = [] if args.update else cache.unpinned()
+    for url in unpinned:
+        print(f"❌ Non épinglé dans {cache.manifest_path.name}: {url}")
+    if unpinned:
+        print("🔧 Lancez 'python test/script_cache.py --update' puis committez le manifeste.")
+        return False
+
+    if args.fetch or args.update:
+        for url in cache.entries:
+            if args.update or not cache.is_cached(url):
+                cache.fetch(url, update=args.update)
+            else:
+                print(f"✅ Déjà en cache: {url}")
+
+    if args.check:
+        missing = [url for url in cache.entries if not cache.is_cached(url)]
+        for url in missing:
+            print(f"❌ Absent du cache: {url}")
+        if missing:
+            return False
+        print(f"✅ {len(cache.entries)} script(s) tiers disponibles hors ligne")
+
+    if args.serve:
+        server = VendorProxyServer(args.upstream, cache, args.port)
+        server.start()
+        try:
+            server._thread.join()
+        except KeyboardInterrupt:
+            server.stop()
+
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
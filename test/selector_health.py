@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Santé des sélecteurs de navigation, vérifiée hors ligne sur le site construit (_site/)
+Extrait les listes (By.X, "...") des méthodes navigate_* et les évalue sur la page où chacune est
+appelée : sélecteurs valides, morts (chacun coûte son délai d'attente complet) ou ambigus
+"""
+
+import argparse
+import ast
+import sys
+import time
+from pathlib import Path
+
+from cssselect import HTMLTranslator, SelectorError
+from lxml import etree, html
+
+from navigation_utils import NAVIGATION_CYCLE
+
+
+TEST_DIR = Path(__file__).parent
+SITE_DIR = TEST_DIR.parent / "_site"
+
+# Fichier construit de la page atteinte par chaque étape du cycle
+STEP_PAGES = {
+    "accueil": "index.html",
+    "services": "services/index.html",
+    "formation": "services/formation/index.html",
+    "evenements": "services/evenements/index.html",
+    "production": "services/production/index.html",
+    "contact": "contact/index.html",
+}
+
+# Méthodes analysées : fichier → {méthode: page sur laquelle elle est appelée}.
+# Chaque étape du cycle part de la page atteinte par l'étape précédente.
+SOURCES = {
+    "navigation_utils.py": {
+        method: STEP_PAGES[NAVIGATION_CYCLE[index - 1][0] if index else "accueil"]
+        for index, (_, method, _) in enumerate(NAVIGATION_CYCLE)
+    },
+    # Les sélecteurs du back-office proprement dit visent l'interface Decap, absente de _site/
+    "test_backoffice_cms.py": {"navigate_to_formations_page": STEP_PAGES["accueil"]},
+}
+
+# Délai d'attente par sélecteur dans click_with_multiple_strategies
+SELECTOR_TIMEOUT = 10
+
+
+def extract_selectors(path, methods):
+    """
+    Listes de sélecteurs littérales des méthodes demandées.
+
+    Returns:
+        dict: méthode → liste de (stratégie By, valeur, ligne)
+    """
+    tree = ast.parse(Path(path).read_text(encoding="utf-8"), filename=str(path))
+    found = {}
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.FunctionDef) or node.name not in methods:
+            continue
+        selectors = []
+        for child in ast.walk(node):
+            if not isinstance(child, ast.List):
+                continue
+            for item in child.elts:
+                if (isinstance(item, ast.Tuple) and len(item.elts) == 2
+                        and isinstance(item.elts[0], ast.Attribute)
+                        and isinstance(item.elts[0].value, ast.Name) and item.elts[0].value.id == "By"
+                        and isinstance(item.elts[1], ast.Constant) and isinstance(item.elts[1].value, str)):
+                    selectors.append((item.elts[0].attr, item.elts[1].value, item.lineno))
+        found[node.name] = selectors
+    return found
+
+
+def _link_text(element):
+    return " ".join(element.text_content().split())
+
+
+class SelectorEvaluator:
+    """Évalue une stratégie Selenium sur un document lxml, au plus près de la sémantique WebDriver"""
+
+    def __init__(self):
+        self.translator = HTMLTranslator()
+        self._compiled = {}
+
+    def _css(self, selector):
+        if selector not in self._compiled:
+            self._compiled[selector] = etree.XPath(self.translator.css_to_xpath(selector))
+        return self._compiled[selector]
+
+    def find_all(self, document, strategy, value):
+        """
+        Éléments trouvés, dans l'ordre du document.
+
+        Raises:
+            ValueError: sélecteur invalide ou stratégie inconnue
+        """
+        try:
+            if strategy == "CSS_SELECTOR":
+                return self._css(value)(document)
+            if strategy == "CLASS_NAME":
+                return self._css("." + value)(document)
+            if strategy == "ID":
+                return self._css("#" + value)(document)
+            if strategy == "NAME":
+                return document.xpath("//*[@name=$name]", name=value)
+            if strategy == "TAG_NAME":
+                return document.xpath("//*[local-name()=$tag]", tag=value)
+            if strategy == "XPATH":
+                return [node for node in document.xpath(value) if isinstance(node, etree._Element)]
+        except (SelectorError, etree.XPathError) as e:
+            raise ValueError(str(e))
+        if strategy == "LINK_TEXT":
+            return [a for a in document.iter("a") if _link_text(a) == value.strip()]
+        if strategy == "PARTIAL_LINK_TEXT":
+            return [a for a in document.iter("a") if value in _link_text(a)]
+        raise ValueError(f"stratégie inconnue By.{strategy}")
+
+
+def check_method(evaluator, document, selectors):
+    """
+    Évalue la liste de sélecteurs d'une méthode.
+
+    Un sélecteur est « ambigu » s'il trouve plusieurs éléments menant à des cibles différentes :
+    WebDriver clique alors sur le premier, qui n'est pas forcément celui attendu.
+
+    Returns:
+        dict: sélecteurs évalués, position du premier valide et attente perdue avant lui
+    """
+    rows = []
+    for strategy, value, line in selectors:
+        try:
+            matches = evaluator.find_all(document, strategy, value)
+            targets = sorted({element.get("href") or element.tag for element in matches})
+            status = "dead" if not matches else ("ambiguous" if len(targets) > 1 else "ok")
+            rows.append({"strategy": strategy, "value": value, "line": line, "status": status,
+                         "count": len(matches), "targets": targets})
+        except ValueError as e:
+            rows.append({"strategy": strategy, "value": value, "line": line, "status": "invalid",
+                         "count": 0, "targets": [], "error": str(e)})
+    first = next((index for index, row in enumerate(rows) if row["count"]), None)
+    wasted = SELECTOR_TIMEOUT * (first if first is not None else len(rows))
+    return {"selectors": rows, "first_match": first, "wasted_seconds": wasted}
+
+
+def check_site(root=SITE_DIR, sources=None):
+    """
+    Évalue toutes les méthodes de navigation sur les pages construites.
+
+    Returns:
+        dict: "fichier:méthode" → résultat de check_method (+ page), ou None si la page manque
+    """
+    root = Path(root)
+    evaluator = SelectorEvaluator()
+    documents = {}
+    report = {}
+    for filename, methods in (sources or SOURCES).items():
+        extracted = extract_selectors(TEST_DIR / filename, methods)
+        for method, page in methods.items():
+            key = f"{filename}:{method}"
+            if page not in documents:
+                path = root / page
+                documents[page] = html.fromstring(path.read_bytes()) if path.exists() else None
+            if documents[page] is None or method not in extracted:
+                report[key] = None
+                continue
+            report[key] = dict(check_method(evaluator, documents[page], extracted[method]), page=page)
+    return report
+
+
+def print_report(report, verbose=True):
+    """Détail par méthode : ✅ valide, 💀 mort, ⚠️ ambigu, ❌ invalide"""
+    icons = {"ok": "✅", "dead": "💀", "ambiguous": "⚠️", "invalid": "❌"}
+    for key, result in report.items():
+        if result is None:
+            print(f"\n❔ {key} : page construite ou méthode introuvable")
+            continue
+        first = result["first_match"]
+        state = "❌ aucun sélecteur valide" if first is None else f"1er valide : #{first + 1}"
+        print(f"\n🔎 {key} sur {result['page']} — {state}"
+              + (f", {result['wasted_seconds']}s d'attente perdue avant" if first and result["wasted_seconds"] else ""))
+        if not verbose:
+            continue
+        for index, row in enumerate(result["selectors"], 1):
+            detail = row.get("error") or (f"{row['count']} élément(s)" + (
+                f" → {', '.join(row['targets'])}" if row["status"] == "ambiguous" else ""))
+            print(f"   {icons[row['status']]} #{index} By.{row['strategy']} '{row['value']}' (l.{row['line']}) : {detail}")
+
+
+def summarize(report):
+    """Compteurs par statut et méthodes sans aucun sélecteur valide"""
+    counts = {"ok": 0, "dead": 0, "ambiguous": 0, "invalid": 0}
+    broken = []
+    for key, result in report.items():
+        if result is None:
+            continue
+        for row in result["selectors"]:
+            counts[row["status"]] += 1
+        if result["first_match"] is None:
+            broken.append(key)
+    return counts, broken
+
+
+def check_selectors(root=SITE_DIR):
+    """Porte de pré-test : False si une méthode de navigation n'a plus aucun sélecteur valide"""
+    if not (Path(root) / "index.html").exists():
+        print("ℹ️ Sélecteurs non vérifiés : site non construit")
+        return True
+    start = time.perf_counter()
+    report = check_site(root)
+    counts, broken = summarize(report)
+    elapsed = (time.perf_counter() - start) * 1000
+    if broken:
+        print(f"❌ Navigation cassée dans _site/ ({elapsed:.0f} ms) :")
+        print_report({key: report[key] for key in broken})
+        return False
+    print(f"✅ Sélecteurs de navigation : {counts['ok']} valide(s), {counts['dead']} mort(s), "
+          f"{counts['ambiguous']} ambigu(s) ({elapsed:.0f} ms)")
+    return True
+
+
+def main():
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Vérifie les sélecteurs de navigation sur _site/ sans navigateur")
+    parser.add_argument("--root", default=str(SITE_DIR), help="Dossier du site construit")
+    parser.add_argument("--fail-on-dead", action="store_true", help="Échoue aussi sur un sélecteur mort ou invalide")
+    parser.add_argument("--quiet", action="store_true", help="Une ligne par méthode")
+    args = parser.parse_args()
+
+    root = Path(args.root)
+    if not (root / "index.html").exists():
+        print(f"❌ Site non construit : {root} (lancez 'npm run build')")
+        return False
+
+    start = time.perf_counter()
+    report = check_site(root)
+    elapsed = (time.perf_counter() - start) * 1000
+    print_report(report, verbose=not args.quiet)
+    counts, broken = summarize(report)
+    print(f"\n📊 {counts['ok']} valide(s), {counts['dead']} mort(s), {counts['ambiguous']} ambigu(s), "
+          f"{counts['invalid']} invalide(s) en {elapsed:.0f} ms")
+    if broken:
+        print(f"❌ Sans sélecteur valide : {', '.join(broken)}")
+    return not broken and not (args.fail_on_dead and (counts["dead"] or counts["invalid"]))
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -53,9 +53,15 @@ def create_venv():
 def check_dependencies():
     """Vérifier si les dépendances sont installées"""
     python_exe = get_python_executable()
-    modules = ["selenium", "requests", "webdriver_manager"]
+    modules = ["selenium", "requests", "webdriver_manager", "lxml", "cssselect", "yaml", "psutil", "brotli"]
     missing_modules = []
     
+    # tomllib est dans la bibliothèque standard à partir de Python 3.11 (tomli avant)
+    result = subprocess.run([str(python_exe), "-c", "import sys; sys.exit(sys.version_info < (3, 11))"],
+                          capture_output=True, text=True)
+    if result.returncode != 0:
+        modules.append("tomli")
+    
     for module in modules:
         result = subprocess.run([str(python_exe), "-c", f"import {module}"], 
                               capture_output=True, text=True)
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Serveur statique léger pour le site déjà construit (_site/)
+Keep-alive HTTP/1.1, ETag/Last-Modified, URLs « propres » et redirections de netlify.toml,
+variantes précompressées .br/.gz : les tests en lecture seule démarrent sans aucun processus Node
+"""
+
+import argparse
+import email.utils
+import mimetypes
+import re
+import shutil
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SITE_DIR = PROJECT_ROOT / "_site"
+NETLIFY_TOML = PROJECT_ROOT / "netlify.toml"
+
+# Variantes précompressées, par ordre de préférence
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+mimetypes.add_type("text/yaml", ".yml")
+mimetypes.add_type("text/yaml", ".yaml")
+mimetypes.add_type("application/manifest+json", ".webmanifest")
+
+
+class RedirectRule:
+    """Règle [[redirects]] de netlify.toml (splat `*` et paramètres `:nom`)"""
+
+    def __init__(self, rule):
+        source = rule["from"]
+        self.host = None
+        if "://" in source:
+            parts = urlsplit(source)
+            self.host, source = parts.hostname, parts.path or "/"
+        self.source = source
+        self.to = rule["to"]
+        self.status = int(rule.get("status", 301))
+        self.force = bool(rule.get("force", False))
+        pattern = re.escape(source.rstrip("/") or "/")
+        pattern = pattern.replace(r"\*", r"(?P<splat>.*)")
+        pattern = re.sub(r":([A-Za-z_]\w*)", r"(?P<\1>[^/]+)", pattern)
+        self.pattern = re.compile(f"^{pattern}/?$")
+
+    def match(self, host, path):
+        """Cible de la règle pour ce chemin, ou None"""
+        if self.host and self.host != host:
+            return None
+        found = self.pattern.match(path)
+        if not found:
+            return None
+        target = self.to
+        for name, value in found.groupdict().items():
+            target = target.replace(f":{name}", value or "")
+        return target
+
+
+def load_redirects(path=NETLIFY_TOML):
+    """Règles de redirection de netlify.toml (liste vide si absent ou illisible)"""
+    path = Path(path)
+    if not path.exists():
+        return []
+    if tomllib is None:
+        print("⚠️ tomli non installé : redirections de netlify.toml ignorées")
+        return []
+    with open(path, "rb") as f:
+        config = tomllib.load(f)
+    return [RedirectRule(rule) for rule in config.get("redirects", [])]
+
+
+def accepted_encodings(header):
+    """Encodages acceptés par le client (q > 0)"""
+    accepted = set()
+    for item in (header or "").split(","):
+        name, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if name and quality > 0:
+            accepted.add(name.lower())
+    return accepted
+
+
+class StaticSiteHandler(BaseHTTPRequestHandler):
+    """Sert _site/ comme Netlify : fichiers, index.html, redirections et 404.html"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._handle()
+
+    def do_HEAD(self):
+        self._handle()
+
+    def _handle(self):
+        parts = urlsplit(self.path)
+        path = unquote(parts.path)
+        host = (self.headers.get("Host") or "").split(":")[0]
+
+        # Les règles forcées passent avant les fichiers existants, les autres seulement en l'absence de fichier
+        for rule in self.server.redirects:
+            if rule.force and self._apply_rule(rule, host, path, parts.query):
+                return
+        if self._serve_path(path, parts.query):
+            return
+        for rule in self.server.redirects:
+            if not rule.force and self._apply_rule(rule, host, path, parts.query):
+                return
+        self._not_found()
+
+    def _apply_rule(self, rule, host, path, query):
+        target = rule.match(host, path)
+        if target is None:
+            return False
+        if rule.status == 200:
+            # Réécriture : la cible est servie à l'URL demandée
+            return self._serve_path(target, "") or self._not_found()
+        if rule.status == 404:
+            file_path = self.server.resolve(target)
+            return self._send_file(file_path, 404) if file_path else self._not_found()
+        self._redirect(target + (f"?{query}" if query and "?" not in target else ""), rule.status)
+        return True
+
+    def _serve_path(self, path, query):
+        """Sert un chemin avec les URLs propres de Netlify ; False si rien ne correspond"""
+        if path.endswith("/"):
+            file_path = self.server.resolve(path + "index.html")
+            return self._send_file(file_path) if file_path else False
+        file_path = self.server.resolve(path)
+        if file_path:
+            return self._send_file(file_path)
+        if self.server.resolve(path + "/index.html"):
+            self._redirect(path + "/" + (f"?{query}" if query else ""), 301)
+            return True
+        file_path = self.server.resolve(path + ".html")
+        return self._send_file(file_path) if file_path else False
+
+    def _not_found(self):
+        page = self.server.resolve("/404.html")
+        if page:
+            return self._send_file(page, 404)
+        self.send_error(404, "Page introuvable")
+        return True
+
+    def _redirect(self, location, status):
+        self.send_response(status)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _send_file(self, file_path, status=200):
+        # Variante précompressée si le client l'accepte ; une variante plus ancienne que la source
+        # (site reconstruit sans précompression) est périmée et ignorée
+        accepted = accepted_encodings(self.headers.get("Accept-Encoding"))
+        encoding, body_path, has_variant = None, file_path, False
+        source_mtime = file_path.stat().st_mtime_ns
+        for name, suffix in ENCODINGS:
+            variant = file_path.with_name(file_path.name + suffix)
+            if variant.is_file() and variant.stat().st_mtime_ns >= source_mtime:
+                has_variant = True
+                if encoding is None and name in accepted:
+                    encoding, body_path = name, variant
+
+        stat = body_path.stat()
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}{"-" + encoding if encoding else ""}"'
+        last_modified = email.utils.formatdate(stat.st_mtime, usegmt=True)
+
+        if status == 200 and self._not_modified(etag, stat.st_mtime):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            if has_variant:
+                self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return True
+
+        content_type, _ = mimetypes.guess_type(file_path.name)
+        content_type = content_type or "application/octet-stream"
+        if content_type.startswith("text/") or content_type in ("application/javascript", "application/json"):
+            content_type += "; charset=utf-8"
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(stat.st_size))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        self.send_header("Cache-Control", "public, max-age=0, must-revalidate")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        if has_variant:
+            self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+        if self.command != "HEAD":
+            with open(body_path, "rb") as f:
+                try:
+                    self.wfile.flush()
+                    self.connection.sendfile(f)
+                except (AttributeError, OSError):
+                    f.seek(0)
+                    shutil.copyfileobj(f, self.wfile)
+        return True
+
+    def _not_modified(self, etag, mtime):
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            tags = [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+            return etag in tags or "*" in tags
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(mtime) <= since
+        return False
+
+
+class StaticSiteServer(ThreadingHTTPServer):
+    """Serveur statique démarrable en arrière-plan pour la durée des tests"""
+
+    daemon_threads = True
+
+    def __init__(self, root=SITE_DIR, port=0, redirects=None, host="127.0.0.1"):
+        super().__init__((host, port), StaticSiteHandler)
+        self.root = Path(root).resolve()
+        self.redirects = load_redirects() if redirects is None else redirects
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def resolve(self, url_path):
+        """Fichier de root correspondant à un chemin d'URL (None si absent ou hors de root)"""
+        candidate = (self.root / url_path.lstrip("/")).resolve()
+        if candidate != self.root and self.root not in candidate.parents:
+            return None
+        return candidate if candidate.is_file() else None
+
+    def start(self):
+        """Démarre le serveur dans un thread et retourne son URL"""
+        if not (self.root / "index.html").exists():
+            raise FileNotFoundError(f"Site non construit : {self.root} (lancez 'npm run build')")
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        print(f"✅ Serveur statique actif sur {self.url} ({self.root})")
+        return self.url
+
+    def stop(self):
+        """Arrête le serveur"""
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def main():
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Serveur statique du site construit (_site/)")
+    parser.add_argument("--root", default=str(SITE_DIR), help="Dossier à servir")
+    parser.add_argument("--port", type=int, default=8080, help="Port d'écoute")
+    parser.add_argument("--no-redirects", action="store_true", help="Ignore les redirections de netlify.toml")
+    args = parser.parse_args()
+
+    try:
+        server = StaticSiteServer(args.root, args.port, [] if args.no_redirects else None)
+        server.start()
+    except (FileNotFoundError, OSError) as e:
+        print(f"❌ {e}")
+        return False
+    print(f"↪️ {len(server.redirects)} redirection(s) chargée(s) depuis netlify.toml")
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -1,4 +1,5 @@
 import os
+from pathlib import Path
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -10,28 +11,51 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
 # Import des utilitaires de navigation
 from navigation_utils import NavigationHelper, CMSHelper
+from dom_snapshot import DomSnapshot, SnapshotAssertions
+from content_model import PROJECT_ROOT, load_content, entry_as_dict
+from failure_capture import FailureCapture
 
 
 class TestBackOfficeCMS:
-    def __init__(self):
-        """Initialise le test avec les paramètres du navigateur"""
-        chrome_options = Options()
-        chrome_options.add_argument("--start-maximized")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        
-        self.driver = webdriver.Chrome(options=chrome_options)
-        self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    def __init__(self, admin_url=None, credentials=None, driver=None, base_url=None, project_root=None):
+        """
+        Initialise le test avec les paramètres du navigateur
+
+        Args:
+            admin_url: URL alternative du back-office (ex: proxy des scripts tiers en cache)
+            credentials: (email, mot de passe) pour l'écran de connexion git-gateway, si présent
+            driver: Navigateur déjà ouvert à réutiliser (mode --watch) ; il n'est alors pas fermé
+            base_url: URL du site (serveur Eleventy d'un espace de travail isolé, par ex.)
+            project_root: Racine du projet dont src/ est servi (par défaut, ce dépôt)
+        """
+        self.owns_driver = driver is None
+        if self.owns_driver:
+            chrome_options = Options()
+            chrome_options.add_argument("--start-maximized")
+            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+            chrome_options.add_experimental_option('useAutomationExtension', False)
+            chrome_options.set_capability("goog:loggingPrefs", {"browser": "ALL"})
+            
+            driver = webdriver.Chrome(options=chrome_options)
+            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        self.driver = driver
         self.wait = WebDriverWait(self.driver, 10)
         
         # Initialiser les helpers
         self.nav_helper = NavigationHelper(self.driver, 10)
         self.cms_helper = CMSHelper(self.driver, 10)
         
+        # Artefacts des dernières étapes, gardés en mémoire et écrits seulement en cas d'échec
+        self.failure_capture = FailureCapture(self.driver, capacity=10)
+        self.failure_capture.attach(self.nav_helper)
+        self.failure_capture.attach(self.cms_helper.nav_helper)
+        
         # Configuration du test
-        self.base_url = "http://localhost:8080"
-        self.admin_url = f"{self.base_url}/admin/"
+        self.base_url = base_url or "http://localhost:8080"
+        self.project_root = Path(project_root) if project_root else PROJECT_ROOT
+        self.admin_url = admin_url or f"{self.base_url}/admin/"
+        self.credentials = credentials
         self.formations_url = f"{self.base_url}/services/formation/"
         
         # Données de la formation de test (nom unique avec timestamp)
@@ -49,7 +73,7 @@ class TestBackOfficeCMS:
         
         # Chemin du fichier JSON qui sera créé
         self.json_file_path = os.path.join(
-            os.getcwd(), 
+            self.project_root, 
             "src", "services", "formation", 
             f"{self.test_formation['name'].lower()}.json"
         )
@@ -62,11 +86,14 @@ class TestBackOfficeCMS:
             # Étape 1 : Navigation et vérification initiale
             self.navigate_to_formations_page()
             self.verify_formation_not_exists()
+            self.failure_capture.capture("vérification initiale")
             
             # Étape 2 : Création via le back-office
             self.navigate_to_admin()
+            self.failure_capture.capture("back-office chargé")
             self.click_on_cms_login()
             self.create_new_formation()
+            self.failure_capture.capture("formation publiée")
             
             # Étape 3 : Vérification de la création
             self.navigate_to_formations_page()
@@ -79,10 +106,12 @@ class TestBackOfficeCMS:
             
         except Exception as e:
             print(f"❌ Erreur durant le test: {e}")
+            self.failure_capture.dump("backoffice_cms", e)
             self.cleanup_created_formation()  # Nettoyage même en cas d'erreur
             raise
         finally:
-            self.driver.quit()
+            if self.owns_driver:
+                self.driver.quit()
     
     def navigate_to_formations_page(self):
         """Navigue de la home page vers la page des formations"""
@@ -145,31 +174,27 @@ class TestBackOfficeCMS:
         """Vérifie que la formation de test n'existe pas"""
         print(f"🔍 Vérification de l'absence de la formation {self.test_formation['name']}...")
         
-        try:
-            # Chercher le nom exact de notre formation de test
-            test_formation_elements = self.driver.find_elements(By.XPATH, f"//*[contains(text(), '{self.test_formation['name']}')]")
+        # Un seul instantané du DOM, vérifié localement
+        snapshot = DomSnapshot.from_driver(self.driver)
+        
+        if not snapshot.contains_text(self.test_formation['name']):
+            print(f"✅ Confirmation: la formation {self.test_formation['name']} n'existe pas")
+        else:
+            # Si elle existe, on la supprime avant de commencer le test
+            print(f"⚠️ La formation {self.test_formation['name']} existe déjà, nettoyage préventif...")
+            self.cleanup_created_formation()
+            # Attendre qu'Eleventy recharge la page
+            print("⏳ Attente du rechargement d'Eleventy...")
+            self.nav_helper.safe_page_wait(5)
+            self.driver.refresh()
+            self.nav_helper.safe_page_wait(3)
             
-            if len(test_formation_elements) == 0:
-                print(f"✅ Confirmation: la formation {self.test_formation['name']} n'existe pas")
+            # Re-vérifier
+            snapshot = DomSnapshot.from_driver(self.driver)
+            if snapshot.contains_text(self.test_formation['name']):
+                print(f"⚠️ Formation toujours présente après nettoyage, elle sera écrasée")
             else:
-                # Si elle existe, on la supprime avant de commencer le test
-                print(f"⚠️ La formation {self.test_formation['name']} existe déjà, nettoyage préventif...")
-                self.cleanup_created_formation()
-                # Attendre qu'Eleventy recharge la page
-                print("⏳ Attente du rechargement d'Eleventy...")
-                self.nav_helper.safe_page_wait(5)
-                self.driver.refresh()
-                self.nav_helper.safe_page_wait(3)
-                
-                # Re-vérifier
-                test_formation_elements = self.driver.find_elements(By.XPATH, f"//*[contains(text(), '{self.test_formation['name']}')]")
-                if len(test_formation_elements) > 0:
-                    print(f"⚠️ Formation toujours présente après nettoyage, elle sera écrasée")
-                else:
-                    print(f"✅ Formation nettoyée avec succès")
-                
-        except NoSuchElementException:
-            print(f"✅ Confirmation: la formation {self.test_formation['name']} n'existe pas")
+                print(f"✅ Formation nettoyée avec succès")
     
     def navigate_to_admin(self):
         """Navigue vers la page d'administration"""
@@ -205,6 +230,15 @@ class TestBackOfficeCMS:
         except Exception as e:
             print(f"Debug: Erreur lors de la vérification de connexion: {e}")
         
+        # Écran de connexion git-gateway (Netlify Identity) : renseigner email et mot de passe
+        if self.credentials:
+            email_fields = self.driver.find_elements(By.CSS_SELECTOR, "input[name='email']")
+            password_fields = self.driver.find_elements(By.CSS_SELECTOR, "input[name='password']")
+            if email_fields and password_fields:
+                email_fields[0].send_keys(self.credentials[0])
+                password_fields[0].send_keys(self.credentials[1])
+                print(f"✅ Identifiants git-gateway saisis: {self.credentials[0]}")
+        
         # Chercher un bouton de login/connexion
         login_button_selectors = [
             (By.XPATH, "//button[contains(text(), 'Login') or contains(text(), 'Connexion') or contains(text(), 'Se connecter')]"),
@@ -327,34 +361,26 @@ class TestBackOfficeCMS:
         self.driver.refresh()
         self.nav_helper.safe_page_wait(3)
         
-        # Chercher la formation sur la page
-        try:
-            formation_element = self.wait.until(
-                EC.presence_of_element_located((By.XPATH, f"//*[contains(text(), '{self.test_formation['name']}')]"))
-            )
-            print(f"✅ Formation {self.test_formation['name']} trouvée sur la page des formations")
-            
-            # Vérifier aussi la description courte
-            try:
-                desc_element = self.driver.find_element(By.XPATH, f"//*[contains(text(), 'Test automatisé')]")
-                print("✅ Description de la formation également présente")
-            except NoSuchElementException:
-                print("⚠️ Description complète non trouvée, mais formation présente")
-            
-        except TimeoutException:
+        # Chercher la formation sur un instantané de la page
+        snapshot = DomSnapshot.from_driver(self.driver)
+        if not snapshot.contains_text(self.test_formation['name']):
             print("❌ Formation non trouvée immédiatement, tentative de rechargement...")
             # Second essai après un rechargement plus long
             self.nav_helper.safe_page_wait(5)
             self.driver.refresh()
             self.nav_helper.safe_page_wait(3)
-            
-            try:
-                formation_element = self.wait.until(
-                    EC.presence_of_element_located((By.XPATH, f"//*[contains(text(), '{self.test_formation['name']}')]"))
-                )
-                print(f"✅ Formation {self.test_formation['name']} trouvée après second rechargement")
-            except TimeoutException:
+            snapshot = DomSnapshot.from_driver(self.driver)
+            if not snapshot.contains_text(self.test_formation['name']):
                 raise AssertionError(f"❌ La formation {self.test_formation['name']} n'a pas été trouvée sur la page")
+        
+        print(f"✅ Formation {self.test_formation['name']} trouvée sur la page des formations")
+        
+        # Nom, description courte, professeurs et styles vérifiés en une seule passe,
+        # pour la formation créée et pour toutes celles présentes dans src/services/formation
+        assertions = SnapshotAssertions(snapshot)
+        assertions.expect_formation(self.test_formation)
+        assertions.expect_formations([entry_as_dict(f) for f in load_content(self.project_root).entries("formations")])
+        assertions.assert_all()
     
     def cleanup_created_formation(self):
         """Supprime le fichier JSON de la formation créée"""
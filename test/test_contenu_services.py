@@ -0,0 +1,79 @@
+from contextlib import nullcontext
+
+import requests
+
+# Import du modèle de contenu et des assertions sur instantané
+from content_model import load_content, entry_as_dict
+from dom_snapshot import DomSnapshot, SnapshotAssertions
+
+
+def fetch_snapshot(session, url):
+    """Récupère une page servie et en fait un instantané local"""
+    response = session.get(url, timeout=10)
+    response.raise_for_status()
+    return DomSnapshot(response.text, url)
+
+
+def test_contenu_services(base_url="http://localhost:8080", session=None):
+    """
+    Vérifie que les pages services reflètent exactement le contenu de src/services
+
+    Args:
+        base_url: URL du site
+        session: Session HTTP déjà ouverte à réutiliser (mode --watch), sinon une session dédiée
+    """
+    print("📚 Démarrage du test de contenu - Pages services")
+
+    # Pages attendues calculées en mémoire depuis les fichiers JSON
+    content = load_content()
+    failures = []
+
+    with nullcontext(session) if session else requests.Session() as session:
+        print("📍 Test 1: Formations")
+        assertions = SnapshotAssertions(fetch_snapshot(session, f"{base_url}/services/formation/"))
+        assertions.expect_formations([entry_as_dict(f) for f in content.entries("formations")])
+        assertions.report()
+        failures += assertions.failures
+
+        print("📍 Test 2: Événements")
+        assertions = SnapshotAssertions(fetch_snapshot(session, f"{base_url}/services/evenements/"))
+        for event in content.entries("upcoming_events"):
+            assertions.expect_text(event.title, "Événement à venir")
+            assertions.expect_xpath(f"//time[@datetime='{event.date}']", description=f"Date de '{event.title}'")
+        for event in content.entries("programmable_events"):
+            assertions.expect_text(event.title, "Événement programmable")
+        assertions.report()
+        failures += assertions.failures
+
+        print("📍 Test 3: Production")
+        assertions = SnapshotAssertions(fetch_snapshot(session, f"{base_url}/services/production/"))
+        assertions.expect_sequence(
+            "#offres .grid-gallery__title",
+            [offre.title for offre in content.entries("production_offres")],
+            "Ordre des offres"
+        )
+        assertions.expect_sequence(
+            ".proc-card__title",
+            [step.title for step in content.entries("production_processus")],
+            "Ordre du processus"
+        )
+        assertions.expect_sequence(
+            ".pricing-card__title",
+            [forfait.title for forfait in content.entries("production_forfaits")],
+            "Ordre des forfaits"
+        )
+        for projet in content.entries("production_projets"):
+            assertions.expect_text(projet.title, "Projet")
+        for item in content.entries("production_faq"):
+            assertions.expect_text(item.question, "Question FAQ")
+        assertions.report()
+        failures += assertions.failures
+
+    if failures:
+        raise AssertionError(f"❌ {len(failures)} écart(s) de contenu: " + " | ".join(failures))
+
+    print("\n🎉 Test de contenu terminé avec succès!")
+
+
+if __name__ == "__main__":
+    test_contenu_services()
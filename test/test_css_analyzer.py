@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Tests hors navigateur de l'analyseur CSS
+Les pseudo-classes d'état sont retirées avant traduction en XPath, sans amputer les sélecteurs
+"""
+
+from lxml import html
+
+from css_analyzer import DYNAMIC_PSEUDO, SelectorMatcher, parse_css
+
+
+PAGE = html.fromstring(
+    "<html><body><form class='search'><button class='btn'>OK</button></form></body></html>"
+)
+
+
+def test_pseudo_classes_retirees():
+    """:focus-visible et :focus-within sont retirées entières, comme :focus"""
+    assert DYNAMIC_PSEUDO.sub("", ".btn:focus") == ".btn"
+    assert DYNAMIC_PSEUDO.sub("", ".btn:focus-visible") == ".btn"
+    assert DYNAMIC_PSEUDO.sub("", ".search:focus-within .btn") == ".search .btn"
+    assert DYNAMIC_PSEUDO.sub("", "a:any-link") == "a"
+
+
+def test_regles_focus_utilisees():
+    """Une règle :focus-visible / :focus-within sur un élément présent compte comme utilisée"""
+    rules = parse_css(".btn:focus-visible { outline: 2px solid; }\n"
+                      ".search:focus-within .btn { color: red; }")
+    matcher = SelectorMatcher()
+    for rule in rules:
+        assert matcher.matches(rule, PAGE), f"Règle jugée inutilisée: {rule.text}"
+
+
+if __name__ == "__main__":
+    test_pseudo_classes_retirees()
+    test_regles_focus_utilisees()
+    print("✅ Analyseur CSS : pseudo-classes d'état correctement retirées")
@@ -7,27 +7,33 @@ import time
 # Import des utilitaires de navigation
 from navigation_utils import NavigationHelper
 
-def test_navigation_interne():
-    """Test de navigation interne du site Mélodie & Cie"""
+def test_navigation_interne(base_url="http://localhost:8080", driver=None, step_wait=2):
+    """
+    Test de navigation interne du site Mélodie & Cie
+
+    Args:
+        base_url: URL du site (Eleventy --serve par défaut, ou serveur statique de _site/)
+        driver: Navigateur déjà ouvert à réutiliser (mode --watch) ; il n'est alors pas fermé
+        step_wait: Pause après chaque étape (secondes)
+    """
     print("🎵 Démarrage du test de navigation - Site Mélodie & Cie")
     
     # Configuration du navigateur
-    options = webdriver.ChromeOptions()
-    options.add_argument('--disable-web-security')
-    options.add_argument('--allow-running-insecure-content')
-    driver = webdriver.Chrome(options=options)
-    driver.maximize_window()
+    owns_driver = driver is None
+    if owns_driver:
+        options = webdriver.ChromeOptions()
+        options.add_argument('--disable-web-security')
+        options.add_argument('--allow-running-insecure-content')
+        driver = webdriver.Chrome(options=options)
+        driver.maximize_window()
     
     # Initialiser le helper de navigation
     nav_helper = NavigationHelper(driver, 10)
     
     try:
-        # URL locale
-        base_url = "http://localhost:8080"  # URL par défaut d'Eleventy --serve
-        
         print("📍 Test 1: Chargement de la page d'accueil")
         driver.get(base_url)
-        nav_helper.safe_page_wait(2)
+        nav_helper.safe_page_wait(step_wait)
         
         # Vérifier le titre de la page
         assert "Mélodie & Cie" in driver.title
@@ -35,7 +41,7 @@ def test_navigation_interne():
         
         print("📍 Test 2: Navigation vers Services")
         if nav_helper.navigate_to_services_page():
-            nav_helper.safe_page_wait(2)
+            nav_helper.safe_page_wait(step_wait)
             current_url = driver.current_url
             assert "services" in current_url
             print("✅ Navigation vers Services réussie")
@@ -44,7 +50,7 @@ def test_navigation_interne():
         
         print("📍 Test 3: Navigation vers Formation")
         if nav_helper.navigate_to_formation_page():
-            nav_helper.safe_page_wait(2)
+            nav_helper.safe_page_wait(step_wait)
             current_url = driver.current_url
             assert "formation" in current_url
             print("✅ Navigation vers Formation réussie")
@@ -53,7 +59,7 @@ def test_navigation_interne():
         
         print("📍 Test 4: Navigation vers Événements")
         if nav_helper.navigate_to_evenements_page():
-            nav_helper.safe_page_wait(2)
+            nav_helper.safe_page_wait(step_wait)
             current_url = driver.current_url
             assert "evenements" in current_url
             print("✅ Navigation vers Événements réussie")
@@ -62,7 +68,7 @@ def test_navigation_interne():
         
         print("📍 Test 5: Navigation vers Production")
         if nav_helper.navigate_to_production_page():
-            nav_helper.safe_page_wait(2)
+            nav_helper.safe_page_wait(step_wait)
             current_url = driver.current_url
             assert "production" in current_url
             print("✅ Navigation vers Production réussie")
@@ -71,7 +77,7 @@ def test_navigation_interne():
         
         print("📍 Test 6: Navigation vers Contact")
         if nav_helper.navigate_to_contact_page():
-            nav_helper.safe_page_wait(2)
+            nav_helper.safe_page_wait(step_wait)
             current_url = driver.current_url
             assert "contact" in current_url
             print("✅ Navigation vers Contact réussie")
@@ -80,7 +86,7 @@ def test_navigation_interne():
         
         print("📍 Test 7: Retour à l'accueil")
         if nav_helper.navigate_to_home():
-            nav_helper.safe_page_wait(2)
+            nav_helper.safe_page_wait(step_wait)
             current_url = driver.current_url
             # Vérifier qu'on est revenu à l'accueil
             assert current_url == base_url or current_url == base_url + "/" or "index" in current_url
@@ -95,8 +101,9 @@ def test_navigation_interne():
         raise
     
     finally:
-        driver.quit()
-        print("🔚 Navigateur fermé")
+        if owns_driver:
+            driver.quit()
+            print("🔚 Navigateur fermé")
 
 if __name__ == "__main__":
     test_navigation_interne()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Matrice de viewports : cycle de navigation interne sur mobile, tablette et desktop en parallèle
+Un seul Chrome, un onglet émulé par appareil (CDP Emulation) ; les chargements des onglets se
+chevauchent et chaque page rapporte layout shift (CLS), temps de chargement et débordement horizontal
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from navigation_utils import NAVIGATION_CYCLE, NavigationHelper, create_chrome_driver
+
+
+RESULTS_DIR = Path(__file__).parent / ".cache" / "viewports"
+
+# Profils d'appareils (largeur, hauteur et densité CSS)
+DEVICES = {
+    "mobile": {"width": 390, "height": 844, "deviceScaleFactor": 3, "mobile": True},
+    "tablette": {"width": 820, "height": 1180, "deviceScaleFactor": 2, "mobile": True},
+    "desktop": {"width": 1920, "height": 1080, "deviceScaleFactor": 1, "mobile": False},
+}
+
+# Seuil « bon » des Web Vitals pour le cumul des layout shifts
+DEFAULT_MAX_CLS = 0.1
+
+# Les onglets en arrière-plan doivent continuer à charger et à peindre
+CHROME_ARGUMENTS = [
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+]
+
+# Injecté avant tout script de chaque document : cumule les layout shifts et le LCP
+OBSERVER_SCRIPT = """
+(() => {
+    const metrics = window.__viewportMetrics = {cls: 0, shifts: 0, lcp: null};
+    try {
+        new PerformanceObserver(list => {
+            for (const entry of list.getEntries()) {
+                if (!entry.hadRecentInput) { metrics.cls += entry.value; metrics.shifts++; }
+            }
+        }).observe({type: 'layout-shift', buffered: true});
+        new PerformanceObserver(list => {
+            const entry = list.getEntries().pop();
+            if (entry) metrics.lcp = entry.startTime;
+        }).observe({type: 'largest-contentful-paint', buffered: true});
+    } catch (e) {}
+})();
+"""
+
+COLLECT_SCRIPT = """
+const metrics = window.__viewportMetrics || {};
+const nav = performance.getEntriesByType('navigation')[0] || {};
+const fcp = performance.getEntriesByName('first-contentful-paint')[0];
+const root = document.documentElement;
+return {
+    path: location.pathname,
+    cls: metrics.cls === undefined ? null : metrics.cls,
+    shifts: metrics.shifts || 0,
+    lcp: metrics.lcp === undefined ? null : metrics.lcp,
+    fcp: fcp ? fcp.startTime : null,
+    dom_content_loaded: nav.domContentLoadedEventEnd || null,
+    load: nav.loadEventEnd || null,
+    overflow: Math.max(0, root.scrollWidth - root.clientWidth),
+};
+"""
+
+# Un document qui porte encore ce marqueur n'a pas été remplacé par la page suivante
+LEAVING_MARKER = "window.__viewportLeaving = true;"
+LOADED_SCRIPT = "return !window.__viewportLeaving && document.readyState === 'complete';"
+
+
+class ViewportMatrix:
+    """Cycle de navigation exécuté simultanément dans un onglet émulé par appareil"""
+
+    def __init__(self, base_url="http://localhost:8080", devices=None, headless=True, timeout=15,
+                 settle=0.5, max_cls=DEFAULT_MAX_CLS):
+        self.base_url = base_url
+        self.devices = devices or DEVICES
+        self.headless = headless
+        self.timeout = timeout
+        self.settle = settle
+        self.max_cls = max_cls
+        self.driver = None
+        self.tabs = {}
+
+    def open_tabs(self):
+        """Ouvre un onglet par appareil et y applique l'émulation"""
+        self.driver = create_chrome_driver(self.headless, CHROME_ARGUMENTS, page_load_strategy="none")
+        for index, (name, metrics) in enumerate(self.devices.items()):
+            if index:
+                self.driver.switch_to.new_window("tab")
+            self.driver.execute_cdp_cmd("Emulation.setDeviceMetricsOverride", metrics)
+            self.driver.execute_cdp_cmd("Emulation.setTouchEmulationEnabled", {"enabled": metrics["mobile"]})
+            self.driver.execute_cdp_cmd("Emulation.setFocusEmulationEnabled", {"enabled": True})
+            self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": OBSERVER_SCRIPT})
+            self.tabs[name] = (self.driver.current_window_handle, NavigationHelper(self.driver))
+
+    def _switch(self, name):
+        handle, helper = self.tabs[name]
+        self.driver.switch_to.window(handle)
+        return helper
+
+    def _wait_loaded(self, names):
+        """
+        Attend la fin du chargement de tous les onglets donnés, en les interrogeant à tour de rôle.
+
+        Returns:
+            set: Appareils dont la page n'a pas fini de charger dans le délai
+        """
+        pending = set(names)
+        deadline = time.monotonic() + self.timeout
+        while pending and time.monotonic() < deadline:
+            for name in sorted(pending):
+                self._switch(name)
+                if self.driver.execute_script(LOADED_SCRIPT):
+                    pending.discard(name)
+            if pending:
+                time.sleep(0.05)
+        return pending
+
+    def _collect(self, step, results, navigated):
+        """Attend le chargement puis relève les métriques de chaque onglet pour cette étape"""
+        timed_out = self._wait_loaded(navigated)
+        # Laisse aux polices et images le temps de provoquer leurs décalages
+        time.sleep(self.settle)
+        for name in self.tabs:
+            self._switch(name)
+            metrics = self.driver.execute_script(COLLECT_SCRIPT)
+            ok = name in navigated and name not in timed_out
+            results[name].append(dict(metrics, step=step, ok=ok))
+
+    def run(self):
+        """
+        Parcourt NAVIGATION_CYCLE dans tous les onglets : chaque clic est lancé dans tous les
+        onglets avant d'attendre les chargements, qui se font donc en parallèle.
+
+        Returns:
+            dict: appareil → liste des mesures par étape
+        """
+        results = {name: [] for name in self.devices}
+        try:
+            self.open_tabs()
+            for name in self.tabs:
+                self._switch(name)
+                self.driver.get(self.base_url)
+            self._collect("accueil", results, list(self.tabs))
+
+            for step, method_name, url_part in NAVIGATION_CYCLE:
+                navigated = []
+                for name in self.tabs:
+                    helper = self._switch(name)
+                    self.driver.execute_script(LEAVING_MARKER)
+                    if getattr(helper, method_name)():
+                        navigated.append(name)
+                self._collect(step, results, navigated)
+                if url_part:
+                    for name in navigated:
+                        entry = results[name][-1]
+                        if url_part not in entry["path"]:
+                            print(f"⚠️ [{name}] Étape {step}: chemin inattendu {entry['path']}")
+                            entry["ok"] = False
+        finally:
+            if self.driver:
+                self.driver.quit()
+        return results
+
+    def failures(self, results):
+        """Étapes en échec : navigation, CLS au-dessus du seuil ou débordement horizontal"""
+        problems = []
+        for name, steps in results.items():
+            for entry in steps:
+                if not entry["ok"]:
+                    problems.append((name, entry["step"], "navigation"))
+                if entry["cls"] is not None and entry["cls"] > self.max_cls:
+                    problems.append((name, entry["step"], f"CLS {entry['cls']:.3f}"))
+                if entry["overflow"]:
+                    problems.append((name, entry["step"], f"débordement horizontal de {entry['overflow']} px"))
+        return problems
+
+
+def format_ms(value):
+    return "—" if value is None else f"{value:.0f}"
+
+
+def print_report(results, devices=DEVICES):
+    """Tableau par appareil puis synthèse comparée"""
+    for name, steps in results.items():
+        metrics = devices.get(name, {})
+        print(f"\n📱 {name} ({metrics.get('width')}×{metrics.get('height')})")
+        print(f"   {'étape':<12} {'chemin':<28} {'CLS':>6} {'FCP':>6} {'LCP':>6} {'DCL':>6} {'load':>6} {'débord.':>8}")
+        for entry in steps:
+            cls = "—" if entry["cls"] is None else f"{entry['cls']:.3f}"
+            status = "✅" if entry["ok"] else "❌"
+            print(f"{status} {entry['step']:<12} {entry['path']:<28} {cls:>6} {format_ms(entry['fcp']):>6} "
+                  f"{format_ms(entry['lcp']):>6} {format_ms(entry['dom_content_loaded']):>6} "
+                  f"{format_ms(entry['load']):>6} {entry['overflow'] or '':>8}")
+
+    print(f"\n{'appareil':<10} {'étapes OK':>10} {'CLS max':>8} {'load médian':>12}")
+    for name, steps in results.items():
+        loads = [entry["load"] for entry in steps if entry["load"]]
+        cls_values = [entry["cls"] for entry in steps if entry["cls"] is not None]
+        print(f"{name:<10} {sum(entry['ok'] for entry in steps):>5}/{len(steps):<4} "
+              f"{max(cls_values) if cls_values else 0:>8.3f} "
+              f"{format_ms(statistics.median(loads) if loads else None):>9} ms")
+
+
+def run_viewport_matrix(base_url="http://localhost:8080", headless=True, devices=None, max_cls=DEFAULT_MAX_CLS):
+    """
+    Lance la matrice, affiche le rapport et l'enregistre dans test/.cache/viewports/.
+
+    Returns:
+        bool: True si aucune étape n'est en échec
+    """
+    matrix = ViewportMatrix(base_url, devices, headless, max_cls=max_cls)
+    started = time.perf_counter()
+    results = matrix.run()
+    print(f"\n⏱️ {len(matrix.devices)} viewport(s) en {time.perf_counter() - started:.1f}s (un seul navigateur)")
+    print_report(results, matrix.devices)
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    output = RESULTS_DIR / f"viewports-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    output.write_text(json.dumps({"devices": matrix.devices, "results": results}, indent=2), encoding="utf-8")
+    print(f"💾 Résultats: {output}")
+
+    problems = matrix.failures(results)
+    for name, step, reason in problems:
+        print(f"❌ [{name}] {step} : {reason}")
+    return not problems
+
+
+def main():
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Navigation interne sur plusieurs viewports en parallèle")
+    parser.add_argument("--url", default="http://localhost:8080", help="URL du site")
+    parser.add_argument("--devices", nargs="+", choices=list(DEVICES), help="Appareils émulés (défaut : tous)")
+    parser.add_argument("--max-cls", type=float, default=DEFAULT_MAX_CLS, help="CLS maximal accepté par page")
+    parser.add_argument("--headed", action="store_true", help="Affiche le navigateur")
+    args = parser.parse_args()
+
+    devices = {name: DEVICES[name] for name in args.devices} if args.devices else None
+    return run_viewport_matrix(args.url, not args.headed, devices, args.max_cls)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Mode --watch des tests E2E
+Surveille src/, attend la reconstruction d'Eleventy puis relance uniquement les tests concernés
+par les fichiers modifiés, avec un navigateur et une connexion HTTP gardés ouverts entre deux runs
+"""
+
+import os
+import time
+from pathlib import Path, PurePosixPath
+
+import requests
+from selenium.common.exceptions import WebDriverException
+
+from content_validator import validate_content
+from navigation_utils import create_chrome_driver
+from run_all_tests import run_backoffice_test, run_content_test, run_navigation_test
+from selector_health import check_selectors
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SRC_DIR = PROJECT_ROOT / "src"
+SITE_DIR = PROJECT_ROOT / "_site"
+
+SITE_TESTS = ("contenu", "navigation")
+# Pause entre les étapes de navigation : la page est déjà reconstruite quand le test démarre
+WATCH_STEP_WAIT = 0.5
+
+
+def affected_tests(path):
+    """
+    Tests à relancer après la modification d'un fichier de src/.
+
+    Args:
+        path: Chemin relatif à src/ (séparateurs /)
+
+    Returns:
+        set: Noms de tests parmi "contenu", "navigation", "backoffice"
+    """
+    path = PurePosixPath(path)
+    if path.parts[0] == "admin":
+        return {"backoffice"}
+    if path.parts[0] == "assets":
+        return {"navigation"}
+    if path.suffix == ".json" and not path.name.endswith(".11tydata.json"):
+        # Contenu éditorial (formations, événements, production)
+        return {"contenu"}
+    return set(SITE_TESTS)
+
+
+def scan(root):
+    """Empreinte (mtime, taille) de chaque fichier sous root"""
+    state = {}
+    stack = [str(root)]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    stat = entry.stat()
+                    state[entry.path] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def changed_paths(before, after, root):
+    """Fichiers ajoutés, modifiés ou supprimés entre deux scans (relatifs à root)"""
+    paths = {path for path in after if before.get(path) != after[path]} | (set(before) - set(after))
+    return sorted(Path(path).relative_to(root).as_posix() for path in paths)
+
+
+class WatchRunner:
+    """Boucle de surveillance : un seul Chrome et une seule session HTTP pour toute la durée du mode watch"""
+
+    def __init__(self, server_url, admin_url=None, credentials=None, interval=0.3, rebuild_timeout=20):
+        self.server_url = server_url
+        self.admin_url = admin_url
+        self.credentials = credentials
+        self.interval = interval
+        self.rebuild_timeout = rebuild_timeout
+        self.session = requests.Session()
+        self.driver = None
+
+    def warm_driver(self):
+        """Navigateur gardé ouvert entre les runs, recréé s'il a été fermé entre-temps"""
+        if self.driver is not None:
+            try:
+                self.driver.current_url
+                return self.driver
+            except WebDriverException:
+                print("⚠️ Navigateur perdu, redémarrage...")
+        self.driver = create_chrome_driver()
+        return self.driver
+
+    def wait_for_rebuild(self, since):
+        """
+        Attend qu'Eleventy ait réécrit _site/ après l'instant since, puis que le serveur réponde.
+
+        Returns:
+            float: Instant de fin de reconstruction (ou None si le délai est dépassé)
+        """
+        deadline = time.monotonic() + self.rebuild_timeout
+        last_state, quiet_since = None, None
+        while time.monotonic() < deadline:
+            state = scan(SITE_DIR)
+            newest = max((mtime for mtime, _ in state.values()), default=0) / 1e9
+            if newest >= since:
+                # Reconstruction terminée quand plus aucun fichier ne change pendant un intervalle
+                if state == last_state:
+                    if time.monotonic() - quiet_since >= self.interval:
+                        break
+                else:
+                    last_state, quiet_since = state, time.monotonic()
+            time.sleep(0.1)
+        else:
+            return None
+        try:
+            self.session.get(self.server_url, timeout=5)
+        except requests.RequestException:
+            return None
+        return time.monotonic()
+
+    def run_tests(self, tests, changes=()):
+        """Lance les tests demandés ; pré-tests rapides d'abord, comme run_all_tests"""
+        results = {}
+        if "contenu" in tests and any(path.endswith(".json") for path in changes) and not validate_content():
+            return {"contenu": False}
+        if "navigation" in tests and not check_selectors():
+            return {"navigation": False}
+        if "contenu" in tests:
+            results["contenu"] = run_content_test(self.server_url, self.session)
+        if "navigation" in tests:
+            results["navigation"] = run_navigation_test(self.server_url, self.warm_driver(), WATCH_STEP_WAIT)
+        if "backoffice" in tests:
+            results["backoffice"] = run_backoffice_test(self.admin_url, self.credentials, self.warm_driver())
+        return results
+
+    def report(self, results, started):
+        summary = "  ".join(f"{'✅' if ok else '❌'} {name}" for name, ok in results.items())
+        print(f"\n👀 {summary}  ({time.monotonic() - started:.1f}s après la reconstruction)")
+        print("⌛ En attente de modifications dans src/ (Ctrl+C pour quitter)...")
+
+    def run(self):
+        """Premier run des tests du site, puis relance à chaque modification jusqu'à Ctrl+C"""
+        print("👀 Mode watch : navigateur et connexion gardés ouverts")
+        try:
+            started = time.monotonic()
+            self.report(self.run_tests(SITE_TESTS), started)
+            state = scan(SRC_DIR)
+            while True:
+                time.sleep(self.interval)
+                current = scan(SRC_DIR)
+                if current == state:
+                    continue
+                changed_at = time.time()
+                # Un éditeur écrit souvent en plusieurs fois : attendre que src/ soit stable
+                while True:
+                    time.sleep(self.interval)
+                    latest = scan(SRC_DIR)
+                    if latest == current:
+                        break
+                    current = latest
+                changes = changed_paths(state, current, SRC_DIR)
+                tests = set().union(*(affected_tests(path) for path in changes))
+                print(f"\n📝 {', '.join(changes)} → {', '.join(sorted(tests))}")
+
+                rebuilt = self.wait_for_rebuild(changed_at - 1)
+                if rebuilt is None:
+                    print("⚠️ Reconstruction d'Eleventy non détectée (npm run dev actif ?) : tests lancés quand même")
+                    rebuilt = time.monotonic()
+                self.report(self.run_tests(tests, changes), rebuilt)
+                # Les fichiers créés puis supprimés par le test back-office ne relancent pas de run
+                state = scan(SRC_DIR)
+        except KeyboardInterrupt:
+            print("\n👋 Fin du mode watch")
+        finally:
+            if self.driver is not None:
+                self.driver.quit()
+            self.session.close()
+        return True
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Espaces de travail isolés pour les tests CMS en parallèle
+Chaque worker reçoit sa copie de src/ (en tmpfs si disponible), son propre `eleventy --serve` et son
+propre decap-server sur des ports libres : fichiers et reconstructions ne se croisent plus
+"""
+
+import argparse
+import os
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import psutil
+import requests
+
+from content_model import PROJECT_ROOT
+
+
+# Fichiers du projet nécessaires à Eleventy (la configuration lit src/ relativement à elle-même)
+PROJECT_FILES = (".eleventy.js", "package.json", "netlify.toml")
+LOCAL_BACKEND = re.compile(r"^local_backend:.*$", re.M)
+
+
+def free_port():
+    """Port TCP libre attribué par le système"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def workspace_base_dir():
+    """tmpfs (/dev/shm) si disponible : copie et reconstructions sans écriture disque"""
+    shm = Path("/dev/shm")
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        return shm
+    return Path(tempfile.gettempdir())
+
+
+def _link_directory(target, link):
+    try:
+        os.symlink(target, link, target_is_directory=True)
+    except OSError:
+        # Windows sans droit de créer des liens symboliques : jonction
+        subprocess.run(["cmd", "/c", "mklink", "/J", str(link), str(target)],
+                       check=True, capture_output=True)
+
+
+def _stop_process(process, timeout=5):
+    """Arrête un processus et tous ses enfants (npx lance node dans un sous-processus)"""
+    try:
+        parent = psutil.Process(process.pid)
+        processes = parent.children(recursive=True) + [parent]
+    except psutil.NoSuchProcess:
+        return
+    for item in processes:
+        try:
+            item.terminate()
+        except psutil.NoSuchProcess:
+            pass
+    _, alive = psutil.wait_procs(processes, timeout=timeout)
+    for item in alive:
+        try:
+            item.kill()
+        except psutil.NoSuchProcess:
+            pass
+
+
+class Workspace:
+    """
+    Copie de travail d'un worker : src/, serveur Eleventy et decap-server dédiés.
+
+    Args:
+        worker_id: Identifiant du worker (nom du dossier)
+        base_dir: Dossier parent des copies (tmpfs par défaut)
+        source_root: Projet copié
+    """
+
+    def __init__(self, worker_id, base_dir=None, source_root=PROJECT_ROOT, startup_timeout=90):
+        self.worker_id = worker_id
+        self.source_root = Path(source_root)
+        self.root = Path(tempfile.mkdtemp(prefix=f"melodie-worker-{worker_id}-", dir=base_dir or workspace_base_dir()))
+        self.startup_timeout = startup_timeout
+        self.eleventy_port = free_port()
+        self.decap_port = free_port()
+        self.processes = {}
+        self._logs = []
+
+    @property
+    def url(self):
+        return f"http://localhost:{self.eleventy_port}"
+
+    @property
+    def admin_url(self):
+        return f"{self.url}/admin/"
+
+    @property
+    def decap_url(self):
+        return f"http://localhost:{self.decap_port}/api/v1"
+
+    def prepare(self):
+        """Copie le projet et pointe config.dev.yml vers le decap-server du worker"""
+        shutil.copytree(self.source_root / "src", self.root / "src")
+        for name in PROJECT_FILES:
+            if (self.source_root / name).exists():
+                shutil.copy2(self.source_root / name, self.root / name)
+        # Dépendances partagées, en lecture seule
+        if (self.source_root / "node_modules").is_dir():
+            _link_directory(self.source_root / "node_modules", self.root / "node_modules")
+
+        config = self.root / "src" / "admin" / "config.dev.yml"
+        text = config.read_text(encoding="utf-8")
+        local_backend = f"local_backend:\n  url: {self.decap_url}\n  allowed_hosts: [localhost, 127.0.0.1]"
+        text, count = LOCAL_BACKEND.subn(local_backend, text)
+        if not count:
+            text += "\n" + local_backend + "\n"
+        config.write_text(text, encoding="utf-8")
+
+    def _spawn(self, name, arguments, env=None):
+        npx = shutil.which("npx")
+        if npx is None:
+            raise FileNotFoundError("npx introuvable : installez Node.js")
+        log = open(self.root / f"{name}.log", "wb")
+        self._logs.append(log)
+        self.processes[name] = subprocess.Popen(
+            [npx] + arguments, cwd=self.root, stdout=log, stderr=subprocess.STDOUT,
+            env=dict(os.environ, **(env or {})),
+        )
+
+    def _wait_ready(self, name, url, accept_any_status=False):
+        deadline = time.monotonic() + self.startup_timeout
+        with requests.Session() as session:
+            while time.monotonic() < deadline:
+                if self.processes[name].poll() is not None:
+                    break
+                try:
+                    response = session.get(url, timeout=2)
+                    if accept_any_status or response.ok:
+                        return
+                except requests.RequestException:
+                    pass
+                time.sleep(0.3)
+        log = (self.root / f"{name}.log").read_text(encoding="utf-8", errors="replace")[-1500:]
+        raise RuntimeError(f"[worker {self.worker_id}] {name} non démarré sur {url}\n{log}")
+
+    def start(self):
+        """Prépare la copie puis démarre les deux serveurs du worker"""
+        self.prepare()
+        self._spawn("eleventy", ["@11ty/eleventy", "--serve", f"--port={self.eleventy_port}"])
+        self._spawn("decap-server", ["decap-server"], env={"PORT": str(self.decap_port)})
+        # decap-server n'expose que POST /api/v1 : toute réponse HTTP signifie qu'il écoute
+        self._wait_ready("decap-server", self.decap_url, accept_any_status=True)
+        self._wait_ready("eleventy", self.admin_url)
+        print(f"✅ [worker {self.worker_id}] {self.url} (decap-server :{self.decap_port}) dans {self.root}")
+        return self
+
+    def stop(self):
+        """Arrête les serveurs et supprime la copie"""
+        for process in self.processes.values():
+            _stop_process(process)
+        for log in self._logs:
+            log.close()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def __enter__(self):
+        try:
+            return self.start()
+        except BaseException:
+            self.stop()
+            raise
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+class WorkspaceManager:
+    """Exécute un scénario dans N espaces de travail en parallèle, avec nettoyage systématique"""
+
+    def __init__(self, workers=2, base_dir=None):
+        self.workers = workers
+        self.base_dir = base_dir
+        self._lock = threading.Lock()
+
+    def _run_worker(self, worker_id, scenario):
+        started = time.perf_counter()
+        try:
+            with Workspace(worker_id, self.base_dir) as workspace:
+                scenario(workspace)
+            outcome = (True, None)
+        except Exception as e:
+            outcome = (False, f"{type(e).__name__}: {e}")
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            status = "✅" if outcome[0] else f"❌ {outcome[1]}"
+            print(f"{status} [worker {worker_id}] terminé en {elapsed:.1f}s")
+        return {"worker": worker_id, "ok": outcome[0], "error": outcome[1], "seconds": elapsed}
+
+    def run(self, scenario):
+        """
+        Lance scenario(workspace) dans chaque worker.
+
+        Returns:
+            list: Résultat par worker {worker, ok, error, seconds}
+        """
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(self._run_worker, worker_id, scenario) for worker_id in range(1, self.workers + 1)]
+            return [future.result() for future in futures]
+
+
+def backoffice_scenario(workspace):
+    """Test back-office complet sur le site et le dossier src/ du worker"""
+    from test_backoffice_cms import TestBackOfficeCMS
+    TestBackOfficeCMS(admin_url=workspace.admin_url, base_url=workspace.url,
+                      project_root=workspace.root).run_test()
+
+
+def main():
+    """Point d'entrée en ligne de commande"""
+    parser = argparse.ArgumentParser(description="Tests back-office en parallèle dans des espaces de travail isolés")
+    parser.add_argument("--workers", type=int, default=2, help="Nombre de workers en parallèle")
+    parser.add_argument("--base-dir", help="Dossier des copies de travail (défaut : /dev/shm ou dossier temporaire)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    results = WorkspaceManager(args.workers, args.base_dir).run(backoffice_scenario)
+    succeeded = sum(result["ok"] for result in results)
+    print(f"\n📊 {succeeded}/{len(results)} worker(s) réussi(s) en {time.perf_counter() - started:.1f}s")
+    return succeeded == len(results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)